@@ -8,6 +8,19 @@ register(id="StagHunt-Harvest-v0", entry_point="gym_stag_hunt.envs:HarvestEnv")
 
 register(id="StagHunt-Escalation-v0", entry_point="gym_stag_hunt.envs:EscalationEnv")
 
+register(id="StagHunt-MultiHunt-v0", entry_point="gym_stag_hunt.envs:MultiHuntEnv")
+
+register(id="StagHunt-Hunt-Vector-v0", entry_point="gym_stag_hunt.envs:VectorHuntEnv")
+
+register(
+    id="StagHunt-Harvest-Vector-v0", entry_point="gym_stag_hunt.envs:VectorHarvestEnv"
+)
+
+register(
+    id="StagHunt-Escalation-Vector-v0",
+    entry_point="gym_stag_hunt.envs:VectorEscalationEnv",
+)
+
 register(id="StagHunt-Hunt-PZ-v0", entry_point="gym_stag_hunt.envs:HuntPZEnv")
 
 register(id="StagHunt-Harvest-PZ-v0", entry_point="gym_stag_hunt.envs:HarvestPZEnv")
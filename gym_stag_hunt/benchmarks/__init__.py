@@ -0,0 +1,8 @@
+from gym_stag_hunt.benchmarks.imports import measure_import_time, measure_import_times
+from gym_stag_hunt.benchmarks.throughput import (
+    benchmark_case,
+    make_cases,
+    make_env,
+    run_sweep,
+    write_results,
+)
@@ -0,0 +1,119 @@
+import os
+import sys
+from argparse import ArgumentParser
+
+from gym_stag_hunt.benchmarks.imports import measure_import_times
+from gym_stag_hunt.benchmarks.throughput import (
+    GAMES,
+    GRID_SIZES,
+    MULTIAGENT_MODES,
+    OBS_TYPES,
+    OPPONENT_POLICIES,
+    PLANT_COUNTS,
+    make_cases,
+    run_sweep,
+    write_results,
+)
+
+
+def parse_grid_size(text):
+    """
+    :param text: grid size formatted as WxH, eg. 10x10
+    :return: (W, H) tuple
+    """
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def parse_bool(text):
+    return text.lower() in ("1", "true", "yes", "multi")
+
+
+def build_parser():
+    parser = ArgumentParser(
+        prog="python -m gym_stag_hunt.benchmarks",
+        description="Measures reset / step throughput of the stag hunt environments.",
+    )
+    parser.add_argument("--games", nargs="+", default=GAMES, choices=GAMES)
+    parser.add_argument(
+        "--grid-sizes",
+        nargs="+",
+        type=parse_grid_size,
+        default=GRID_SIZES,
+        help="grid sizes formatted as WxH",
+    )
+    parser.add_argument("--plants", nargs="+", type=int, default=PLANT_COUNTS)
+    parser.add_argument("--obs-types", nargs="+", default=OBS_TYPES, choices=OBS_TYPES)
+    parser.add_argument(
+        "--multiagent",
+        nargs="+",
+        type=parse_bool,
+        default=MULTIAGENT_MODES,
+        help="true / false, for multiagent and single agent mode",
+    )
+    parser.add_argument(
+        "--opponents", nargs="+", default=OPPONENT_POLICIES, choices=OPPONENT_POLICIES
+    )
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--resets", type=int, default=10)
+    parser.add_argument(
+        "--render-backend", default="pygame", choices=["pygame", "numpy"]
+    )
+    parser.add_argument(
+        "--import-times",
+        action="store_true",
+        help="also measure how long importing the package and the envs takes",
+    )
+    parser.add_argument(
+        "--output", default=None, help="file to write the results to, .json or .csv"
+    )
+    return parser
+
+
+def print_result(result):
+    name = "%s %sx%s plants=%s obs=%s multiagent=%s opponent=%s" % (
+        result["game"],
+        result["grid_w"],
+        result["grid_h"],
+        result["plants"],
+        result["obs_type"],
+        result["multiagent"],
+        result["opponent_policy"],
+    )
+    if "error" in result:
+        print("%-80s ERROR %s" % (name, result["error"]), file=sys.stderr)
+    else:
+        print("%-80s %12.1f steps/s" % (name, result["steps_per_second"]))
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # benchmarks run headless
+
+    cases = make_cases(
+        games=args.games,
+        grid_sizes=args.grid_sizes,
+        plant_counts=args.plants,
+        obs_types=args.obs_types,
+        multiagent_modes=args.multiagent,
+        opponent_policies=args.opponents,
+    )
+    results = run_sweep(
+        cases,
+        steps=args.steps,
+        resets=args.resets,
+        render_backend=args.render_backend,
+        log=print_result,
+    )
+
+    extra = {}
+    if args.import_times:
+        extra["import_times"] = measure_import_times()
+        for name, measurement in extra["import_times"].items():
+            print(
+                "import %-73s %10.1f ms  %s"
+                % (name, measurement["seconds"] * 1000, measurement["modules"])
+            )
+
+    if args.output:
+        write_results(results, args.output, extra=extra)
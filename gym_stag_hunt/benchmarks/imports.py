@@ -0,0 +1,58 @@
+import json
+import os
+import subprocess
+import sys
+
+# What gets imported (and constructed) for each measurement
+IMPORT_TARGETS = {
+    "package": "import gym_stag_hunt",
+    "hunt_coords": "from gym_stag_hunt.envs import HuntEnv; HuntEnv(obs_type='coords')",
+    "hunt_image_numpy": "from gym_stag_hunt.envs import HuntEnv; "
+    "HuntEnv(obs_type='image', render_backend='numpy')",
+    "hunt_image_pygame": "from gym_stag_hunt.envs import HuntEnv; HuntEnv(obs_type='image')",
+    "hunt_pettingzoo": "from gym_stag_hunt.envs.pettingzoo.hunt import env; env(obs_type='coords')",
+}
+
+# Optional dependencies we want to know about when they get pulled in
+HEAVY_MODULES = ["pygame", "pettingzoo", "cv2"]
+
+_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+exec(%r)
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "modules": [m for m in %r if m in sys.modules]}))
+"""
+
+
+def measure_import_time(statement, repeats=3):
+    """
+    Times a statement in fresh interpreters, so nothing is cached from earlier imports.
+    :param statement: code to time, eg. an import
+    :param repeats: how many interpreters are started, the fastest run is reported
+    :return: dictionary with the time in seconds and which of the heavy modules ended up imported
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER=os.environ.get("SDL_VIDEODRIVER", "dummy"))
+    runs = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", _SCRIPT % (statement, HEAVY_MODULES)],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=env,
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return min(runs, key=lambda run: run["seconds"])
+
+
+def measure_import_times(targets=IMPORT_TARGETS, repeats=3):
+    """
+    :param targets: dictionary mapping names to the statements to time
+    :param repeats: how many interpreters are started per target
+    :return: dictionary mapping the names to their measurements
+    """
+    return {
+        name: measure_import_time(statement, repeats=repeats)
+        for name, statement in targets.items()
+    }
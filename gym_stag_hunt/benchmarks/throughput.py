@@ -0,0 +1,280 @@
+import csv
+import json
+import platform
+from itertools import product
+from time import perf_counter
+
+import numpy as np
+
+"""
+Sweep Defaults
+"""
+GAMES = [
+    "simple",
+    "hunt",
+    "harvest",
+    "escalation",
+    "hunt_pz",
+    "harvest_pz",
+    "escalation_pz",
+]
+GRID_SIZES = [(5, 5), (10, 10), (20, 20)]
+PLANT_COUNTS = [2, 8]
+OBS_TYPES = ["coords", "grid", "image"]
+MULTIAGENT_MODES = [False, True]
+OPPONENT_POLICIES = ["random", "pursuit"]
+
+# Games with plants, and the name of the env parameter controlling how many there are
+PLANT_PARAMS = {"hunt": "forage_quantity", "harvest": "max_plants"}
+# Games whose opponent (agent B, when multiagent is disabled) follows a policy
+OPPONENT_GAMES = ["hunt", "escalation"]
+
+
+"""
+Env Factories
+"""
+
+
+def _gym_env_class(game):
+    """
+    Imported here, so that benchmarking one game doesn't pull in the dependencies of the others.
+    """
+    if game == "hunt":
+        from gym_stag_hunt.envs.gym.hunt import HuntEnv
+
+        return HuntEnv
+    if game == "harvest":
+        from gym_stag_hunt.envs.gym.harvest import HarvestEnv
+
+        return HarvestEnv
+    if game == "escalation":
+        from gym_stag_hunt.envs.gym.escalation import EscalationEnv
+
+        return EscalationEnv
+    raise AttributeError("Unknown game: " + game)
+
+
+def _zoo_env_class(game):
+    if game == "hunt":
+        from gym_stag_hunt.envs.pettingzoo.hunt import ZooHuntEnvironment
+
+        return ZooHuntEnvironment
+    if game == "harvest":
+        from gym_stag_hunt.envs.pettingzoo.harvest import ZooHarvestEnvironment
+
+        return ZooHarvestEnvironment
+    if game == "escalation":
+        from gym_stag_hunt.envs.pettingzoo.escalation import ZooEscalationEnvironment
+
+        return ZooEscalationEnvironment
+    raise AttributeError("Unknown game: " + game)
+
+
+def make_env(case, render_backend="pygame"):
+    """
+    :param case: benchmark case, as generated by make_cases
+    :param render_backend: 'pygame' or 'numpy', used by the image observations
+    :return: the env described by the case
+    """
+    game = case["game"]
+    if game == "simple":
+        from gym_stag_hunt.envs.gym.simple import SimpleEnv
+
+        return SimpleEnv()
+
+    zoo = game.endswith("_pz")
+    base_game = game[: -len("_pz")] if zoo else game
+
+    kwargs = dict(
+        grid_size=(case["grid_w"], case["grid_h"]),
+        obs_type=case["obs_type"],
+        enable_multiagent=case["multiagent"],
+        render_backend=render_backend,
+    )
+    if base_game in PLANT_PARAMS:
+        kwargs[PLANT_PARAMS[base_game]] = case["plants"]
+    if base_game in OPPONENT_GAMES and case["opponent_policy"] is not None:
+        kwargs["opponent_policy"] = case["opponent_policy"]
+
+    if zoo:
+        return _zoo_env_class(base_game)(**kwargs)
+    return _gym_env_class(base_game)(**kwargs)
+
+
+"""
+Sweep
+"""
+
+
+def make_cases(
+    games=GAMES,
+    grid_sizes=GRID_SIZES,
+    plant_counts=PLANT_COUNTS,
+    obs_types=OBS_TYPES,
+    multiagent_modes=MULTIAGENT_MODES,
+    opponent_policies=OPPONENT_POLICIES,
+):
+    """
+    Expands the sweep into benchmark cases. Parameters which do not affect a game (eg. the plant count of Escalation,
+    or the opponent policy in multiagent mode) are left out instead of producing duplicate cases, as are the plant
+    counts which do not fit on the grid.
+    :return: list of case dicts
+    """
+    cases = []
+    seen = set()
+    for game, grid_size, plants, obs_type, multiagent, opponent_policy in product(
+        games, grid_sizes, plant_counts, obs_types, multiagent_modes, opponent_policies
+    ):
+        base_game = game[: -len("_pz")] if game.endswith("_pz") else game
+
+        if game == "simple":
+            grid_size, plants, obs_type, multiagent, opponent_policy = (
+                (0, 0),
+                None,
+                None,
+                True,
+                None,
+            )
+        else:
+            if game.endswith("_pz") and not multiagent:
+                continue  # the PettingZoo wrappers always drive both agents
+            if base_game not in PLANT_PARAMS:
+                plants = None
+            elif plants >= grid_size[0] * grid_size[1] - 3:
+                continue
+            if multiagent or base_game not in OPPONENT_GAMES:
+                opponent_policy = None
+
+        case = dict(
+            game=game,
+            grid_w=grid_size[0],
+            grid_h=grid_size[1],
+            plants=plants,
+            obs_type=obs_type,
+            multiagent=multiagent,
+            opponent_policy=opponent_policy,
+        )
+        key = tuple(case.values())
+        if key not in seen:
+            seen.add(key)
+            cases.append(case)
+    return cases
+
+
+def _action_sequence(case, steps, rng):
+    """
+    Pre-draws the actions, so sampling them is not part of the measurement.
+    """
+    action_count = 2 if case["game"] == "simple" else 5
+    actions = rng.integers(0, action_count, size=(steps, 2)).tolist()
+
+    if case["game"].endswith("_pz"):
+        return [{"player_0": a, "player_1": b} for a, b in actions]
+    if case["multiagent"]:
+        return actions
+    return [a for a, _ in actions]
+
+
+def benchmark_case(case, steps=1000, resets=10, render_backend="pygame", seed=0):
+    """
+    Times reset and step for one case.
+    :param case: benchmark case, as generated by make_cases
+    :param steps: how many steps are timed
+    :param resets: how many resets are timed
+    :param render_backend: 'pygame' or 'numpy', used by the image observations
+    :param seed: seed of the action sequence
+    :return: the case, extended with the measurements
+    """
+    result = dict(case, steps=steps, resets=resets, render_backend=render_backend)
+
+    start = perf_counter()
+    env = make_env(case, render_backend=render_backend)
+    result["init_seconds"] = perf_counter() - start
+
+    try:
+        start = perf_counter()
+        for _ in range(resets):
+            env.reset()
+        result["reset_seconds"] = (perf_counter() - start) / max(resets, 1)
+
+        actions = _action_sequence(case, steps, np.random.default_rng(seed))
+        step = env.step
+        start = perf_counter()
+        for action in actions:
+            step(action)
+        elapsed = perf_counter() - start
+        result["step_seconds"] = elapsed / steps
+        result["steps_per_second"] = steps / elapsed
+    finally:
+        if case["game"] != "simple":  # SimpleEnv.close quits the interpreter
+            env.close()
+
+    return result
+
+
+def run_sweep(cases, steps=1000, resets=10, render_backend="pygame", log=None):
+    """
+    Benchmarks every case. A case which fails is recorded with its error instead of stopping the sweep.
+    :param cases: list of cases, as generated by make_cases
+    :param log: optional callable receiving each result as it comes in
+    :return: list of results
+    """
+    results = []
+    for case in cases:
+        try:
+            result = benchmark_case(
+                case, steps=steps, resets=resets, render_backend=render_backend
+            )
+        except Exception as e:
+            result = dict(case, error="%s: %s" % (type(e).__name__, e))
+        results.append(result)
+        if log is not None:
+            log(result)
+    return results
+
+
+"""
+Output
+"""
+
+
+def system_info():
+    """
+    :return: description of the machine and library versions the benchmark ran with
+    """
+    import gym
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "numpy": np.__version__,
+        "gym": gym.__version__,
+    }
+
+
+def write_results(results, path, extra=None):
+    """
+    Writes the results as JSON or CSV, depending on the file extension.
+    :param results: list of results, as returned by run_sweep
+    :param path: output file, ending in .json or .csv
+    :param extra: optional dict of additional top-level entries (JSON only), eg. import times
+    """
+    if path.endswith(".csv"):
+        columns = []
+        for result in results:
+            columns += [key for key in result if key not in columns]
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(results)
+    elif path.endswith(".json"):
+        document = {"system": system_info(), "results": results}
+        if extra:
+            document.update(extra)
+        with open(path, "w") as f:
+            json.dump(document, f, indent=2)
+    else:
+        raise AttributeError(
+            "Unknown output format. Please use a .json or .csv file extension."
+        )
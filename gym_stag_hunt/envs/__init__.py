@@ -1,7 +1,38 @@
-from gym_stag_hunt.envs.gym.simple import SimpleEnv
-from gym_stag_hunt.envs.gym.hunt import HuntEnv
-from gym_stag_hunt.envs.gym.harvest import HarvestEnv
-from gym_stag_hunt.envs.gym.escalation import EscalationEnv
-from gym_stag_hunt.envs.pettingzoo.hunt import env as ZooHuntEnvironment
-from gym_stag_hunt.envs.pettingzoo.harvest import env as ZooHarvestEnvironment
-from gym_stag_hunt.envs.pettingzoo.escalation import env as ZooEscalationEnvironment
+from importlib import import_module
+
+# The envs are imported on first access, so that importing the package (eg. for the gym registrations, or a single
+# coords-only env) doesn't pull in every env module and PettingZoo along with them.
+_LAZY_ENVS = {
+    "SimpleEnv": ("gym_stag_hunt.envs.gym.simple", "SimpleEnv"),
+    "HuntEnv": ("gym_stag_hunt.envs.gym.hunt", "HuntEnv"),
+    "HarvestEnv": ("gym_stag_hunt.envs.gym.harvest", "HarvestEnv"),
+    "EscalationEnv": ("gym_stag_hunt.envs.gym.escalation", "EscalationEnv"),
+    "MultiHuntEnv": ("gym_stag_hunt.envs.gym.multi_hunt", "MultiHuntEnv"),
+    "ZooHuntEnvironment": ("gym_stag_hunt.envs.pettingzoo.hunt", "env"),
+    "ZooHarvestEnvironment": ("gym_stag_hunt.envs.pettingzoo.harvest", "env"),
+    "ZooEscalationEnvironment": ("gym_stag_hunt.envs.pettingzoo.escalation", "env"),
+    "ZooMultiHuntEnvironment": ("gym_stag_hunt.envs.pettingzoo.multi_hunt", "env"),
+    "VectorHuntEnv": ("gym_stag_hunt.envs.gym.vector_hunt", "VectorHuntEnv"),
+    "VectorHarvestEnv": ("gym_stag_hunt.envs.gym.vector_harvest", "VectorHarvestEnv"),
+    "VectorEscalationEnv": (
+        "gym_stag_hunt.envs.gym.vector_escalation",
+        "VectorEscalationEnv",
+    ),
+    "SubprocVectorEnv": ("gym_stag_hunt.envs.gym.subproc_vector", "SubprocVectorEnv"),
+    "TrajectoryRecorder": ("gym_stag_hunt.envs.gym.recorder", "TrajectoryRecorder"),
+}
+
+__all__ = list(_LAZY_ENVS)
+
+
+def __getattr__(name):
+    if name not in _LAZY_ENVS:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    module_name, attr = _LAZY_ENVS[name]
+    value = getattr(import_module(module_name), attr)
+    globals()[name] = value  # cache it, so __getattr__ is only hit on the first access
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
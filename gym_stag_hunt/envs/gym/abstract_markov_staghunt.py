@@ -2,16 +2,27 @@ from abc import ABC
 
 from gym import Env
 
-from gym_stag_hunt.src.utils import print_matrix
-
 
 class AbstractMarkovStagHuntEnv(Env, ABC):
-    metadata = {"render.modes": ["human", "array"], "obs.types": ["image", "coords"]}
+    metadata = {
+        "render.modes": ["human", "array"],
+        "obs.types": ["image", "coords", "grid"],
+        "render.backends": ["pygame", "numpy"],
+    }
 
-    def __init__(self, grid_size=(5, 5), obs_type="image", enable_multiagent=False):
+    def __init__(
+        self,
+        grid_size=(5, 5),
+        obs_type="image",
+        enable_multiagent=False,
+        render_backend="pygame",
+    ):
         """
         :param grid_size: A (W, H) tuple corresponding to the grid dimensions. Although W=H is expected, W!=H works also
-        :param obs_type: Can be 'image' for pixel-array based observations, or 'coords' for just the entity coordinates
+        :param obs_type: Can be 'image' for pixel-array based observations, 'coords' for just the entity coordinates, or
+                         'grid' for a (C, H, W) tensor marking which cells the entities of each channel occupy
+        :param render_backend: Can be 'pygame', or 'numpy' for drawing frames without pygame. None for envs without a
+                               renderer, which list no render.backends in their metadata
         """
 
         total_cells = grid_size[0] * grid_size[1]
@@ -21,7 +32,11 @@ class AbstractMarkovStagHuntEnv(Env, ABC):
             )
         if obs_type not in self.metadata["obs.types"]:
             raise AttributeError(
-                'Invalid observation type provided. Please specify "image" or "coords"'
+                'Invalid observation type provided. Please specify "image", "coords" or "grid"'
+            )
+        if render_backend not in self.metadata.get("render.backends", [None]):
+            raise AttributeError(
+                'Invalid render backend provided. Please specify "pygame" or "numpy"'
             )
         if grid_size[0] >= 255 or grid_size[1] >= 255:
             raise AttributeError(
@@ -33,6 +48,7 @@ class AbstractMarkovStagHuntEnv(Env, ABC):
         self.obs_type = obs_type
         self.done = False
         self.enable_multiagent = enable_multiagent
+        self.render_backend = render_backend
 
     def step(self, actions):
         """
@@ -43,21 +59,73 @@ class AbstractMarkovStagHuntEnv(Env, ABC):
         """
         return self.game.update(actions)
 
-    def reset(self):
+    def reset(self, seed=None):
         """
         Reset the game state
+        :param seed: If set, the random stream of the game is restarted from this seed first
         :return: initial observation
         """
+        if seed is not None:
+            self.game.seed(seed)
         self.game.reset_entities()
         self.done = False
         return self.game.get_observation()
 
+    def seed(self, seed=None):
+        """
+        Seeds the random number generator of the game (opponent and stag moves, spawn cells, plant growth).
+        :param seed: integer seed, or None to seed from the OS
+        :return: list containing the seed
+        """
+        self.game.seed(seed)
+        return [seed]
+
+    def set_observation_buffer(self, buffer=None):
+        """
+        Switches observations to zero-copy mode: they are written into a persistent buffer and step / reset return
+        that buffer instead of a fresh array. Copy the observation if you need to keep it past the next step.
+        :param buffer: Optional caller-owned uint8 array of the observation shape, eg. batch[i] of a larger batch array,
+                       so observations land directly in the batch. If None, image observations get a buffer allocated
+                       by the env and coords observations become a read-only view of the game state.
+        :return: the buffer observations are written into
+        """
+        return self.game.set_observation_buffer(buffer)
+
+    def clear_observation_buffer(self):
+        """
+        Goes back to returning a new array for every observation.
+        """
+        self.game.clear_observation_buffer()
+
+    def enable_profiling(self, report_in_info=False):
+        """
+        Starts timing the phases of every step (move, reward, respawn, observation, render...).
+        :param report_in_info: Also return the profile in the info dict of every step, under 'profile'
+        :return: the profiler
+        """
+        return self.game.enable_profiling(report_in_info=report_in_info)
+
+    def disable_profiling(self):
+        """
+        Stops timing the phases of every step.
+        """
+        self.game.disable_profiling()
+
+    def get_profile(self):
+        """
+        :return: dictionary mapping each phase to its call count, cumulative and mean time, None if not profiling
+        """
+        return self.game.get_profile()
+
     def render(self, mode="human", obs=None):
         """
         :param obs: observation data (passed for coord observations so we dont have to run the function twice)
         :param mode: rendering mode
         :return:
         """
+        # the printout is only needed when rendering, so that's why this import is here
+        from gym_stag_hunt.src.utils import print_matrix
+
         if mode == "human":
             if self.obs_type == "image":
                 self.game.RENDERER.render_on_display()
@@ -66,11 +134,11 @@ class AbstractMarkovStagHuntEnv(Env, ABC):
                     self.game.RENDERER.update()
                     self.game.RENDERER.render_on_display()
                 else:
-                    if obs is not None:
+                    if obs is not None and self.obs_type == "coords":
                         print_matrix(obs, self.game_title, self.game.GRID_DIMENSIONS)
                     else:
                         print_matrix(
-                            self.game.get_observation(),
+                            self.game.COORD_OBS,
                             self.game_title,
                             self.game.GRID_DIMENSIONS,
                         )
@@ -0,0 +1,112 @@
+from abc import ABC
+
+from gym import Env
+from gym.spaces import Box, Discrete, MultiDiscrete
+from numpy import asarray, full
+
+
+class AbstractVectorMarkovStagHuntEnv(Env, ABC):
+    metadata = {"render.modes": ["human"], "obs.types": ["coords"]}
+
+    def __init__(
+        self, num_envs, grid_size=(5, 5), obs_type="coords", enable_multiagent=False
+    ):
+        """
+        :param num_envs: How many games are stepped together with every call
+        :param grid_size: A (W, H) tuple corresponding to the grid dimensions. Although W=H is expected, W!=H works also
+        :param obs_type: Only 'coords' is supported by the batched games
+        """
+
+        total_cells = grid_size[0] * grid_size[1]
+        if num_envs < 1:
+            raise AttributeError("Please specify at least one environment.")
+        if total_cells < 3:
+            raise AttributeError(
+                "Grid is too small. Please specify a larger grid size."
+            )
+        if obs_type not in self.metadata["obs.types"]:
+            raise AttributeError(
+                'Invalid observation type provided. Please specify "coords"'
+            )
+        if grid_size[0] >= 255 or grid_size[1] >= 255:
+            raise AttributeError(
+                "Grid is too large. Please specify a smaller grid size."
+            )
+
+        super(AbstractVectorMarkovStagHuntEnv, self).__init__()
+
+        self.num_envs = num_envs
+        self.obs_type = obs_type
+        self.done = False
+        self.enable_multiagent = enable_multiagent
+
+    def _make_spaces(self, single_observation_space):
+        """
+        Creates the per-game and batched action/observation spaces.
+        :param single_observation_space: Observation space of one game, as seen by one agent
+        """
+        self.single_observation_space = single_observation_space
+        self.single_action_space = Discrete(5)  # up, down, left, right or stand
+
+        obs_shape = single_observation_space.shape
+        if self.enable_multiagent:
+            obs_shape = (2,) + obs_shape
+            self.action_space = MultiDiscrete(full((self.num_envs, 2), 5))
+        else:
+            self.action_space = MultiDiscrete(full(self.num_envs, 5))
+
+        self.observation_space = Box(
+            single_observation_space.low.min(),
+            single_observation_space.high.max(),
+            shape=(self.num_envs,) + obs_shape,
+            dtype=single_observation_space.dtype,
+        )
+
+    def step(self, actions):
+        """
+        Run one timestep of the dynamics of every environment.
+        :param actions: (N,) array of actions for agent A, in which case agent B follows the opponent policy, or an
+                        (N, 2) array with actions for both agents if multiagent is enabled.
+        :return: observations, rewards, are the games done, additional info
+        """
+        return self.game.update(asarray(actions))
+
+    def reset(self, seed=None):
+        """
+        Reset the state of every game
+        :param seed: If set, the random number generator of the games is seeded with it first
+        :return: initial observations
+        """
+        if seed is not None:
+            self.game.seed(seed)
+        self.game.reset_entities()
+        self.done = False
+        return self.game.get_agent_observations()
+
+    def seed(self, seed=None):
+        """
+        Seeds the random number generator shared by the games.
+        :param seed: integer seed, or None to seed from the OS
+        :return: list containing the seed
+        """
+        self.game.seed(seed)
+        return [seed]
+
+    def render(self, mode="human"):
+        """
+        Prints the first game of the batch.
+        :param mode: rendering mode
+        """
+        # the printout is only needed when rendering, so that's why this import is here
+        from gym_stag_hunt.src.utils import print_matrix
+
+        print_matrix(
+            self.game.get_observation()[0], self.game_title, self.game.GRID_DIMENSIONS
+        )
+
+    def close(self):
+        """
+        Closes all needed resources
+        :return:
+        """
+        pass
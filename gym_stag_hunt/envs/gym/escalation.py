@@ -2,7 +2,7 @@ from gym.spaces import Discrete, Box
 from numpy import Inf, uint8
 
 from gym_stag_hunt.envs.gym.abstract_markov_staghunt import AbstractMarkovStagHuntEnv
-from gym_stag_hunt.src.entities import TILE_SIZE
+from gym_stag_hunt.src.sprites import TILE_SIZE
 from gym_stag_hunt.src.games.escalation_game import Escalation
 
 
@@ -16,11 +16,14 @@ class EscalationEnv(AbstractMarkovStagHuntEnv):
         opponent_policy="pursuit",
         load_renderer=False,
         streak_break_punishment_factor=0.5,
+        render_backend="pygame",
     ):
         """
         :param grid_size: A (W, H) tuple corresponding to the grid dimensions. Although W=H is expected, W!=H works also
         :param screen_size: A (W, H) tuple corresponding to the pixel dimensions of the game window
-        :param obs_type: Can be 'image' for pixel-array based observations, or 'coords' for just the entity coordinates
+        :param obs_type: Can be 'image' for pixel-array based observations, 'coords' for just the entity coordinates, or
+                         'grid' for a (C, H, W) tensor marking which cells the entities of each channel occupy
+        :param render_backend: 'pygame' or 'numpy'. The numpy renderer draws image observations without pygame/SDL
         """
         total_cells = grid_size[0] * grid_size[1]
         if total_cells < 3:
@@ -29,7 +32,10 @@ class EscalationEnv(AbstractMarkovStagHuntEnv):
             )
 
         super(EscalationEnv, self).__init__(
-            grid_size=grid_size, obs_type=obs_type, enable_multiagent=enable_multiagent
+            grid_size=grid_size,
+            obs_type=obs_type,
+            enable_multiagent=enable_multiagent,
+            render_backend=render_backend,
         )
 
         # Rendering and State Variables
@@ -47,6 +53,7 @@ class EscalationEnv(AbstractMarkovStagHuntEnv):
             load_renderer=load_renderer,
             streak_break_punishment_factor=streak_break_punishment_factor,
             opponent_policy=opponent_policy,
+            render_backend=render_backend,
         )
 
         # Environment Config
@@ -55,11 +62,15 @@ class EscalationEnv(AbstractMarkovStagHuntEnv):
             self.observation_space = Box(
                 0,
                 255,
-                shape=(grid_size[0] * TILE_SIZE, grid_size[1] * TILE_SIZE, 3),
+                shape=(grid_size[1] * TILE_SIZE, grid_size[0] * TILE_SIZE, 3),
                 dtype=uint8,
             )
         elif obs_type == "coords":
             self.observation_space = Box(0, max(grid_size), shape=(6,), dtype=uint8)
+        else:  # grid
+            self.observation_space = Box(
+                0, 1, shape=self.game.GRID_OBS_SHAPE, dtype=uint8
+            )
 
         self.reward_range = (
             -Inf,
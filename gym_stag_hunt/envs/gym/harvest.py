@@ -2,7 +2,7 @@ from gym.spaces import Discrete, Box
 from numpy import uint8
 
 from gym_stag_hunt.envs.gym.abstract_markov_staghunt import AbstractMarkovStagHuntEnv
-from gym_stag_hunt.src.entities import TILE_SIZE
+from gym_stag_hunt.src.sprites import TILE_SIZE
 from gym_stag_hunt.src.games.harvest_game import Harvest
 
 
@@ -19,11 +19,14 @@ class HarvestEnv(AbstractMarkovStagHuntEnv):
         chance_to_die=0.1,
         young_reward=1,
         mature_reward=2,
+        render_backend="pygame",
     ):
         """
         :param grid_size: A (W, H) tuple corresponding to the grid dimensions. Although W=H is expected, W!=H works also
         :param screen_size: A (W, H) tuple corresponding to the pixel dimensions of the game window
-        :param obs_type: Can be 'image' for pixel-array based observations, or 'coords' for just the entity coordinates
+        :param obs_type: Can be 'image' for pixel-array based observations, 'coords' for just the entity coordinates, or
+                         'grid' for a (C, H, W) tensor marking which cells the entities of each channel occupy
+        :param render_backend: 'pygame' or 'numpy'. The numpy renderer draws image observations without pygame/SDL
         """
         if young_reward > mature_reward:
             raise AttributeError(
@@ -41,7 +44,10 @@ class HarvestEnv(AbstractMarkovStagHuntEnv):
             )
 
         super(HarvestEnv, self).__init__(
-            grid_size=grid_size, obs_type=obs_type, enable_multiagent=enable_multiagent
+            grid_size=grid_size,
+            obs_type=obs_type,
+            enable_multiagent=enable_multiagent,
+            render_backend=render_backend,
         )
 
         self.game_title = "harvest"
@@ -67,6 +73,7 @@ class HarvestEnv(AbstractMarkovStagHuntEnv):
             chance_to_die=chance_to_die,
             young_reward=young_reward,
             mature_reward=mature_reward,
+            render_backend=render_backend,
         )
 
         self.action_space = Discrete(5)  # up, down, left, right or stand
@@ -75,10 +82,14 @@ class HarvestEnv(AbstractMarkovStagHuntEnv):
             self.observation_space = Box(
                 0,
                 255,
-                shape=(grid_size[0] * TILE_SIZE, grid_size[1] * TILE_SIZE, 3),
+                shape=(grid_size[1] * TILE_SIZE, grid_size[0] * TILE_SIZE, 3),
                 dtype=uint8,
             )
         elif obs_type == "coords":
             self.observation_space = Box(
                 0, max(grid_size), shape=(4 + max_plants * 3,), dtype=uint8
             )
+        else:  # grid
+            self.observation_space = Box(
+                0, 1, shape=self.game.GRID_OBS_SHAPE, dtype=uint8
+            )
@@ -2,7 +2,7 @@ from gym.spaces import Discrete, Box
 from numpy import uint8
 
 from gym_stag_hunt.envs.gym.abstract_markov_staghunt import AbstractMarkovStagHuntEnv
-from gym_stag_hunt.src.entities import TILE_SIZE
+from gym_stag_hunt.src.sprites import TILE_SIZE
 from gym_stag_hunt.src.games.staghunt_game import StagHunt
 
 
@@ -21,17 +21,20 @@ class HuntEnv(AbstractMarkovStagHuntEnv):
         stag_reward=5,
         forage_reward=1,
         mauling_punishment=-5,
+        render_backend="pygame",
     ):
         """
         :param grid_size: A (W, H) tuple corresponding to the grid dimensions. Although W=H is expected, W!=H works also
         :param screen_size: A (W, H) tuple corresponding to the pixel dimensions of the game window
-        :param obs_type: Can be 'image' for pixel-array based observations, or 'coords' for just the entity coordinates
+        :param obs_type: Can be 'image' for pixel-array based observations, 'coords' for just the entity coordinates, or
+                         'grid' for a (C, H, W) tensor marking which cells the entities of each channel occupy
         :param stag_follows: Should the stag seek out the nearest agent (true) or take a random move (false)
         :param run_away_after_maul: Does the stag stay on the same cell after mauling an agent (true) or respawn (false)
         :param forage_quantity: How many plants will be placed on the board.
         :param stag_reward: How much reinforcement the agents get for catching the stag
         :param forage_reward: How much reinforcement the agents get for harvesting a plant
         :param mauling_punishment: How much reinforcement the agents get for trying to catch a stag alone (MUST be neg.)
+        :param render_backend: 'pygame' or 'numpy'. The numpy renderer draws image observations without pygame/SDL
         """
         if not (stag_reward > forage_reward >= 0 > mauling_punishment):
             raise AttributeError(
@@ -56,7 +59,10 @@ class HuntEnv(AbstractMarkovStagHuntEnv):
             )
 
         super(HuntEnv, self).__init__(
-            grid_size=grid_size, obs_type=obs_type, enable_multiagent=enable_multiagent
+            grid_size=grid_size,
+            obs_type=obs_type,
+            enable_multiagent=enable_multiagent,
+            render_backend=render_backend,
         )
 
         self.game_title = "hunt"
@@ -82,6 +88,7 @@ class HuntEnv(AbstractMarkovStagHuntEnv):
             forage_reward=forage_reward,
             mauling_punishment=mauling_punishment,
             opponent_policy=opponent_policy,
+            render_backend=render_backend,
         )
 
         self.action_space = Discrete(5)  # up, down, left, right or stand
@@ -90,10 +97,14 @@ class HuntEnv(AbstractMarkovStagHuntEnv):
             self.observation_space = Box(
                 0,
                 255,
-                shape=(grid_size[0] * TILE_SIZE, grid_size[1] * TILE_SIZE, 3),
+                shape=(grid_size[1] * TILE_SIZE, grid_size[0] * TILE_SIZE, 3),
                 dtype=uint8,
             )
         elif obs_type == "coords":
             self.observation_space = Box(
                 0, max(grid_size), shape=(6 + forage_quantity * 2,), dtype=uint8
             )
+        else:  # grid
+            self.observation_space = Box(
+                0, 1, shape=self.game.GRID_OBS_SHAPE, dtype=uint8
+            )
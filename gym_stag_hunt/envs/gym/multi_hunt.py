@@ -0,0 +1,118 @@
+from sys import stdout
+
+from gym.spaces import Box, MultiDiscrete
+from numpy import asarray, full, uint8
+
+from gym_stag_hunt.envs.gym.abstract_markov_staghunt import AbstractMarkovStagHuntEnv
+from gym_stag_hunt.src.games.multi_hunt_game import MultiHunt
+
+
+class MultiHuntEnv(AbstractMarkovStagHuntEnv):
+    metadata = {
+        "render.modes": ["human"],
+        "obs.types": ["coords", "grid"],
+    }
+
+    def __init__(
+        self,
+        grid_size=(16, 16),
+        obs_type="coords",
+        agent_count=8,
+        stag_count=4,
+        hunters_needed=2,
+        stag_follows=True,
+        run_away_after_maul=False,
+        forage_quantity=8,
+        stag_reward=5,
+        forage_reward=1,
+        mauling_punishment=-5,
+    ):
+        """
+        :param grid_size: A (W, H) tuple corresponding to the grid dimensions. Although W=H is expected, W!=H works also
+        :param obs_type: Can be 'coords' for the coordinates of the agents, stags and plants (agent i at index 2 * i), or
+                         'grid' for a (3, H, W) tensor marking the cells of the agents, the stags and the plants. All
+                         the agents share the one observation.
+        :param agent_count: How many agents hunt on the grid
+        :param stag_count: How many stags roam the grid
+        :param hunters_needed: How many agents have to stand on a stag's cell at once to catch it
+        :param stag_follows: Should the stags seek out the nearest agent (true) or take a random move (false)
+        :param run_away_after_maul: Does a stag stay on the same cell after mauling an agent (true) or respawn (false)
+        :param forage_quantity: How many plants will be placed on the board.
+        :param stag_reward: How much reinforcement each of the agents catching a stag gets
+        :param forage_reward: How much reinforcement an agent gets for harvesting a plant
+        :param mauling_punishment: How much reinforcement the agents get for trying to catch a stag with too few hunters
+                                   (MUST be neg.)
+        """
+        if not (stag_reward > forage_reward >= 0 > mauling_punishment):
+            raise AttributeError(
+                "The game does not qualify as a Stag Hunt, please change parameters so that "
+                "stag_reward > forage_reward >= 0 > mauling_punishment"
+            )
+        if agent_count < 2 or stag_count < 1:
+            raise AttributeError(
+                "Please specify at least two agents and at least one stag."
+            )
+        if not (1 <= hunters_needed <= agent_count):
+            raise AttributeError(
+                "Hunters needed must be between 1 and the number of agents."
+            )
+        if agent_count + stag_count + forage_quantity >= grid_size[0] * grid_size[1]:
+            raise AttributeError(
+                "Too many entities. The agents, stags and plants will not fit on the grid."
+            )
+
+        super(MultiHuntEnv, self).__init__(
+            grid_size=grid_size,
+            obs_type=obs_type,
+            enable_multiagent=True,
+            render_backend=None,
+        )
+
+        self.game_title = "multi_hunt"
+        self.agent_count = agent_count
+        self.stag_reward = stag_reward
+        self.forage_reward = forage_reward
+        self.mauling_punishment = mauling_punishment
+        self.reward_range = (mauling_punishment, stag_reward)
+
+        self.game = MultiHunt(
+            agent_count=agent_count,
+            stag_count=stag_count,
+            hunters_needed=hunters_needed,
+            stag_follows=stag_follows,
+            run_away_after_maul=run_away_after_maul,
+            forage_quantity=forage_quantity,
+            stag_reward=stag_reward,
+            forage_reward=forage_reward,
+            mauling_punishment=mauling_punishment,
+            grid_size=grid_size,
+            obs_type=obs_type,
+        )
+
+        # up, down, left, right or stand, for every agent
+        self.action_space = MultiDiscrete(full(agent_count, 5))
+
+        high = max(grid_size) if obs_type == "coords" else 1
+        self.observation_space = Box(0, high, shape=self.game.OBS_SHAPE, dtype=uint8)
+
+    def step(self, actions):
+        """
+        :param actions: (N,) ints, the action of every agent
+        :return: observation, (N,) rewards, is the game done, additional info
+        """
+        return self.game.update(asarray(actions))
+
+    def render(self, mode="human", obs=None):
+        """
+        Prints the grid, with the number of agents on each cell, S for stags and P for plants.
+        :param mode: rendering mode
+        :param obs: unused, the grid is drawn from the game state
+        """
+        rows = [["·"] * self.game.GRID_W for _ in range(self.game.GRID_H)]
+        for x, y in self.game.PLANTS.tolist():
+            rows[y][x] = "P"
+        for x, y in self.game.STAGS.tolist():
+            rows[y][x] = "S"
+        for x, y in self.game.AGENTS.tolist():
+            rows[y][x] = str(int(rows[y][x]) + 1) if rows[y][x].isdigit() else "1"
+        stdout.write("\n".join(" ".join(row) for row in rows) + "\n\n")
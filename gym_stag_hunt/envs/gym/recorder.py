@@ -0,0 +1,123 @@
+from gym import Wrapper
+from numpy import bool_, empty, float32, int32, uint8, uint64
+
+from gym_stag_hunt.src.trajectory import TrajectoryWriter
+from gym_stag_hunt.src.utils import RNG_STATE_SIZE
+
+
+class TrajectoryRecorder(Wrapper):
+    def __init__(
+        self,
+        env,
+        directory,
+        record_frames=False,
+        frame_chunk_size=256,
+        flush_every=1024,
+        capacity=4096,
+    ):
+        """
+        Records everything the wrapped env does into a trajectory directory, which load_trajectory reads back. Every
+        reset and every step adds one row to these columns:
+            states     - the game state afterwards, laid out like the coords observation (agent A's perspective)
+            rng_states - the state of the game's random stream afterwards, see RandomBuffer.get_state
+            actions    - the actions that were taken, one per agent (0 on reset rows)
+            rewards    - the rewards, one per agent (0 on reset rows)
+            dones      - the done flag the env returned
+            resets     - True for the rows recorded by reset, which start a new episode
+            streaks    - the current streak, only for Escalation
+        Step t of an episode is the transition from row t - 1 to row t, so the rows of the states column are exactly
+        the observations the agents saw.
+        :param env: HuntEnv, HarvestEnv, EscalationEnv or MultiHuntEnv
+        :param directory: where the trajectory is written, created if needed
+        :param record_frames: Also store the image frame of every row, compressed in chunks. Needs image observations,
+                              or an env created with load_renderer=True.
+        :param frame_chunk_size: how many frames go into one compressed file
+        :param flush_every: after how many rows the column files are flushed and the manifest rewritten
+        :param capacity: how many rows the column files have room for before they first need to grow
+        """
+        super(TrajectoryRecorder, self).__init__(env)
+
+        game = env.game
+        self._game = game
+        agent_count = getattr(env, "agent_count", 2 if env.enable_multiagent else 1)
+
+        self._writer = TrajectoryWriter(
+            directory,
+            metadata={
+                "game": env.game_title,
+                "grid_size": list(game.GRID_DIMENSIONS),
+                "obs_type": env.obs_type,
+                "enable_multiagent": bool(env.enable_multiagent),
+                "agent_count": agent_count,
+            },
+            flush_every=flush_every,
+        )
+        self._states = self._writer.add_column(
+            "states", uint8, game.STATE.shape, capacity=capacity
+        )
+        self._rng_states = self._writer.add_column(
+            "rng_states", uint64, (RNG_STATE_SIZE,), capacity=capacity
+        )
+        self._rng_state = empty(RNG_STATE_SIZE, dtype=uint64)
+        self._actions = self._writer.add_column(
+            "actions", uint8, (agent_count,), capacity=capacity
+        )
+        self._rewards = self._writer.add_column(
+            "rewards", float32, (agent_count,), capacity=capacity
+        )
+        self._dones = self._writer.add_column("dones", bool_, capacity=capacity)
+        self._resets = self._writer.add_column("resets", bool_, capacity=capacity)
+        self._streaks = None
+        if hasattr(game, "STREAK"):
+            self._streaks = self._writer.add_column("streaks", int32, capacity=capacity)
+
+        self._frames = None
+        if record_frames:
+            if env.obs_type != "image" and game.RENDERER is None:
+                raise AttributeError(
+                    "Recording frames needs image observations, or an env created with load_renderer=True."
+                )
+            self._frames = self._writer.add_frames(
+                game.IMAGE_OBS_SHAPE, chunk_size=frame_chunk_size
+            )
+
+    def reset(self, seed=None, **kwargs):
+        obs = self.env.reset(seed=seed, **kwargs)
+        self._record(obs, 0, 0.0, False, True)
+        return obs
+
+    def step(self, action):
+        obs, rewards, done, info = self.env.step(action)
+        # multi-agent steps return an observation per agent, the frames are agent A's
+        frame = obs[0] if self.env.enable_multiagent else obs
+        self._record(frame, action, rewards, done, False)
+        return obs, rewards, done, info
+
+    def _record(self, obs, action, rewards, done, reset):
+        """
+        Appends a row to every column.
+        """
+        game = self._game
+        self._states.append(game.STATE)
+        self._rng_states.append(game.RANDOM.get_state(out=self._rng_state))
+        self._actions.append(action)
+        self._rewards.append(rewards)
+        self._dones.append(done)
+        self._resets.append(reset)
+        if self._streaks is not None:
+            self._streaks.append(game.STREAK)
+        if self._frames is not None:
+            self._frames.append(
+                obs if self.env.obs_type == "image" else game.RENDERER.update()
+            )
+        self._writer.row_written()
+
+    def flush(self):
+        """
+        Makes everything recorded so far readable from the files.
+        """
+        self._writer.flush()
+
+    def close(self):
+        self._writer.close()
+        return self.env.close()
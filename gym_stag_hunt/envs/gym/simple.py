@@ -2,7 +2,9 @@ from sys import stdout
 
 from gym import Env
 from gym.spaces import Discrete, Box
-from numpy.random import randint
+from numpy import arange, array, asarray, broadcast_arrays, float64, stack
+
+from gym_stag_hunt.src.utils import RandomBuffer
 
 COOPERATE = 0
 DEFECT = 1
@@ -45,6 +47,21 @@ class SimpleEnv(Env):
         self.defect_together_reward = defect_together_reward
         self.failed_cooperation_punishment = failed_cooperation_punishment
 
+        # Payoff tensor, indexed by [a_action, b_action] it gives (a_reward, b_reward)
+        self._payoffs = array(
+            [
+                [
+                    [cooperation_reward, cooperation_reward],
+                    [failed_cooperation_punishment, defect_alone_reward],
+                ],
+                [
+                    [defect_alone_reward, failed_cooperation_punishment],
+                    [defect_together_reward, defect_together_reward],
+                ],
+            ],
+            dtype=float64,
+        )
+
         # State Variables
         self.done = False
         self.ep = 0
@@ -65,22 +82,17 @@ class SimpleEnv(Env):
                         random move, or two, in which case each agent takes the specified action.
         :return: observation, rewards, is the game done, additional info
         """
-        self.ep = self.ep + 1
-        if self.ep >= self.final_ep:
-            done = True
-            self.ep = 0
-        else:
-            done = False
+        done = bool(self._advance_episode()[0])
 
         if isinstance(actions, list):
             a_action = actions[0]
             if len(actions) > 1:
                 b_action = actions[1]
             else:
-                b_action = randint(0, 1)
+                b_action = self._random.integers(2)
         else:
             a_action = actions
-            b_action = randint(0, 1)
+            b_action = self._random.integers(2)
 
         b_cooperated = b_action == COOPERATE
 
@@ -101,10 +113,83 @@ class SimpleEnv(Env):
 
         return obs, reward, done, {}
 
-    def reset(self):
+    def step_batch(self, actions):
+        """
+        Play a batch of stag hunt games at once, looking the rewards up in the payoff tensor.
+        :param actions: (N, 2) array of actions for both agents, or an (N,) array of agent A actions in which case the
+                        opponents pick uniformly at random. A (K, N, 2) array plays K rounds of N games, which count as
+                        K rounds towards eps_per_game.
+        :return: (..., 2) actions taken (the observation), (..., 2) rewards, is the game done, additional info. For K
+                 rounds, done is a (K,) mask marking every round after which eps_per_game was reached.
+        """
+        actions = asarray(actions)
+        rounds = actions.shape[0] if actions.ndim == 3 else 1
+        dones = self._advance_episode(rounds=rounds)
+        done = dones if actions.ndim == 3 else bool(dones[0])
+
+        if actions.ndim == 1:
+            actions = stack(
+                [actions, self._rng.integers(0, 2, size=len(actions))], axis=1
+            )
+        rewards = self._payoffs[actions[..., 0], actions[..., 1]]
+
+        return actions, rewards, done, {}
+
+    def play_rounds(self, a_coop_probs, b_coop_probs, rounds):
+        """
+        Play many rounds between pairs of mixed strategies. Rounds are independent, so instead of simulating them one
+        by one we draw how often each of the four outcomes happens from a multinomial distribution.
+        :param a_coop_probs: (N,) probabilities of agent A cooperating, one for every pair
+        :param b_coop_probs: (N,) probabilities of agent B cooperating, one for every pair
+        :param rounds: How many rounds every pair plays
+        :return: (N, 2) total rewards of each pair, (N, 2, 2) outcome counts indexed by [a_action, b_action]
+        """
+        a_coop = asarray(a_coop_probs, dtype=float64)
+        b_coop = asarray(b_coop_probs, dtype=float64)
+        a_coop, b_coop = broadcast_arrays(a_coop, b_coop)
+
+        a_defect, b_defect = 1 - a_coop, 1 - b_coop
+        outcome_probs = stack(
+            [
+                a_coop * b_coop,
+                a_coop * b_defect,
+                a_defect * b_coop,
+                a_defect * b_defect,
+            ],
+            axis=-1,
+        )
+        counts = self._rng.multinomial(rounds, outcome_probs)
+        total_rewards = counts @ self._payoffs.reshape(4, 2)
+
+        return total_rewards, counts.reshape(counts.shape[:-1] + (2, 2))
+
+    def _advance_episode(self, rounds=1):
+        """
+        Counts played rounds towards eps_per_game. The counter starts over every time eps_per_game is reached.
+        :param rounds: how many rounds were played
+        :return: (rounds,) mask, True for the rounds after which eps_per_game has been reached
+        """
+        eps = self.ep + arange(1, rounds + 1)
+        self.ep = int(eps[-1] % self.final_ep)
+        return eps % self.final_ep == 0
+
+    def seed(self, seed=None):
+        """
+        Seeds the random number generator of the opponent and the batched methods.
+        :param seed: integer seed, or None to seed from the OS
+        :return: list containing the seed
+        """
+        self._random = RandomBuffer(seed)
+        self._rng = self._random.GENERATOR
+        return [seed]
+
+    def reset(self, seed=None):
         """
         Reset the game state
+        :param seed: If set, the random number generator is seeded with it first
         """
+        if seed is not None:
+            self.seed(seed)
         self.done = False
         self.ep = 0
 
@@ -152,3 +237,11 @@ class SimpleEnv(Env):
 
     def close(self):
         quit()
+
+    """
+    Properties
+    """
+
+    @property
+    def PAYOFFS(self):
+        return self._payoffs
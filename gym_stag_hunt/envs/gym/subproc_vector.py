@@ -0,0 +1,313 @@
+import multiprocessing as mp
+import traceback
+
+from gym import Env
+from gym.spaces import Box, MultiDiscrete
+from gym.vector.utils import CloudpickleWrapper
+from numpy import asarray, bool_, dtype, float64, frombuffer, full, int64, prod
+from numpy.ctypeslib import as_ctypes_type
+
+from gym_stag_hunt.src.utils import env_seeds
+
+"""
+Worker Commands
+"""
+STEP = "step"
+RESET = "reset"
+CLOSE = "close"
+
+
+def _shared_array(ctx, shape, array_dtype):
+    """
+    :param ctx: multiprocessing context the array is created with
+    :param shape: shape of the array
+    :param array_dtype: numpy dtype of the array
+    :return: RawArray of the right size, to be viewed as a numpy array with _as_array
+    """
+    return ctx.RawArray(as_ctypes_type(dtype(array_dtype)), int(prod(shape)))
+
+
+def _as_array(raw, shape, array_dtype):
+    """
+    :return: numpy view of a RawArray created with _shared_array
+    """
+    return frombuffer(raw, dtype=array_dtype).reshape(shape)
+
+
+class SubprocVectorEnv(Env):
+    metadata = {"render.modes": ["rgb_array"]}
+
+    def __init__(self, env_fns, max_episode_steps=None, copy=True, context=None):
+        """
+        Steps HuntEnv / HarvestEnv / EscalationEnv instances in parallel, one subprocess per env. Workers write
+        observations, rewards and done flags straight into shared memory, only the (small) info dicts go through pipes.
+        Observations are written directly into the shared observation array (image observations are rendered straight
+        into it), so they are never copied or pickled between processes.
+        :param env_fns: list of callables which create the envs, eg. [lambda: HuntEnv(obs_type="image")] * 8
+        :param max_episode_steps: If set, an episode ends after that many steps. The stag hunt games never end on their
+                                  own, so this is what drives the auto-reset.
+        :param copy: Return copies of the shared arrays (true) or the shared arrays themselves, which get overwritten
+                     by the next step (false)
+        :param context: multiprocessing start method, eg. 'fork', 'spawn' or 'forkserver'. Platform default if None
+        """
+        if len(env_fns) < 1:
+            raise AttributeError("Please specify at least one environment.")
+
+        super(SubprocVectorEnv, self).__init__()
+
+        dummy_env = env_fns[0]()  # used for reading the spaces only
+        self.enable_multiagent = dummy_env.enable_multiagent
+        self.obs_type = dummy_env.obs_type
+        self.single_observation_space = dummy_env.observation_space
+        self.single_action_space = dummy_env.action_space
+        dummy_env.close()
+
+        self.num_envs = len(env_fns)
+        self.copy = copy
+        self._waiting = False
+        self._closed = False
+
+        agent_count = 2 if self.enable_multiagent else 1
+        obs_dtype = self.single_observation_space.dtype
+        obs_shape = (self.num_envs,) + self.single_observation_space.shape
+        reward_shape = (self.num_envs,)
+        action_shape = (self.num_envs,)
+        if self.enable_multiagent:
+            obs_shape = (
+                self.num_envs,
+                agent_count,
+            ) + self.single_observation_space.shape
+            reward_shape = action_shape = (self.num_envs, agent_count)
+
+        self.observation_space = Box(
+            self.single_observation_space.low.min(),
+            self.single_observation_space.high.max(),
+            shape=obs_shape,
+            dtype=obs_dtype,
+        )
+        self.action_space = MultiDiscrete(
+            full(action_shape, self.single_action_space.n)
+        )
+
+        # Shared Memory
+        ctx = mp.get_context(context)
+        self._layout = {
+            "obs": (obs_shape, obs_dtype),
+            "rewards": (reward_shape, float64),
+            "dones": ((self.num_envs,), bool_),
+            "actions": (action_shape, int64),
+        }
+        shared = {
+            key: _shared_array(ctx, shape, array_dtype)
+            for key, (shape, array_dtype) in self._layout.items()
+        }
+        self._obs, self._rewards, self._dones, self._actions = [
+            _as_array(shared[key], *self._layout[key])
+            for key in ("obs", "rewards", "dones", "actions")
+        ]
+
+        # Workers
+        self._pipes, self._processes = [], []
+        for index, env_fn in enumerate(env_fns):
+            parent_pipe, child_pipe = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                name="SubprocVectorEnvWorker-%d" % index,
+                args=(
+                    index,
+                    CloudpickleWrapper(env_fn),
+                    child_pipe,
+                    parent_pipe,
+                    shared,
+                    self._layout,
+                    max_episode_steps,
+                ),
+                daemon=True,
+            )
+            process.start()
+            child_pipe.close()
+            self._pipes.append(parent_pipe)
+            self._processes.append(process)
+
+    """
+    Controller Methods
+    """
+
+    def reset(self, seed=None):
+        """
+        Reset every env.
+        :param seed: If set, the envs are seeded first: env i with seed + i, or with seed[i] if a list is passed
+        :return: (N, ...) initial observations
+        """
+        self._assert_not_waiting()
+        for pipe, env_seed in zip(self._pipes, env_seeds(seed, self.num_envs)):
+            pipe.send((RESET, env_seed))
+        self._receive()
+        return self._obs.copy() if self.copy else self._obs
+
+    def step_async(self, actions):
+        """
+        Sends the actions to the workers and returns immediately, so the caller can work while the envs step.
+        :param actions: (N,) actions for agent A, or (N, 2) actions for both agents if multiagent is enabled
+        """
+        self._assert_not_waiting()
+        self._actions[:] = asarray(actions)
+        for pipe in self._pipes:
+            pipe.send((STEP, None))
+        self._waiting = True
+
+    def step_wait(self):
+        """
+        Waits for the steps started by step_async to finish. Envs whose episode ended are reset automatically, their
+        last observation is stored under 'terminal_observation' in the info dict.
+        :return: observations, rewards, are the episodes done, list of info dicts
+        """
+        if not self._waiting:
+            raise RuntimeError("step_wait called without calling step_async first.")
+        infos = self._receive()
+        self._waiting = False
+
+        if self.copy:
+            return self._obs.copy(), self._rewards.copy(), self._dones.copy(), infos
+        return self._obs, self._rewards, self._dones, infos
+
+    def step(self, actions):
+        """
+        Run one timestep of every env.
+        :param actions: (N,) actions for agent A, or (N, 2) actions for both agents if multiagent is enabled
+        :return: observations, rewards, are the episodes done, list of info dicts
+        """
+        self.step_async(actions)
+        return self.step_wait()
+
+    def render(self, mode="rgb_array"):
+        """
+        Returns the current frame of every env, as seen by agent A. The frames are the image observations the workers
+        already wrote into shared memory, so only envs with obs_type='image' can be rendered.
+        :param mode: rendering mode, only 'rgb_array' is supported
+        :return: (N, H * 32, W * 32, 3) array with the frame of every env
+        """
+        self._assert_not_waiting()
+        if mode not in self.metadata["render.modes"]:
+            raise AttributeError(
+                'Invalid render mode provided. Please specify "rgb_array"'
+            )
+        if self.obs_type != "image":
+            raise AttributeError(
+                'SubprocVectorEnv can only render envs with obs_type="image".'
+            )
+        frames = self._obs[:, 0] if self.enable_multiagent else self._obs
+        return frames.copy()
+
+    def close(self):
+        """
+        Shuts the workers down.
+        """
+        if self._closed:
+            return
+        if self._waiting:
+            self._receive()
+            self._waiting = False
+        for pipe in self._pipes:
+            pipe.send((CLOSE, None))
+        for pipe in self._pipes:
+            pipe.recv()
+            pipe.close()
+        for process in self._processes:
+            process.join()
+        self._closed = True
+
+    """
+    Misc
+    """
+
+    def _receive(self):
+        """
+        :return: the info dicts sent back by the workers
+        """
+        results = [pipe.recv() for pipe in self._pipes]
+        errors = [result for ok, result in results if not ok]
+        if errors:
+            self._closed = True
+            for process in self._processes:
+                process.terminate()
+            raise RuntimeError("A SubprocVectorEnv worker failed:\n" + errors[0])
+        return [result for _, result in results]
+
+    def _assert_not_waiting(self):
+        if self._closed:
+            raise RuntimeError("Trying to use a closed SubprocVectorEnv.")
+        if self._waiting:
+            raise RuntimeError(
+                "Waiting for a pending step_async, call step_wait first."
+            )
+
+    def __del__(self):
+        if not getattr(self, "_closed", True):
+            self.close()
+
+
+def _worker(index, env_fn, pipe, parent_pipe, shared, layout, max_episode_steps):
+    """
+    Runs one env, reading its actions from and writing its results to the shared arrays.
+    """
+    parent_pipe.close()
+    # (1, ...) views of the rows that belong to this env
+    obs, rewards, dones, actions = [
+        _as_array(shared[key], *layout[key])[index : index + 1]
+        for key in ("obs", "rewards", "dones", "actions")
+    ]
+    obs = obs[0]
+    env = None
+    try:
+        env = env_fn()
+        multiagent = env.enable_multiagent
+        # write agent A's observations straight into shared memory
+        frame_buffer = env.set_observation_buffer(obs[0] if multiagent else obs)
+
+        def reset(seed=None):
+            observation = env.reset(seed=seed)
+            if multiagent:  # reset only returns agent A's observation
+                return observation, env.game._flip_observation_perspective(observation)
+            return observation
+
+        def write_obs(observation):
+            if multiagent:
+                a_obs, b_obs = observation
+                if a_obs is not frame_buffer:
+                    obs[0] = a_obs
+                obs[1] = b_obs
+            elif observation is not frame_buffer:
+                obs[:] = observation
+
+        steps = 0
+        while True:
+            command, data = pipe.recv()
+            if command == STEP:
+                observation, reward, done, info = env.step(
+                    actions[0].tolist() if multiagent else int(actions[0])
+                )
+                steps += 1
+                if max_episode_steps is not None and steps >= max_episode_steps:
+                    info = dict(info, **{"TimeLimit.truncated": not done})
+                    done = True
+                write_obs(observation)
+                rewards[:] = reward
+                dones[:] = done
+                if done:
+                    info = dict(info, terminal_observation=obs.copy())
+                    write_obs(reset())
+                    steps = 0
+                pipe.send((True, info))
+            elif command == RESET:
+                write_obs(reset(seed=data))
+                steps = 0
+                pipe.send((True, {}))
+            elif command == CLOSE:
+                pipe.send((True, None))
+                break
+    except (KeyboardInterrupt, Exception):
+        pipe.send((False, traceback.format_exc()))
+    finally:
+        if env is not None:
+            env.close()
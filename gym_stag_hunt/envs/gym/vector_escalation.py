@@ -0,0 +1,60 @@
+from gym.spaces import Box
+from numpy import inf, uint8
+
+from gym_stag_hunt.envs.gym.abstract_vector_markov_staghunt import (
+    AbstractVectorMarkovStagHuntEnv,
+)
+from gym_stag_hunt.src.games.vector_escalation_game import VectorEscalation
+
+
+class VectorEscalationEnv(AbstractVectorMarkovStagHuntEnv):
+    def __init__(
+        self,
+        num_envs=16,
+        grid_size=(5, 5),
+        obs_type="coords",
+        enable_multiagent=False,
+        opponent_policy="pursuit",
+        streak_break_punishment_factor=0.5,
+        seed=None,
+    ):
+        """
+        Steps num_envs Escalation games at once. Observations and rewards are laid out like in EscalationEnv.
+        :param num_envs: How many games are stepped together with every call
+        :param grid_size: A (W, H) tuple corresponding to the grid dimensions. Although W=H is expected, W!=H works also
+        :param obs_type: Only 'coords' is supported by the batched games
+        :param opponent_policy: Policy of agent B when multiagent is disabled, 'random' or 'pursuit'
+        :param streak_break_punishment_factor: The factor for calculating the negative reinforcement
+        :param seed: Optional seed for the random number generator of the games
+        """
+        if opponent_policy not in ("random", "pursuit"):
+            raise AttributeError(
+                'Invalid opponent policy provided. Please specify "random" or "pursuit"'
+            )
+
+        super(VectorEscalationEnv, self).__init__(
+            num_envs=num_envs,
+            grid_size=grid_size,
+            obs_type=obs_type,
+            enable_multiagent=enable_multiagent,
+        )
+
+        # Rendering and State Variables
+        self.game_title = "escalation"
+        self.streak_break_punishment_factor = streak_break_punishment_factor
+        self.game = VectorEscalation(
+            num_games=num_envs,
+            grid_size=grid_size,
+            enable_multiagent=enable_multiagent,
+            streak_break_punishment_factor=streak_break_punishment_factor,
+            opponent_policy=opponent_policy,
+            seed=seed,
+        )
+
+        # Environment Config
+        self._make_spaces(Box(0, max(grid_size), shape=(6,), dtype=uint8))
+
+        self.reward_range = (
+            -inf,
+            inf,
+        )  # There is technically no limit on how high or low the reinforcement can be
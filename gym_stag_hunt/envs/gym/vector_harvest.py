@@ -0,0 +1,71 @@
+from gym.spaces import Box
+from numpy import uint8
+
+from gym_stag_hunt.envs.gym.abstract_vector_markov_staghunt import (
+    AbstractVectorMarkovStagHuntEnv,
+)
+from gym_stag_hunt.src.games.vector_harvest_game import VectorHarvest
+
+
+class VectorHarvestEnv(AbstractVectorMarkovStagHuntEnv):
+    def __init__(
+        self,
+        num_envs=16,
+        grid_size=(5, 5),
+        obs_type="coords",
+        enable_multiagent=False,
+        max_plants=4,
+        chance_to_mature=0.1,
+        chance_to_die=0.1,
+        young_reward=1,
+        mature_reward=2,
+        seed=None,
+    ):
+        """
+        Steps num_envs Harvest games at once. Rewards follow the same rules as HarvestEnv.
+        :param num_envs: How many games are stepped together with every call
+        :param grid_size: A (W, H) tuple corresponding to the grid dimensions. Although W=H is expected, W!=H works also
+        :param obs_type: Only 'coords' is supported by the batched games
+        :param seed: Optional seed for the random number generator of the games
+        """
+        if young_reward > mature_reward:
+            raise AttributeError(
+                "The game does not qualify as a Stag Hunt, please change parameters so that "
+                "young_reward > mature_reward"
+            )
+        total_cells = grid_size[0] * grid_size[1]
+        if max_plants >= total_cells - 2:  # -2 is for the cells occupied by the agents
+            raise AttributeError(
+                "Plant quantity is too high. The plants will not fit on the grid."
+            )
+
+        super(VectorHarvestEnv, self).__init__(
+            num_envs=num_envs,
+            grid_size=grid_size,
+            obs_type=obs_type,
+            enable_multiagent=enable_multiagent,
+        )
+
+        self.game_title = "harvest"
+        self.max_plants = max_plants
+        self.chance_to_mature = chance_to_mature
+        self.chance_to_die = chance_to_die
+        self.young_reward = young_reward
+        self.mature_reward = mature_reward
+        self.reward_range = (0, mature_reward)
+
+        self.game = VectorHarvest(
+            num_games=num_envs,
+            grid_size=grid_size,
+            enable_multiagent=enable_multiagent,
+            max_plants=max_plants,
+            chance_to_mature=chance_to_mature,
+            chance_to_die=chance_to_die,
+            young_reward=young_reward,
+            mature_reward=mature_reward,
+            seed=seed,
+        )
+
+        self._make_spaces(
+            Box(0, max(grid_size), shape=(4 + max_plants * 3,), dtype=uint8)
+        )
@@ -0,0 +1,91 @@
+from gym.spaces import Box
+from numpy import uint8
+
+from gym_stag_hunt.envs.gym.abstract_vector_markov_staghunt import (
+    AbstractVectorMarkovStagHuntEnv,
+)
+from gym_stag_hunt.src.games.vector_staghunt_game import VectorStagHunt
+
+
+class VectorHuntEnv(AbstractVectorMarkovStagHuntEnv):
+    def __init__(
+        self,
+        num_envs=16,
+        grid_size=(5, 5),
+        obs_type="coords",
+        enable_multiagent=False,
+        opponent_policy="random",
+        stag_follows=True,
+        run_away_after_maul=False,
+        forage_quantity=2,
+        stag_reward=5,
+        forage_reward=1,
+        mauling_punishment=-5,
+        seed=None,
+    ):
+        """
+        Steps num_envs Hunt games at once. Rewards follow the same rules as HuntEnv.
+        :param num_envs: How many games are stepped together with every call
+        :param grid_size: A (W, H) tuple corresponding to the grid dimensions. Although W=H is expected, W!=H works also
+        :param obs_type: Only 'coords' is supported by the batched games
+        :param opponent_policy: Policy of agent B when multiagent is disabled, 'random' or 'pursuit'
+        :param stag_follows: Should the stag seek out the nearest agent (true) or take a random move (false)
+        :param run_away_after_maul: Does the stag stay on the same cell after mauling an agent (true) or respawn (false)
+        :param forage_quantity: How many plants will be placed on the board.
+        :param stag_reward: How much reinforcement the agents get for catching the stag
+        :param forage_reward: How much reinforcement the agents get for harvesting a plant
+        :param mauling_punishment: How much reinforcement the agents get for trying to catch a stag alone (MUST be neg.)
+        :param seed: Optional seed for the random number generator of the games
+        """
+        if not (stag_reward > forage_reward >= 0 > mauling_punishment):
+            raise AttributeError(
+                "The game does not qualify as a Stag Hunt, please change parameters so that "
+                "stag_reward > forage_reward >= 0 > mauling_punishment"
+            )
+        if mauling_punishment == forage_reward:
+            raise AttributeError(
+                "Mauling punishment and forage reward are equal."
+                " Game logic will not function properly."
+            )
+        if opponent_policy not in ("random", "pursuit"):
+            raise AttributeError(
+                'Invalid opponent policy provided. Please specify "random" or "pursuit"'
+            )
+        total_cells = grid_size[0] * grid_size[1]
+        if (
+            forage_quantity >= total_cells - 3
+        ):  # -3 is for the cells occupied by the agents and stag
+            raise AttributeError(
+                "Forage quantity is too high. The plants will not fit on the grid."
+            )
+
+        super(VectorHuntEnv, self).__init__(
+            num_envs=num_envs,
+            grid_size=grid_size,
+            obs_type=obs_type,
+            enable_multiagent=enable_multiagent,
+        )
+
+        self.game_title = "hunt"
+        self.stag_reward = stag_reward
+        self.forage_reward = forage_reward
+        self.mauling_punishment = mauling_punishment
+        self.reward_range = (mauling_punishment, stag_reward)
+
+        self.game = VectorStagHunt(
+            num_games=num_envs,
+            grid_size=grid_size,
+            enable_multiagent=enable_multiagent,
+            stag_reward=stag_reward,
+            stag_follows=stag_follows,
+            run_away_after_maul=run_away_after_maul,
+            forage_quantity=forage_quantity,
+            forage_reward=forage_reward,
+            mauling_punishment=mauling_punishment,
+            opponent_policy=opponent_policy,
+            seed=seed,
+        )
+
+        self._make_spaces(
+            Box(0, max(grid_size), shape=(6 + forage_quantity * 2,), dtype=uint8)
+        )
@@ -1,5 +1,10 @@
 from gym_stag_hunt.envs.gym.escalation import EscalationEnv
-from gym_stag_hunt.envs.pettingzoo.shared import PettingZooEnv
+from gym_stag_hunt.envs.gym.vector_escalation import VectorEscalationEnv
+from gym_stag_hunt.envs.pettingzoo.shared import (
+    BatchedPettingZooEnv,
+    PettingZooEnv,
+    VectorPettingZooEnv,
+)
 from pettingzoo.utils import parallel_to_aec
 
 
@@ -11,6 +16,24 @@ def raw_env(**kwargs):
     return parallel_to_aec(env(**kwargs))
 
 
+def batched_env(num_envs, **kwargs):
+    """
+    :param num_envs: How many copies of the game are stepped together
+    :return: A parallel env over num_envs games, with (num_envs, ...) batches for every agent
+    """
+    kwargs["enable_multiagent"] = True
+    return BatchedPettingZooEnv([EscalationEnv(**kwargs) for _ in range(num_envs)])
+
+
+def vector_env(num_envs=16, **kwargs):
+    """
+    :param num_envs: How many copies of the game are stepped together
+    :return: A SuperSuit-style vector env backed by one batched game, with num_envs * 2 rows (one per agent per game)
+    """
+    kwargs["enable_multiagent"] = True
+    return VectorPettingZooEnv(VectorEscalationEnv(num_envs=num_envs, **kwargs))
+
+
 class ZooEscalationEnvironment(PettingZooEnv):
     metadata = {"render_modes": ["human", "array"], "name": "escalation_pz"}
 
@@ -23,6 +46,8 @@ class ZooEscalationEnvironment(PettingZooEnv):
         opponent_policy="pursuit",
         load_renderer=False,
         streak_break_punishment_factor=0.5,
+        render_backend="pygame",
+        reuse_containers=False,
     ):
         escalation_env = EscalationEnv(
             grid_size,
@@ -32,5 +57,6 @@ class ZooEscalationEnvironment(PettingZooEnv):
             opponent_policy,
             load_renderer,
             streak_break_punishment_factor,
+            render_backend,
         )
-        super().__init__(og_env=escalation_env)
+        super().__init__(og_env=escalation_env, reuse_containers=reuse_containers)
@@ -1,5 +1,10 @@
 from gym_stag_hunt.envs.gym.harvest import HarvestEnv
-from gym_stag_hunt.envs.pettingzoo.shared import PettingZooEnv
+from gym_stag_hunt.envs.gym.vector_harvest import VectorHarvestEnv
+from gym_stag_hunt.envs.pettingzoo.shared import (
+    BatchedPettingZooEnv,
+    PettingZooEnv,
+    VectorPettingZooEnv,
+)
 from pettingzoo.utils import parallel_to_aec
 
 
@@ -11,6 +16,24 @@ def raw_env(**kwargs):
     return parallel_to_aec(env(**kwargs))
 
 
+def batched_env(num_envs, **kwargs):
+    """
+    :param num_envs: How many copies of the game are stepped together
+    :return: A parallel env over num_envs games, with (num_envs, ...) batches for every agent
+    """
+    kwargs["enable_multiagent"] = True
+    return BatchedPettingZooEnv([HarvestEnv(**kwargs) for _ in range(num_envs)])
+
+
+def vector_env(num_envs=16, **kwargs):
+    """
+    :param num_envs: How many copies of the game are stepped together
+    :return: A SuperSuit-style vector env backed by one batched game, with num_envs * 2 rows (one per agent per game)
+    """
+    kwargs["enable_multiagent"] = True
+    return VectorPettingZooEnv(VectorHarvestEnv(num_envs=num_envs, **kwargs))
+
+
 class ZooHarvestEnvironment(PettingZooEnv):
     metadata = {"render_modes": ["human", "array"], "name": "harvest_pz"}
 
@@ -26,6 +49,8 @@ class ZooHarvestEnvironment(PettingZooEnv):
         chance_to_die=0.1,
         young_reward=1,
         mature_reward=2,
+        render_backend="pygame",
+        reuse_containers=False,
     ):
         harvest_env = HarvestEnv(
             grid_size,
@@ -38,5 +63,6 @@ class ZooHarvestEnvironment(PettingZooEnv):
             chance_to_die,
             young_reward,
             mature_reward,
+            render_backend,
         )
-        super().__init__(og_env=harvest_env)
+        super().__init__(og_env=harvest_env, reuse_containers=reuse_containers)
@@ -1,5 +1,10 @@
 from gym_stag_hunt.envs.gym.hunt import HuntEnv
-from gym_stag_hunt.envs.pettingzoo.shared import PettingZooEnv
+from gym_stag_hunt.envs.gym.vector_hunt import VectorHuntEnv
+from gym_stag_hunt.envs.pettingzoo.shared import (
+    BatchedPettingZooEnv,
+    PettingZooEnv,
+    VectorPettingZooEnv,
+)
 from pettingzoo.utils import parallel_to_aec
 
 
@@ -11,6 +16,24 @@ def raw_env(**kwargs):
     return parallel_to_aec(env(**kwargs))
 
 
+def batched_env(num_envs, **kwargs):
+    """
+    :param num_envs: How many copies of the game are stepped together
+    :return: A parallel env over num_envs games, with (num_envs, ...) batches for every agent
+    """
+    kwargs["enable_multiagent"] = True
+    return BatchedPettingZooEnv([HuntEnv(**kwargs) for _ in range(num_envs)])
+
+
+def vector_env(num_envs=16, **kwargs):
+    """
+    :param num_envs: How many copies of the game are stepped together
+    :return: A SuperSuit-style vector env backed by one batched game, with num_envs * 2 rows (one per agent per game)
+    """
+    kwargs["enable_multiagent"] = True
+    return VectorPettingZooEnv(VectorHuntEnv(num_envs=num_envs, **kwargs))
+
+
 class ZooHuntEnvironment(PettingZooEnv):
     metadata = {"render_modes": ["human", "array"], "name": "hunt_pz"}
 
@@ -28,6 +51,8 @@ class ZooHuntEnvironment(PettingZooEnv):
         stag_reward=5,
         forage_reward=1,
         mauling_punishment=-5,
+        render_backend="pygame",
+        reuse_containers=False,
     ):
         hunt_env = HuntEnv(
             grid_size,
@@ -42,5 +67,6 @@ class ZooHuntEnvironment(PettingZooEnv):
             stag_reward,
             forage_reward,
             mauling_punishment,
+            render_backend,
         )
-        super().__init__(og_env=hunt_env)
+        super().__init__(og_env=hunt_env, reuse_containers=reuse_containers)
@@ -0,0 +1,59 @@
+import functools
+
+from gym_stag_hunt.envs.gym.multi_hunt import MultiHuntEnv
+from gym_stag_hunt.envs.pettingzoo.shared import PettingZooEnv
+from pettingzoo.utils import parallel_to_aec
+
+
+def env(**kwargs):
+    return ZooMultiHuntEnvironment(**kwargs)
+
+
+def raw_env(**kwargs):
+    return parallel_to_aec(env(**kwargs))
+
+
+class ZooMultiHuntEnvironment(PettingZooEnv):
+    metadata = {"render_modes": ["human"], "name": "multi_hunt_pz"}
+
+    def __init__(
+        self,
+        grid_size=(16, 16),
+        obs_type="coords",
+        agent_count=8,
+        stag_count=4,
+        hunters_needed=2,
+        stag_follows=True,
+        run_away_after_maul=False,
+        forage_quantity=8,
+        stag_reward=5,
+        forage_reward=1,
+        mauling_punishment=-5,
+        reuse_containers=False,
+    ):
+        multi_hunt_env = MultiHuntEnv(
+            grid_size,
+            obs_type,
+            agent_count,
+            stag_count,
+            hunters_needed,
+            stag_follows,
+            run_away_after_maul,
+            forage_quantity,
+            stag_reward,
+            forage_reward,
+            mauling_punishment,
+        )
+        super().__init__(
+            og_env=multi_hunt_env,
+            reuse_containers=reuse_containers,
+            agent_count=agent_count,
+        )
+
+    @functools.lru_cache(maxsize=None)
+    def action_space(self, agent):
+        return self.env.action_space[0]
+
+    def _agent_observations(self, observations):
+        # all agents see the whole grid
+        return [observations] * len(self.possible_agents)
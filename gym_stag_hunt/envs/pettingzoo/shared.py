@@ -1,8 +1,18 @@
 from pettingzoo.utils import wrappers
 from pettingzoo import ParallelEnv
-from pettingzoo.utils import agent_selector
+
+from gym import Env
+from gym.spaces import Box
+from numpy import asarray, empty, zeros
 import functools
 
+from gym_stag_hunt.src.utils import env_seeds
+
+try:
+    from pettingzoo.utils import AgentSelector as agent_selector
+except ImportError:  # older PettingZoo releases
+    from pettingzoo.utils import agent_selector
+
 
 def default_wrappers(env_init):
     """
@@ -18,13 +28,30 @@ def default_wrappers(env_init):
     return env_init
 
 
+def _agent_observations(env, obs):
+    """
+    :param env: multiagent gym env
+    :param obs: observation returned by the env's reset, which is from the perspective of agent A
+    :return: observation of agent A, observation of agent B
+    """
+    return obs, env.game._flip_observation_perspective(obs)
+
+
 class PettingZooEnv(ParallelEnv):
-    def __init__(self, og_env):
+    def __init__(self, og_env, reuse_containers=False, agent_count=2):
+        """
+        :param og_env: The gym env to wrap
+        :param reuse_containers: If true, step fills and returns the same observation / reward / done / info dicts
+                                 every time instead of building new ones. The returned dicts (and their info dicts) are
+                                 overwritten by the next step, so copy them if you need to keep them around.
+        :param agent_count: How many agents the env steps, it takes one action and returns one observation per agent
+        """
         super().__init__()
 
         self.env = og_env
+        self.reuse_containers = reuse_containers
 
-        self.possible_agents = ["player_" + str(n) for n in range(2)]
+        self.possible_agents = ["player_" + str(n) for n in range(agent_count)]
         self.agents = self.possible_agents[:]
 
         self.agent_name_mapping = dict(
@@ -45,11 +72,16 @@ class PettingZooEnv(ParallelEnv):
         self._cumulative_rewards = dict(zip(self.agents, [0.0 for _ in self.agents]))
         self.infos = dict(zip(self.agents, [{} for _ in self.agents]))
         self.accumulated_actions = []
-        self.current_observations = {
-            agent: self.env.observation_space.sample() for agent in self.agents
-        }
+        self.current_observations = {agent: None for agent in self.agents}
         self.t = 0
-        self.last_rewards = [0.0, 0.0]
+        self.last_rewards = [0.0 for _ in self.agents]
+
+        # Containers reused by every step when reuse_containers is set
+        self._action_buffer = [0 for _ in self.possible_agents]
+        self._step_obs = {agent: None for agent in self.possible_agents}
+        self._step_rewards = {agent: 0.0 for agent in self.possible_agents}
+        self._step_dones = {agent: False for agent in self.possible_agents}
+        self._step_infos = {agent: {} for agent in self.possible_agents}
 
     # this cache ensures that same space object is returned for the same agent
     # allows action space seeding to work as expected
@@ -67,7 +99,7 @@ class PettingZooEnv(ParallelEnv):
     def close(self):
         self.env.close()
 
-    def reset(self):
+    def reset(self, seed=None):
         self.agents = self.possible_agents[:]
         self._agent_selector.reinit(self.agents)
         self.agent_selection = self._agent_selector.next()
@@ -75,25 +107,243 @@ class PettingZooEnv(ParallelEnv):
         self._cumulative_rewards = dict(zip(self.agents, [0.0 for _ in self.agents]))
         self.infos = dict(zip(self.agents, [{} for _ in self.agents]))
         self.dones = dict(zip(self.agents, [False for _ in self.agents]))
-        obs = self.env.reset()
+        obs = self.env.reset(seed=seed)
         self.accumulated_actions = []
         self.current_observations = {agent: obs for agent in self.agents}
         self.t = 0
 
         return self.current_observations
 
+    def _agent_observations(self, observations):
+        """
+        :param observations: observation returned by the env's step
+        :return: sequence with the observation of every agent, in the order of possible_agents
+        """
+        return observations
+
     def step(self, actions):
+        if self.reuse_containers:
+            return self._step_reusing_containers(actions)
+
         observations, rewards, env_done, info = self.env.step(list(actions.values()))
 
-        obs = {self.agents[0]: observations[0], self.agents[1]: observations[1]}
-        rewards = {self.agents[0]: rewards[0], self.agents[1]: rewards[1]}
+        obs = dict(zip(self.agents, self._agent_observations(observations)))
+        rewards = dict(zip(self.agents, rewards))
         dones = {agent: env_done for agent in self.agents}
         infos = {agent: {} for agent in self.agents}
+        self.current_observations = obs
 
         return obs, rewards, dones, infos
 
+    def _step_reusing_containers(self, actions):
+        """
+        Same as step, but writes the results into the preallocated dicts instead of building new ones.
+        """
+        action_buffer = self._action_buffer
+        for idx, agent in enumerate(self.possible_agents):
+            action_buffer[idx] = actions[agent]
+
+        observations, rewards, env_done, info = self.env.step(action_buffer)
+        observations = self._agent_observations(observations)
+
+        for idx, agent in enumerate(self.possible_agents):
+            self._step_obs[agent] = observations[idx]
+            self._step_rewards[agent] = rewards[idx]
+            self._step_dones[agent] = env_done
+            self._step_infos[agent].clear()
+        self.current_observations = self._step_obs
+
+        return self._step_obs, self._step_rewards, self._step_dones, self._step_infos
+
     def observe(self, agent):
         return self.current_observations[agent]
 
     def state(self):
         pass
+
+
+class BatchedPettingZooEnv(ParallelEnv):
+    def __init__(self, og_envs):
+        """
+        Parallel API over several copies of a game. Every value in the observation / reward / done dicts is batched
+        over the envs, eg. observations[agent] is an (M, ...) array. The dicts and arrays are allocated once and
+        overwritten by every step, and image envs render straight into the observation batch.
+        :param og_envs: list of M gym envs with multiagent enabled
+        """
+        super().__init__()
+
+        if len(og_envs) < 1:
+            raise AttributeError("Please specify at least one environment.")
+        if not all(env.enable_multiagent for env in og_envs):
+            raise AttributeError(
+                "The batched environment needs envs with enable_multiagent=True."
+            )
+
+        self.envs = og_envs
+        self.num_envs = len(og_envs)
+        self.obs_type = og_envs[0].obs_type
+
+        self.possible_agents = ["player_" + str(n) for n in range(2)]
+        self.agents = self.possible_agents[:]
+        self.agent_name_mapping = dict(
+            zip(self.possible_agents, list(range(len(self.possible_agents))))
+        )
+
+        single_space = og_envs[0].observation_space
+        self._observation_space = Box(
+            single_space.low.min(),
+            single_space.high.max(),
+            shape=(self.num_envs,) + single_space.shape,
+            dtype=single_space.dtype,
+        )
+        self._action_space = og_envs[0].action_space
+
+        # Batched containers, reused by every step
+        batch_shape = self._observation_space.shape
+        if self.obs_type == "image":
+            # both agents see the same frame, so they share one batch which the renderers write into directly
+            frames = empty(batch_shape, dtype=single_space.dtype)
+            for idx, env in enumerate(self.envs):
+                env.set_observation_buffer(frames[idx])
+            self._observations = {agent: frames for agent in self.possible_agents}
+        else:
+            self._observations = {
+                agent: empty(batch_shape, dtype=single_space.dtype)
+                for agent in self.possible_agents
+            }
+            # agent A's coordinates are written straight into its batch, only agent B's flipped ones are copied
+            a_batch = self._observations[self.possible_agents[0]]
+            for idx, env in enumerate(self.envs):
+                env.set_observation_buffer(a_batch[idx])
+        self._rewards = {agent: zeros(self.num_envs) for agent in self.possible_agents}
+        self._dones = {
+            agent: zeros(self.num_envs, dtype=bool) for agent in self.possible_agents
+        }
+        self._env_infos = [{} for _ in self.envs]
+        self._infos = {agent: self._env_infos for agent in self.possible_agents}
+        self._action_buffer = [0 for _ in self.possible_agents]
+
+    # this cache ensures that same space object is returned for the same agent
+    # allows action space seeding to work as expected
+    @functools.lru_cache(maxsize=None)
+    def observation_space(self, agent):
+        return self._observation_space
+
+    @functools.lru_cache(maxsize=None)
+    def action_space(self, agent):
+        return self._action_space
+
+    def render(self, mode="human"):
+        self.envs[0].render(mode)
+
+    def close(self):
+        for env in self.envs:
+            env.close()
+
+    def reset(self, seed=None):
+        """
+        :param seed: If set, the envs are seeded first: env i with seed + i, or with seed[i] if a list is passed
+        :return: dict mapping each agent to its (M, ...) batch of initial observations
+        """
+        self.agents = self.possible_agents[:]
+        env_seed_list = env_seeds(seed, self.num_envs)
+        for idx, env in enumerate(self.envs):
+            a_obs, b_obs = _agent_observations(env, env.reset(seed=env_seed_list[idx]))
+            self._write_observations(idx, a_obs, b_obs)
+        return self._observations
+
+    def step(self, actions):
+        """
+        :param actions: dict mapping each agent to its (M,) actions
+        :return: observations, rewards, dones and infos, each a dict mapping the agents to their batches
+        """
+        a_actions, b_actions = (actions[agent] for agent in self.possible_agents)
+        a_rewards, b_rewards = (self._rewards[agent] for agent in self.possible_agents)
+        a_dones, b_dones = (self._dones[agent] for agent in self.possible_agents)
+        action_buffer = self._action_buffer
+
+        for idx, env in enumerate(self.envs):
+            action_buffer[0], action_buffer[1] = a_actions[idx], b_actions[idx]
+            (a_obs, b_obs), rewards, done, info = env.step(action_buffer)
+            self._write_observations(idx, a_obs, b_obs)
+            a_rewards[idx], b_rewards[idx] = rewards
+            a_dones[idx] = b_dones[idx] = done
+            self._env_infos[idx] = info
+
+        return self._observations, self._rewards, self._dones, self._infos
+
+    def _write_observations(self, idx, a_obs, b_obs):
+        """
+        Copies the observations of env idx into the batches, unless the env rendered them there already.
+        """
+        if self.obs_type == "image":
+            return
+        self._observations[self.possible_agents[1]][idx] = b_obs
+
+    def state(self):
+        pass
+
+
+class VectorPettingZooEnv(Env):
+    def __init__(self, og_env):
+        """
+        Vector env over the agents of a batched game, with the same layout as SuperSuit's pettingzoo_env_to_vec_env_v1:
+        each of the M games contributes one row per agent, so observations are (M * 2, obs_dim) and row 2 * m + i
+        belongs to possible_agents[i] in game m. Everything is a view of (or written into) arrays of the batched game,
+        there is no per-game Python wrapper.
+        :param og_env: batched gym env (VectorHuntEnv, VectorHarvestEnv or VectorEscalationEnv) with multiagent enabled
+        """
+        super().__init__()
+
+        if not og_env.enable_multiagent:
+            raise AttributeError(
+                "The vector environment needs a batched env with enable_multiagent=True."
+            )
+
+        self.env = og_env
+        self.possible_agents = ["player_" + str(n) for n in range(2)]
+        self.agents = self.possible_agents[:]
+        self.agent_name_mapping = dict(
+            zip(self.possible_agents, list(range(len(self.possible_agents))))
+        )
+
+        self.num_games = og_env.num_envs
+        self.num_envs = self.num_games * len(self.possible_agents)
+        self.observation_space = og_env.single_observation_space
+        self.action_space = og_env.single_action_space
+
+        self._dones = zeros(self.num_envs, dtype=bool)
+        self._infos = [{} for _ in range(self.num_envs)]
+
+    def reset(self, seed=None):
+        """
+        :param seed: If set, the random number generator of the batched game is seeded with it first
+        :return: (M * 2, obs_dim) initial observations
+        """
+        return self.env.reset(seed=seed).reshape(self.num_envs, -1)
+
+    def step(self, actions):
+        """
+        :param actions: (M * 2,) actions, one for each agent of each game
+        :return: (M * 2, obs_dim) observations, (M * 2,) rewards, (M * 2,) dones, list of M * 2 info dicts
+        """
+        obs, rewards, dones, info = self.env.step(self._as_game_actions(actions))
+        self._dones.reshape(self.num_games, -1)[:] = dones[:, None]
+        return (
+            obs.reshape(self.num_envs, -1),
+            rewards.reshape(self.num_envs),
+            self._dones,
+            self._infos,
+        )
+
+    def _as_game_actions(self, actions):
+        """
+        :return: the (M * 2,) agent actions as (M, 2) actions for the batched game
+        """
+        return asarray(actions).reshape(self.num_games, len(self.possible_agents))
+
+    def render(self, mode="human"):
+        self.env.render(mode)
+
+    def close(self):
+        self.env.close()
@@ -1,23 +1,7 @@
-import os
-
 from pygame import image, Rect, transform
 from pygame.sprite import DirtySprite
 
-base_path = os.path.dirname(os.path.dirname(__file__))
-entity_path = os.path.join(base_path, "assets/entities")
-
-sprite_dict = {
-    "a_agent": os.path.join(entity_path, "blue_agent.png"),
-    "b_agent": os.path.join(entity_path, "red_agent.png"),
-    "stag": os.path.join(entity_path, "stag.png"),
-    "plant": os.path.join(entity_path, "plant_fruit.png"),
-    "plant_young": os.path.join(entity_path, "plant_no_fruit.png"),
-    "mark": os.path.join(entity_path, "mark.png"),
-    "mark_active": os.path.join(entity_path, "mark_active.png"),
-    "game_icon": os.path.join(base_path, "assets/icon.png"),
-}
-
-TILE_SIZE = 32
+from gym_stag_hunt.src.sprites import TILE_SIZE, sprite_dict
 
 
 def load_img(path):
@@ -28,11 +12,48 @@ def load_img(path):
     return image.load(path).convert_alpha()
 
 
+"""
+Sprite Cache
+"""
+
+# Scaled sprite surfaces keyed by (entity_type, tile_size), shared by every entity / renderer in the process
+_sprite_cache = {}
+
+
+def get_sprite(entity_type, tile_size=TILE_SIZE):
+    """
+    Decodes and scales each asset once, then hands out the same surface to everyone that asks for it. The returned
+    surface is shared, so it must not be drawn on.
+    :param entity_type: String specifying which sprite to load from the sprite dictionary (sprite_dict)
+    :param tile_size: Width and height (in pixels) the sprite is scaled to
+    :return: The scaled sprite surface.
+    """
+    key = (entity_type, tile_size)
+    sprite = _sprite_cache.get(key)
+    if sprite is None:
+        sprite = transform.scale(
+            load_img(sprite_dict[entity_type]), (tile_size, tile_size)
+        )
+        _sprite_cache[key] = sprite
+    return sprite
+
+
+def clear_sprite_cache():
+    """
+    Drops the cached surfaces. They are converted to the pixel format of the display, so this has to be called when
+    pygame shuts down.
+    """
+    _sprite_cache.clear()
+
+
 def get_gui_window_icon():
     """
     :return: The icon to display in the render window.
     """
-    return image.load(sprite_dict["game_icon"])
+    key = ("game_icon", None)
+    if key not in _sprite_cache:
+        _sprite_cache[key] = image.load(sprite_dict["game_icon"])
+    return _sprite_cache[key]
 
 
 class Entity(DirtySprite):
@@ -41,10 +62,12 @@ class Entity(DirtySprite):
         :param entity_type: String specifying which sprite to load from the sprite dictionary (sprite_dict)
         :param location: [X, Y] location of the sprite. We calculate the pixel position by multiplying it by cell_sizes
         """
+        # sprites start out dirty, so they get drawn on the first frame
         DirtySprite.__init__(self)
-        self._image = transform.scale(  # Load, scale and record the entity sprite
-            load_img(sprite_dict[entity_type]), (TILE_SIZE, TILE_SIZE)
-        )
+        self._image = get_sprite(entity_type)  # record the (shared) entity sprite
+        self.image = self._image  # currently displayed image
+        self.rect = None
+        self.drawn_rect = None  # where the sprite was drawn last frame
         self.update_rect(location)  # do the initial rect update
 
     def update_rect(self, new_loc):
@@ -52,9 +75,30 @@ class Entity(DirtySprite):
         :param new_loc: New [X, Y] location of the sprite.
         :return: Nothing, but the sprite updates it's state so it is rendered in the right place next iteration.
         """
-        self.rect = Rect(
-            new_loc[0] * TILE_SIZE, new_loc[1] * TILE_SIZE, TILE_SIZE, TILE_SIZE
+        rect = Rect(
+            int(new_loc[0]) * TILE_SIZE,
+            int(new_loc[1]) * TILE_SIZE,
+            TILE_SIZE,
+            TILE_SIZE,
         )
+        if rect != self.rect:
+            self.rect = rect
+            self.dirty = 1
+
+    def set_image(self, image):
+        """
+        :param image: Image to display from now on. The sprite is flagged dirty if it changes.
+        """
+        if image is not self.image:
+            self.image = image
+            self.dirty = 1
+
+    def mark_drawn(self):
+        """
+        Records that the sprite has been drawn at its current position.
+        """
+        self.drawn_rect = self.rect
+        self.dirty = 0
 
     @property
     def IMAGE(self):
@@ -64,9 +108,10 @@ class Entity(DirtySprite):
 class HarvestPlant(Entity):
     def __init__(self, location):
         Entity.__init__(self, location=location, entity_type="plant")
-        self._image_young = transform.scale(
-            load_img(sprite_dict["plant_young"]), (TILE_SIZE, TILE_SIZE)
-        )
+        self._image_young = get_sprite("plant_young")
+
+    def set_mature(self, is_mature):
+        self.set_image(self.IMAGE if is_mature else self.IMAGE_YOUNG)
 
     @property
     def IMAGE_YOUNG(self):
@@ -76,9 +121,10 @@ class HarvestPlant(Entity):
 class Mark(Entity):
     def __init__(self, location):
         Entity.__init__(self, location=location, entity_type="mark")
-        self._image_active = transform.scale(
-            load_img(sprite_dict["mark_active"]), (TILE_SIZE, TILE_SIZE)
-        )
+        self._image_active = get_sprite("mark_active")
+
+    def set_active(self, is_active):
+        self.set_image(self.IMAGE_ACTIVE if is_active else self.IMAGE)
 
     @property
     def IMAGE_ACTIVE(self):
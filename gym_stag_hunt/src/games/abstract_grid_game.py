@@ -1,7 +1,22 @@
 from abc import ABC
-
-from numpy import zeros, uint8, array
-from numpy.random import choice
+from functools import lru_cache
+
+from numpy import (
+    arange,
+    array,
+    clip,
+    empty,
+    int64,
+    intp,
+    ravel_multi_index,
+    uint8,
+    uint64,
+    zeros,
+)
+
+from gym_stag_hunt.src.profiling import PhaseProfiler
+from gym_stag_hunt.src.sprites import TILE_SIZE
+from gym_stag_hunt.src.utils import RNG_STATE_SIZE, OccupancyGrid, RandomBuffer
 
 # Possible Moves
 LEFT = 0
@@ -10,14 +25,76 @@ RIGHT = 2
 UP = 3
 STAND = 4
 
+# Coordinate deltas for each move, indexed by action
+MOVE_OFFSETS = ((-1, 0), (0, 1), (1, 0), (0, -1), (0, 0))
+
+
+"""
+Transition Tables
+"""
+
+
+@lru_cache(maxsize=None)
+def transition_table(grid_w, grid_h):
+    """
+    Where every move leads, built once per grid size and shared by all the games of that size.
+    :param grid_w: width of the grid
+    :param grid_h: height of the grid
+    :return: read-only (W * H, 5) array, entry [x + y * W, action] is the index of the cell the move ends on. Moves
+             into a wall leave the entity where it is.
+    """
+    cells = arange(grid_w * grid_h)
+    x, y = cells % grid_w, cells // grid_w
+    table = empty((grid_w * grid_h, len(MOVE_OFFSETS)), dtype=intp)
+    for action, (dx, dy) in enumerate(MOVE_OFFSETS):
+        table[:, action] = (
+            clip(x + dx, 0, grid_w - 1) + clip(y + dy, 0, grid_h - 1) * grid_w
+        )
+    table.flags.writeable = False
+    return table
+
+
+@lru_cache(maxsize=None)
+def coord_transition_table(grid_w, grid_h):
+    """
+    :param grid_w: width of the grid
+    :param grid_h: height of the grid
+    :return: read-only (W, H, 5, 2) uint8 array, entry [x, y, action] is the (X, Y) coordinate the move ends on. Batched
+             engines move any number of entities with a single fancy index into it.
+    """
+    cells = transition_table(grid_w, grid_h)
+    table = empty((grid_w, grid_h, len(MOVE_OFFSETS), 2), dtype=uint8)
+    table[..., 0] = (cells % grid_w).reshape(grid_h, grid_w, -1).transpose(1, 0, 2)
+    table[..., 1] = (cells // grid_w).reshape(grid_h, grid_w, -1).transpose(1, 0, 2)
+    table.flags.writeable = False
+    return table
+
+
+@lru_cache(maxsize=None)
+def coord_transition_lookup(grid_w, grid_h):
+    """
+    :param grid_w: width of the grid
+    :param grid_h: height of the grid
+    :return: coord_transition_table as nested tuples, [x][y][action] is an (X, Y) tuple. Indexing tuples is much
+             cheaper than indexing an array one element at a time, so this is what the scalar games use.
+    """
+    return tuple(
+        tuple(tuple(tuple(move) for move in cell) for cell in column)
+        for column in coord_transition_table(grid_w, grid_h).tolist()
+    )
+
 
 class AbstractGridGame(ABC):
-    def __init__(self, grid_size, screen_size, obs_type, enable_multiagent):
+    def __init__(
+        self, grid_size, screen_size, obs_type, enable_multiagent, state_size=4
+    ):
         """
         :param grid_size: A (W, H) tuple corresponding to the grid dimensions. Although W=H is expected, W!=H works also
         :param screen_size: A (W, H) tuple corresponding to the pixel dimensions of the game window
-        :param obs_type: Can be 'image' for pixel-array based observations, or 'coords' for just the entity coordinates
+        :param obs_type: Can be 'image' for pixel-array based observations, 'coords' for just the entity coordinates, or
+                         'grid' for a (C, H, W) tensor marking which cells the entities of each channel occupy
         :param enable_multiagent: Boolean signifying if the env will be used to train multiple agents or one.
+        :param state_size: Length of the state array, which has the layout of the coords observation
         """
         if screen_size[0] * screen_size[1] == 0:
             raise AttributeError(
@@ -29,11 +106,37 @@ class AbstractGridGame(ABC):
         self._obs_type = obs_type  # record type of observation as attribute
         self._grid_size = grid_size  # record grid dimensions as attribute
         self._enable_multiagent = enable_multiagent
-
-        self._a_pos = zeros(
-            2, dtype=uint8
-        )  # create empty coordinate tuples for the agents
-        self._b_pos = zeros(2, dtype=uint8)
+        # when set, observations are written into it instead of a new array
+        self._obs_buffer = None
+        self._profiler = None  # only set while profiling is enabled
+        # per-game random stream, seeded from the OS until seed is called
+        self._random = RandomBuffer()
+
+        # All the entity coordinates live in one contiguous array, laid out like the coords observation. Entity
+        # positions are views into it, so the coords observation is just a copy (or a view) of the state.
+        self._state = zeros(state_size, dtype=uint8)
+        # read-only view, handed out as the zero-copy coords observation
+        self._state_view = self._state.view()
+        self._state_view.flags.writeable = False
+        self._a_pos = self._state[0:2]  # coordinates of the agents
+        self._b_pos = self._state[2:4]
+
+        # Observation from the perspective of agent B is the state with the agent coordinates swapped
+        self._flip_index = arange(state_size)
+        self._flip_index[0:4] = 2, 3, 0, 1
+        self._b_obs_buffer = zeros(state_size, dtype=uint8)
+
+        # Snapshots returned by get_state: the random stream, the state, then whatever else the game keeps
+        self._extra_state_start = RNG_STATE_SIZE + state_size
+
+        # Layout of the grid observation, the games with more entities set their own
+        self._set_grid_layout(channels=[0, 1], channel_count=2)
+
+        # Where every move leads, shared by all the games with this grid size
+        self._transitions = coord_transition_lookup(self.GRID_W, self.GRID_H)
+
+        # Cells taken by entities which rarely move (eg. plants), used for spawning and collision checks
+        self._occupancy = OccupancyGrid(grid_size, random_buffer=self._random)
 
     """
     Observations
@@ -43,14 +146,129 @@ class AbstractGridGame(ABC):
         """
         :return: observation of the current game state
         """
-        return (
-            self.RENDERER.update()
-            if self._obs_type == "image"
-            else self._coord_observation()
-        )
+        if self._obs_type == "image":
+            return self.RENDERER.update(out=self._obs_buffer)
+        if self._obs_type == "grid":
+            return self._grid_observation(out=self._obs_buffer)
+        if self._obs_buffer is None:
+            return self._coord_observation()
+        if self._obs_buffer is not self._state_view:
+            self._obs_buffer[:] = self._state
+        return self._obs_buffer
+
+    def set_observation_buffer(self, buffer=None):
+        """
+        Makes observations get written into a persistent buffer, so no array is allocated per step. Every observation
+        returned afterwards is the buffer itself and gets overwritten by the next one. The same goes for the
+        observation of agent B in multiagent mode, which is written into a buffer owned by the game.
+        :param buffer: A (H * 32, W * 32, 3) uint8 array for image observations, a (state size,) uint8 array for coords
+                       observations or a (C, H, W) uint8 array for grid observations, eg. a slot of a caller-owned batch
+                       array. If None, image and grid observations get a newly allocated buffer and coords observations
+                       become a read-only view of the game state.
+        :return: the buffer observations are written into
+        """
+        shape = self.OBS_SHAPE
+        if buffer is None:
+            if self._obs_type == "coords":
+                buffer = self._state_view
+            else:
+                buffer = empty(shape, dtype=uint8)
+        elif buffer.shape != shape or buffer.dtype != uint8:
+            raise AttributeError(
+                "Observation buffer must be a uint8 array of shape " + str(shape)
+            )
+        self._obs_buffer = buffer
+        return buffer
+
+    def clear_observation_buffer(self):
+        """
+        Goes back to returning a newly allocated array for every observation.
+        """
+        self._obs_buffer = None
 
     def _coord_observation(self):
-        return array(self.AGENTS)
+        """
+        :return: array of all the entity coordinates
+        """
+        return self._state.copy()
+
+    def seed(self, seed=None):
+        """
+        Restarts the random stream of the game, which drives the opponent, the stag, and where entities spawn.
+        :param seed: integer seed, or None to seed from the OS
+        """
+        self._random.seed(seed)
+
+    def _set_grid_layout(self, channels, channel_count, x_index=None):
+        """
+        Describes how the grid observation is built from the game state.
+        :param channels: for every entity in the state, the channel it is marked in
+        :param channel_count: number of channels of the grid observation
+        :param x_index: for every entity, the index of its X coordinate in the state (Y follows right after). If None,
+                        the state is taken to be a sequence of (X, Y) pairs.
+        """
+        if x_index is None:
+            x_index = arange(0, 2 * len(channels), 2)
+        self._grid_channels = array(channels, dtype=intp)
+        self._grid_x_index = array(x_index, dtype=intp)
+        self._grid_y_index = self._grid_x_index + 1
+        self._grid_obs_shape = (channel_count, self.GRID_H, self.GRID_W)
+
+        # Observation from the perspective of agent B has the channels of the agents swapped
+        self._grid_flip_index = arange(channel_count)
+        self._grid_flip_index[0:2] = 1, 0
+        self._b_grid_buffer = zeros(self._grid_obs_shape, dtype=uint8)
+
+    def _grid_entity_channels(self):
+        """
+        :return: for every entity in the state, the channel it is currently marked in
+        """
+        return self._grid_channels
+
+    def _grid_observation(self, out=None):
+        """
+        Scatters the entity coordinates into an occupancy tensor, without rendering anything.
+        :param out: Optional (C, H, W) uint8 array the observation is written into
+        :return: (C, H, W) array where [c, y, x] is 1 if an entity of channel c is on cell (x, y), 0 otherwise
+        """
+        if out is None:
+            out = zeros(self._grid_obs_shape, dtype=uint8)
+        else:
+            out.fill(0)
+        cells = ravel_multi_index(
+            (
+                self._grid_entity_channels(),
+                self._state[self._grid_y_index],
+                self._state[self._grid_x_index],
+            ),
+            self._grid_obs_shape,
+        )
+        out.put(cells, 1)
+        return out
+
+    def _flip_observation_perspective(self, a_obs):
+        """
+        :param a_obs: observation from the perspective of agent A
+        :return: the observation from the perspective of agent B
+        """
+        if self._obs_type == "coords":
+            return self._flip_coord_observation_perspective(a_obs)
+        if self._obs_type == "grid":
+            return self._flip_grid_observation_perspective(a_obs)
+        return a_obs  # both agents see the same frame
+
+    def _flip_grid_observation_perspective(self, a_obs):
+        """
+        Swaps the channels of agent A and agent B.
+        :param a_obs: Original grid observation
+        :return: Original observation, from the perspective of agent B. If observation buffers are used, this is a
+                 buffer owned by the game which gets overwritten by the next call.
+        """
+        if self._obs_buffer is None:
+            return a_obs.take(self._grid_flip_index, axis=0)
+        return a_obs.take(
+            self._grid_flip_index, axis=0, out=self._b_grid_buffer, mode="clip"
+        )
 
     def _flip_coord_observation_perspective(self, a_obs):
         """
@@ -58,32 +276,147 @@ class AbstractGridGame(ABC):
         first index) into the "perspective of agent B" (by flipping the positions of the A and B coordinates in the
         observation array)
         :param a_obs: Original observation
-        :return: Original observation, from the perspective of agent B
+        :return: Original observation, from the perspective of agent B. If observation buffers are used, this is a
+                 buffer owned by the game which gets overwritten by the next call.
+        """
+        if self._obs_buffer is None:
+            return a_obs.take(self._flip_index)
+        # mode="clip" lets take write straight into out, the default mode buffers the result first
+        return a_obs.take(self._flip_index, out=self._b_obs_buffer, mode="clip")
+
+    """
+    State Snapshots
+    """
+
+    def get_state(self, out=None):
+        """
+        Copies everything that changes while the game is played into a flat buffer: the entity coordinates (laid out
+        like STATE, so the plants and their maturity flags are in it), the position of the random stream, the occupancy
+        grid and what the game keeps besides them (eg. the streak of Escalation). A game restored from it with set_state
+        continues exactly like this one would, so it can be cloned for tree search without copying any objects.
+        :param out: Optional (SNAPSHOT_SIZE,) int64 array the state is written into
+        :return: (SNAPSHOT_SIZE,) int64 array
+        """
+        if out is None:
+            out = empty(self.SNAPSHOT_SIZE, dtype=int64)
+        self._random.get_state(out=out[:RNG_STATE_SIZE].view(uint64))
+        out[RNG_STATE_SIZE : self._extra_state_start] = self._state
+        self._get_extra_state(out[self._extra_state_start :])
+        return out
+
+    def set_state(self, state):
+        """
+        Restores a state returned by get_state of a game with the same config. Only arrays are copied, the renderer is
+        left alone and draws the restored state on its next update.
+        :param state: (SNAPSHOT_SIZE,) int64 array
+        """
+        if state.shape != (self.SNAPSHOT_SIZE,) or state.dtype != int64:
+            raise AttributeError(
+                "State must be an int64 array of shape " + str((self.SNAPSHOT_SIZE,))
+            )
+        self._random.set_state(state[:RNG_STATE_SIZE].view(uint64))
+        self._state[:] = state[RNG_STATE_SIZE : self._extra_state_start]
+        self._set_extra_state(state[self._extra_state_start :])
+
+    def _extra_state_size(self):
+        """
+        :return: how many values _get_extra_state writes
+        """
+        return self._occupancy.STATE_SIZE
+
+    def _get_extra_state(self, out):
+        """
+        Writes the state the game keeps outside of the state array.
+        :param out: (_extra_state_size(),) int64 array
         """
-        ax, ay = a_obs[0], a_obs[1]
-        bx, by = a_obs[2], a_obs[3]
+        self._occupancy.get_state(out=out)
 
-        b_obs = a_obs.copy()
-        b_obs[0], b_obs[1] = bx, by
-        b_obs[2], b_obs[3] = ax, ay
-        return b_obs
+    def _set_extra_state(self, state):
+        """
+        Restores what _get_extra_state wrote. The state array has already been restored when this is called.
+        :param state: (_extra_state_size(),) int64 array
+        """
+        self._occupancy.set_state(state)
 
     """
-    Movement Methods
+    Profiling
     """
 
-    def _move_dispatcher(self):
+    def _profiled_methods(self):
         """
-        Helper function for streamlining entity movement.
+        :return: dictionary mapping the names of the methods which get timed to the phase they belong to
         """
         return {
-            LEFT: self._move_left,
-            DOWN: self._move_down,
-            RIGHT: self._move_right,
-            UP: self._move_up,
-            STAND: self._stand,
+            "_move_agents": "move",
+            "_calc_reward": "reward",
+            "get_observation": "observation",
         }
 
+    def enable_profiling(self, report_in_info=False):
+        """
+        Starts recording the cumulative time and call count of each phase of update: move, reward, respawn, plants
+        (Harvest), observation and render (the renderer update, which is part of the observation for image obs), plus
+        the update as a whole. The methods are only wrapped while profiling is on, so it costs nothing when disabled.
+        :param report_in_info: Also put the profile into the info dict returned by every update, under 'profile'
+        :return: the profiler
+        """
+        if self._profiler is not None:
+            self.disable_profiling()
+
+        profiler = PhaseProfiler()
+        for name, phase in self._profiled_methods().items():
+            setattr(self, name, profiler.wrap(phase, getattr(self, name)))
+        if self._renderer is not None:
+            self._renderer.update = profiler.wrap("render", self._renderer.update)
+
+        update = profiler.wrap("update", self.update)
+        if report_in_info:
+
+            def update_with_profile(*args, **kwargs):
+                step = update(*args, **kwargs)
+                step[3]["profile"] = profiler.summary()
+                return step
+
+            self.update = update_with_profile
+        else:
+            self.update = update
+
+        self._profiler = profiler
+        return profiler
+
+    def disable_profiling(self):
+        """
+        Stops profiling and removes the timing wrappers.
+        """
+        if self._profiler is None:
+            return
+        for name in list(self._profiled_methods()) + ["update"]:
+            self.__dict__.pop(name, None)
+        if self._renderer is not None:
+            self._renderer.__dict__.pop("update", None)
+        self._profiler = None
+
+    def get_profile(self):
+        """
+        :return: dictionary mapping each phase to its call count, cumulative and mean time, None if not profiling
+        """
+        return None if self._profiler is None else self._profiler.summary()
+
+    """
+    Collision Logic
+    """
+
+    def _entity_at(self, pos):
+        """
+        :param pos: (X, Y) coordinate
+        :return: slot of the entity registered on the occupancy grid at pos, -1 if there is none
+        """
+        return self._occupancy.slot_at(pos)
+
+    """
+    Movement Methods
+    """
+
     def _move_entity(self, entity_pos, action):
         """
         Move the specified entity
@@ -91,7 +424,7 @@ class AbstractGridGame(ABC):
         :param action: which direction to move
         :return: new position tuple
         """
-        return self._move_dispatcher()[action](entity_pos)
+        return self._transitions[entity_pos[0]][entity_pos[1]][action]
 
     def _move_agents(self, agent_moves):
         self.A_AGENT = self._move_entity(self.A_AGENT, agent_moves[0])
@@ -119,76 +452,7 @@ class AbstractGridGame(ABC):
         elif pos[1] == self.GRID_H - 1:
             options.remove(DOWN)
 
-        return choice(options)
-
-    def _seek_entity(self, seeker, target):
-        """
-        Returns a move which will move the seeker towards the target.
-        :param seeker: entity doing the following
-        :param target: entity getting followed
-        :return: up, left, down or up move
-        """
-        seeker = seeker.astype(int)
-        target = target.astype(int)
-        options = []
-
-        if seeker[0] < target[0]:
-            options.append(RIGHT)
-        if seeker[0] > target[0]:
-            options.append(LEFT)
-        if seeker[1] > target[1]:
-            options.append(UP)
-        if seeker[1] < target[1]:
-            options.append(DOWN)
-
-        if not options:
-            options = [STAND]
-        shipback = choice(options)
-
-        return shipback
-
-    def _move_left(self, pos):
-        """
-        :param pos: starting position
-        :return: new position
-        """
-        new_x = pos[0] - 1
-        if new_x == -1:
-            new_x = 0
-        return new_x, pos[1]
-
-    def _move_right(self, pos):
-        """
-        :param pos: starting position
-        :return: new position
-        """
-        new_x = pos[0] + 1
-        if new_x == self.GRID_W:
-            new_x = self.GRID_W - 1
-        return new_x, pos[1]
-
-    def _move_up(self, pos):
-        """
-        :param pos: starting position
-        :return: new position
-        """
-        new_y = pos[1] - 1
-        if new_y == -1:
-            new_y = 0
-        return pos[0], new_y
-
-    def _move_down(self, pos):
-        """
-        :param pos: starting position
-        :return: new position
-        """
-        new_y = pos[1] + 1
-        if new_y == self.GRID_H:
-            new_y = self.GRID_H - 1
-        return pos[0], new_y
-
-    def _stand(self, pos):
-        return pos
+        return self._random.choice(options)
 
     """
     Properties
@@ -206,6 +470,34 @@ class AbstractGridGame(ABC):
     def GRID_H(self):
         return int(self._grid_size[1])
 
+    @property
+    def IMAGE_OBS_SHAPE(self):
+        return self.GRID_H * TILE_SIZE, self.GRID_W * TILE_SIZE, 3
+
+    @property
+    def GRID_OBS_SHAPE(self):
+        return self._grid_obs_shape
+
+    @property
+    def OBS_SHAPE(self):
+        if self._obs_type == "image":
+            return self.IMAGE_OBS_SHAPE
+        if self._obs_type == "grid":
+            return self.GRID_OBS_SHAPE
+        return self._state.shape
+
+    @property
+    def STATE(self):
+        return self._state_view
+
+    @property
+    def SNAPSHOT_SIZE(self):
+        return self._extra_state_start + self._extra_state_size()
+
+    @property
+    def OBS_BUFFER(self):
+        return self._obs_buffer
+
     @property
     def AGENTS(self):
         return [self._a_pos, self._b_pos]
@@ -226,6 +518,18 @@ class AbstractGridGame(ABC):
     def B_AGENT(self, new_pos):
         self._b_pos[0], self._b_pos[1] = new_pos[0], new_pos[1]
 
+    @property
+    def RANDOM(self):
+        return self._random
+
+    @property
+    def OCCUPANCY(self):
+        return self._occupancy
+
+    @property
+    def PROFILER(self):
+        return self._profiler
+
     @property
     def RENDERER(self):
         return self._renderer
@@ -0,0 +1,241 @@
+from abc import ABC
+
+from numpy import arange, intp, stack, uint8, zeros
+from numpy.random import default_rng
+
+from gym_stag_hunt.src.games.abstract_grid_game import coord_transition_table
+from gym_stag_hunt.src.pursuit import choose_moves, random_moves, seek_moves
+
+# How many rounds of rejection sampling we try before falling back to an exact draw over the free cells
+REJECTION_ROUNDS = 4
+
+
+class AbstractVectorGridGame(ABC):
+    def __init__(
+        self, num_games, grid_size, enable_multiagent, entity_count, seed=None
+    ):
+        """
+        :param num_games: How many independent games are stepped together.
+        :param grid_size: A (W, H) tuple corresponding to the grid dimensions. Although W=H is expected, W!=H works also
+        :param enable_multiagent: Boolean signifying if the env will be used to train multiple agents or one.
+        :param entity_count: How many (X, Y) positions each game holds. The first two always belong to the agents.
+        :param seed: Optional seed for the random number generator shared by all the games.
+        """
+        if num_games < 1:
+            raise AttributeError("Please specify at least one game.")
+
+        # Config
+        self._num_games = num_games
+        self._grid_size = grid_size  # record grid dimensions as attribute
+        self._enable_multiagent = enable_multiagent
+        # [x, y, action] -> where the move ends, shared with the scalar games of the same grid size
+        self._transitions = coord_transition_table(self.GRID_W, self.GRID_H)
+        self._rng = default_rng(seed)
+        self._games = arange(num_games)
+
+        # Entity Positions - every entity of every game lives in one (N, k, 2) array
+        self._entities = zeros((num_games, entity_count, 2), dtype=uint8)
+
+    def seed(self, seed=None):
+        """
+        Restarts the random number generator shared by all the games.
+        :param seed: integer seed, or None to seed from the OS
+        """
+        self._rng = default_rng(seed)
+
+    """
+    Observations
+    """
+
+    def get_observation(self):
+        """
+        :return: (N, k * 2) array with the coordinate observation of each game
+        """
+        return self._entities.reshape(self._num_games, -1).copy()
+
+    def _flip_coord_observation_perspective(self, a_obs):
+        """
+        Batched version of AbstractGridGame._flip_coord_observation_perspective.
+        :param a_obs: (N, D) observations from the perspective of agent A
+        :return: (N, D) observations from the perspective of agent B
+        """
+        b_obs = a_obs.copy()
+        b_obs[:, 0:2] = a_obs[:, 2:4]
+        b_obs[:, 2:4] = a_obs[:, 0:2]
+        return b_obs
+
+    def get_agent_observations(self):
+        """
+        :return: (N, D) observations if only agent A is trained, otherwise (N, 2, D) observations where the second
+                 index holds the perspective of each agent
+        """
+        obs = self.get_observation()
+        if self._enable_multiagent:
+            return stack([obs, self._flip_coord_observation_perspective(obs)], axis=1)
+        return obs
+
+    def _package_step(self, rewards, info):
+        """
+        Shapes the step output the same way the scalar games do, with a leading game axis.
+        :param rewards: (N, 2) rewards
+        :param info: info dictionary shared by all the games
+        :return: observation, rewards, are the games done, additional info
+        """
+        dones = zeros(self._num_games, dtype=bool)
+        if self._enable_multiagent:
+            return self.get_agent_observations(), rewards, dones, info
+        else:
+            return self.get_agent_observations(), rewards[:, 0], dones, info
+
+    """
+    Movement Methods
+    """
+
+    def _move_entities(self, positions, actions):
+        """
+        Moves a batch of entities, clamping them to the grid.
+        :param positions: (..., 2) starting positions
+        :param actions: (...) moves to make
+        :return: (..., 2) new positions
+        """
+        return self._transitions[positions[..., 0], positions[..., 1], actions]
+
+    def _move_agents(self, agent_moves):
+        """
+        :param agent_moves: (N, 2) array with the moves of agent A and agent B in every game
+        """
+        self.AGENTS[:] = self._move_entities(self.AGENTS, agent_moves)
+
+    def _reset_agents(self, games):
+        """
+        Place agents in the top left and top right corners.
+        :param games: indices of the games to reset
+        """
+        self._entities[games, 0] = 0, 0
+        self._entities[games, 1] = self.GRID_W - 1, 0
+
+    def _choose_moves(self, options, mask):
+        """
+        Picks, for every row, one of the options allowed by the mask uniformly at random.
+        :param options: (4,) candidate moves
+        :param mask: (N, 4) boolean array marking which candidates are allowed
+        :return: (N,) chosen moves, STAND for rows without any allowed option
+        """
+        return choose_moves(options, mask, self._rng.random(len(mask)))
+
+    def _random_moves(self, positions):
+        """
+        :param positions: (N, 2) positions of the entities to move
+        :return: (N,) random directions that don't walk into a wall
+        """
+        return random_moves(
+            positions, self.GRID_W, self.GRID_H, self._rng.random(len(positions))
+        )
+
+    def _seek_moves(self, seekers, targets):
+        """
+        Returns moves which will move each seeker towards its target.
+        :param seekers: (N, 2) entities doing the following
+        :param targets: (N, 2) entities getting followed
+        :return: (N,) moves
+        """
+        return seek_moves(seekers, targets, self._rng.random(len(seekers)))
+
+    """
+    Spawning Methods
+    """
+
+    def _occupancy(self, games, entities=slice(None)):
+        """
+        :param games: indices of the games to build the map for
+        :param entities: which of the entity slots to take into account, all of them by default
+        :return: (len(games), W * H) boolean array marking every cell holding an entity
+        """
+        positions = self._entities[games, entities].astype(intp)
+        cells = positions[:, :, 0] + positions[:, :, 1] * self.GRID_W
+        occupied = zeros((len(games), self.GRID_W * self.GRID_H), dtype=bool)
+        occupied[arange(len(games))[:, None], cells] = True
+        return occupied
+
+    def _place_in_unoccupied_cells(self, occupied, rows):
+        """
+        Picks a random unoccupied cell for every requested row of the occupancy map and marks it as used.
+        :param occupied: (R, W * H) boolean occupancy map, updated in place
+        :param rows: indices into occupied, each of which needs one new cell. Must not repeat.
+        :return: (len(rows), 2) array of the chosen x, y coordinates
+        """
+        n_cells = occupied.shape[1]
+        cells = zeros(len(rows), dtype=intp)
+        pending = arange(len(rows))
+
+        for _ in range(REJECTION_ROUNDS):
+            draws = self._rng.integers(0, n_cells, size=len(pending))
+            free = ~occupied[rows[pending], draws]
+            cells[pending[free]] = draws[free]
+            pending = pending[~free]
+            if len(pending) == 0:
+                break
+
+        # crowded grids - draw exactly among the remaining free cells
+        if len(pending) > 0:
+            crowded = occupied[rows[pending]]
+            if crowded.all(axis=1).any():
+                raise ValueError("There are no unoccupied cells left on the grid.")
+            keys = self._rng.random((len(pending), n_cells))
+            keys[crowded] = -1.0
+            cells[pending] = keys.argmax(axis=1)
+
+        occupied[rows, cells] = True
+        return stack([cells % self.GRID_W, cells // self.GRID_W], axis=1)
+
+    def _respawn_entity(self, occupied, games, rows, entity):
+        """
+        Moves one entity of some games to random unoccupied cells, freeing the cells it leaves.
+        :param occupied: (len(games), W * H) boolean occupancy map of the games, updated in place
+        :param games: indices of the games the occupancy map was built for
+        :param rows: indices into games of the games whose entity moves
+        :param entity: index of the entity to move
+        """
+        old = self._entities[games[rows], entity].astype(intp)
+        self._entities[games[rows], entity] = self._place_in_unoccupied_cells(
+            occupied, rows
+        )
+        # another entity, eg. the agent which foraged a plant, may still stand on the old cell
+        free = ~(self._entities[games[rows]] == old[:, None]).all(axis=2).any(axis=1)
+        occupied[rows[free], old[free, 0] + old[free, 1] * self.GRID_W] = False
+
+    """
+    Properties
+    """
+
+    @property
+    def NUM_GAMES(self):
+        return self._num_games
+
+    @property
+    def GRID_DIMENSIONS(self):
+        return self.GRID_W, self.GRID_H
+
+    @property
+    def GRID_W(self):
+        return int(self._grid_size[0])
+
+    @property
+    def GRID_H(self):
+        return int(self._grid_size[1])
+
+    @property
+    def ENTITIES(self):
+        return self._entities
+
+    @property
+    def AGENTS(self):
+        return self._entities[:, 0:2]
+
+    @property
+    def A_AGENT(self):
+        return self._entities[:, 0]
+
+    @property
+    def B_AGENT(self):
+        return self._entities[:, 1]
@@ -1,7 +1,5 @@
-from numpy import zeros, uint8, array
-from numpy.random import randint
-
 from gym_stag_hunt.src.games.abstract_grid_game import AbstractGridGame
+from gym_stag_hunt.src.pursuit import seek_move
 from gym_stag_hunt.src.utils import overlaps_entity
 
 """
@@ -24,9 +22,11 @@ class Escalation(AbstractGridGame):
         obs_type,
         load_renderer,
         enable_multiagent,
+        render_backend="pygame",
     ):
         """
         :param streak_break_punishment_factor: Negative reinforcement for breaking the streak
+        :param render_backend: 'pygame' or 'numpy'. Which renderer produces image observations and renders the game
         """
 
         super(Escalation, self).__init__(
@@ -34,23 +34,30 @@ class Escalation(AbstractGridGame):
             screen_size=screen_size,
             obs_type=obs_type,
             enable_multiagent=enable_multiagent,
+            state_size=6,
         )
 
         self._streak_break_punishment_factor = streak_break_punishment_factor
         self._opponent_policy = opponent_policy
-        self._mark = zeros(2, dtype=uint8)
+        self._mark = self._state[4:6]  # view into the game state
+        self._set_grid_layout(channels=[A_AGENT, B_AGENT, MARK], channel_count=3)
         self._streak_active = False
         self._streak = 0
         self.reset_entities()
 
         # If rendering is enabled, we will instantiate the rendering pipeline
         if obs_type == "image" or load_renderer:
-            # we don't want to import pygame if we aren't going to use it, so that's why this import is here
-            from gym_stag_hunt.src.renderers.escalation_renderer import (
-                EscalationRenderer,
-            )
+            # we don't want to import pygame if we aren't going to use it, so that's why these imports are here
+            if render_backend == "numpy":
+                from gym_stag_hunt.src.renderers.escalation_array_renderer import (
+                    EscalationArrayRenderer as Renderer,
+                )
+            else:
+                from gym_stag_hunt.src.renderers.escalation_renderer import (
+                    EscalationRenderer as Renderer,
+                )
 
-            self._renderer = EscalationRenderer(
+            self._renderer = Renderer(
                 game=self, window_title=window_title, screen_size=screen_size
             )
 
@@ -101,7 +108,7 @@ class Escalation(AbstractGridGame):
                 self._move_agents(
                     agent_moves=[
                         agent_moves,
-                        self._seek_entity(self.B_AGENT, self.MARK),
+                        seek_move(self.B_AGENT, self.MARK, self._random.random()),
                     ]
                 )
 
@@ -111,31 +118,40 @@ class Escalation(AbstractGridGame):
         done = False
 
         if self._enable_multiagent:
-            if self._obs_type == "coords":
-                return (
-                    (obs, self._flip_coord_observation_perspective(obs)),
-                    iteration_rewards,
-                    done,
-                    info,
-                )
-            else:
-                return (obs, obs), iteration_rewards, done, info
+            return (
+                (obs, self._flip_observation_perspective(obs)),
+                iteration_rewards,
+                done,
+                info,
+            )
         else:
             return obs, iteration_rewards[0], done, info
 
-    def _coord_observation(self):
-        """
-        :return: list of all the entity coordinates
-        """
-        return array([self.A_AGENT, self.B_AGENT, self.MARK]).flatten()
-
     def reset_entities(self):
         """
         Reset all entity positions.
         :return:
         """
         self._reset_agents()
-        self.MARK = [randint(0, self.GRID_W - 1), randint(0, self.GRID_H - 1)]
+        self.MARK = [
+            self._random.integers(self.GRID_W - 1),
+            self._random.integers(self.GRID_H - 1),
+        ]
+
+    """
+    State Snapshots
+    """
+
+    def _extra_state_size(self):
+        return super(Escalation, self)._extra_state_size() + 2
+
+    def _get_extra_state(self, out):
+        super(Escalation, self)._get_extra_state(out[:-2])
+        out[-2:] = self._streak, self._streak_active
+
+    def _set_extra_state(self, state):
+        super(Escalation, self)._set_extra_state(state[:-2])
+        self._streak, self._streak_active = int(state[-2]), bool(state[-1])
 
     """
     Properties
@@ -1,8 +1,7 @@
-from numpy import array
-from numpy.random import uniform
+from numpy import add, flatnonzero
 
 from gym_stag_hunt.src.games.abstract_grid_game import AbstractGridGame
-from gym_stag_hunt.src.utils import overlaps_entity, spawn_plants, respawn_plants
+from gym_stag_hunt.src.utils import spawn_plants, respawn_plants
 
 # Entity Keys
 A_AGENT = 0
@@ -26,6 +25,7 @@ class Harvest(AbstractGridGame):
         obs_type,
         load_renderer,
         enable_multiagent,
+        render_backend="pygame",
     ):
         """
         :param max_plants: What is the maximum number of plants that can be on the board.
@@ -33,6 +33,7 @@ class Harvest(AbstractGridGame):
         :param chance_to_die: What chance does a mature plant have to die each time step.
         :param young_reward: Reward for harvesting a young plant (awarded to the harvester)
         :param mature_reward: Reward for harvesting a mature plant (awarded to both agents)
+        :param render_backend: 'pygame' or 'numpy'. Which renderer produces image observations and renders the game
         """
 
         super(Harvest, self).__init__(
@@ -40,6 +41,7 @@ class Harvest(AbstractGridGame):
             screen_size=screen_size,
             obs_type=obs_type,
             enable_multiagent=enable_multiagent,
+            state_size=4 + 3 * max_plants,
         )
 
         # Game Config
@@ -52,17 +54,29 @@ class Harvest(AbstractGridGame):
         self._young_reward = young_reward
         self._mature_reward = mature_reward
 
-        # Entity Positions
-        self._plants = []
-        self._maturity_flags = [False] * max_plants
+        # Entity Positions (views into the game state, every plant is an (X, Y, is mature) triple)
+        self._plants = [self._state[4 + 3 * x : 6 + 3 * x] for x in range(max_plants)]
+        self._maturity_flags = self._state[6::3]
+        self._set_grid_layout(
+            channels=[A_AGENT, B_AGENT] + [Y_PLANT] * max_plants,
+            channel_count=4,
+            x_index=[0, 2] + [4 + 3 * x for x in range(max_plants)],
+        )
         self.reset_entities()  # place the entities on the grid
 
         # If rendering is enabled, we will instantiate the rendering pipeline
         if obs_type == "image" or load_renderer:
-            # we don't want to import pygame if we aren't going to use it, so that's why this import is here
-            from gym_stag_hunt.src.renderers.harvest_renderer import HarvestRenderer
+            # we don't want to import pygame if we aren't going to use it, so that's why these imports are here
+            if render_backend == "numpy":
+                from gym_stag_hunt.src.renderers.harvest_array_renderer import (
+                    HarvestArrayRenderer as Renderer,
+                )
+            else:
+                from gym_stag_hunt.src.renderers.harvest_renderer import (
+                    HarvestRenderer as Renderer,
+                )
 
-            self._renderer = HarvestRenderer(
+            self._renderer = Renderer(
                 game=self, window_title=window_title, screen_size=screen_size
             )
 
@@ -73,17 +87,16 @@ class Harvest(AbstractGridGame):
     def _overlaps_plants(self, a, plants):
         """
         :param a: (X, Y) tuple for entity 1
-        :param plants: Array of (X, Y) tuples corresponding to plant positions
+        :param plants: Array of (X, Y) tuples corresponding to plant positions. The lookup goes through the occupancy
+                       grid, which always mirrors the plant positions.
         :return: True if a overlaps any of the plants, False otherwise
         """
-        for x in range(0, len(plants)):
-            pos = plants[x]
-            if overlaps_entity(a, pos):
-                is_mature = self._maturity_flags[x]
-                if x not in self._tagged_plants:
-                    self._tagged_plants.append(x)
-                return True, is_mature
-        return False, False
+        plant = self._entity_at(a)
+        if plant < 0:
+            return False, False
+        if plant not in self._tagged_plants:
+            self._tagged_plants.append(plant)
+        return True, bool(self._maturity_flags[plant])
 
     """
     State Updating Methods
@@ -115,6 +128,32 @@ class Harvest(AbstractGridGame):
 
         return float(a_reward), float(b_reward)
 
+    def _update_plants(self):
+        """
+        Lets the plants mature, or die (in which case they respawn) when they are already mature.
+        """
+        # one roll per plant, in plant order
+        rolls = self._random.GENERATOR.random(self._max_plants)
+        mature = self._maturity_flags.astype(bool)
+        died = mature & (rolls <= self._chance_to_die)
+        matured = ~mature & (rolls <= self._chance_to_mature)
+
+        self._maturity_flags[died] = 0
+        self._maturity_flags[matured] = 1
+        self._tagged_plants.extend(flatnonzero(died).tolist())
+
+    def _respawn_plants(self):
+        """
+        Moves the tagged (harvested or dead) plants to new cells.
+        """
+        respawn_plants(
+            plants=self.PLANTS,
+            tagged_plants=self._tagged_plants,
+            occupancy=self._occupancy,
+            used_coordinates=self.AGENTS,
+        )
+        self._tagged_plants = []
+
     def update(self, agent_moves):
         """
         Takes in agent actions and calculates next game state.
@@ -129,62 +168,35 @@ class Harvest(AbstractGridGame):
                 agent_moves=[agent_moves, self._random_move(self.B_AGENT)]
             )
 
-        for idx, plant in enumerate(self._plants):
-            is_mature = self._maturity_flags[idx]
-            if is_mature:
-                if uniform(0, 1) <= self._chance_to_die:
-                    self._maturity_flags[idx] = False
-                    self._tagged_plants.append(idx)
-            else:
-                if uniform(0, 1) <= self._chance_to_mature:
-                    self._maturity_flags[idx] = True
+        self._update_plants()
 
         # Get Rewards
         iteration_rewards = self._calc_reward()
 
         if len(self._tagged_plants) > 0:
-            self._plants = respawn_plants(
-                plants=self.PLANTS,
-                tagged_plants=self._tagged_plants,
-                grid_dims=self.GRID_DIMENSIONS,
-                used_coordinates=self.AGENTS,
-            )
-            self._tagged_plants = []
+            self._respawn_plants()
 
         obs = self.get_observation()
         done = False
         info = {}
 
         if self._enable_multiagent:
-            if self._obs_type == "coords":
-                return (
-                    (obs, self._flip_coord_observation_perspective(obs)),
-                    iteration_rewards,
-                    done,
-                    info,
-                )
-            else:
-                return (obs, obs), iteration_rewards, done, info
+            return (
+                (obs, self._flip_observation_perspective(obs)),
+                iteration_rewards,
+                done,
+                info,
+            )
         else:
             return obs, iteration_rewards[0], done, info
 
-    def _coord_observation(self):
+    def _grid_entity_channels(self):
         """
-        :return: tuple of all the entity coordinates
+        :return: for every entity in the state, the channel it is currently marked in (plants move from the young to
+                 the mature channel as they mature)
         """
-        a, b = self.AGENTS
-        shipback = [a[0], a[1], b[0], b[1]]
-        maturity_flags = self.MATURITY_FLAGS
-        for idx, element in enumerate(self.PLANTS):
-            new_entry = [0, 0, 0]
-            new_entry[0], new_entry[1], new_entry[2] = (
-                element[0],
-                element[1],
-                int(maturity_flags[idx]),
-            )
-            shipback = shipback + new_entry
-
-        return array(shipback).flatten()
+        add(self._maturity_flags, Y_PLANT, out=self._grid_channels[2:])
+        return self._grid_channels
 
     def reset_entities(self):
         """
@@ -192,12 +204,23 @@ class Harvest(AbstractGridGame):
         :return:
         """
         self._reset_agents()
-        self._plants = spawn_plants(
-            grid_dims=self.GRID_DIMENSIONS,
+        self._occupancy.clear()
+        spawn_plants(
+            occupancy=self._occupancy,
             how_many=self._max_plants,
             used_coordinates=self.AGENTS,
+            plants=self._plants,
         )
-        self._maturity_flags = [False] * self._max_plants
+        self._maturity_flags[:] = 0
+
+    """
+    Profiling
+    """
+
+    def _profiled_methods(self):
+        methods = super(Harvest, self)._profiled_methods()
+        methods.update({"_update_plants": "plants", "_respawn_plants": "respawn"})
+        return methods
 
     """
     Properties
@@ -0,0 +1,309 @@
+from numpy import (
+    add,
+    arange,
+    array,
+    empty,
+    flatnonzero,
+    full,
+    intp,
+    unique,
+    zeros,
+)
+
+from gym_stag_hunt.src.games.abstract_grid_game import (
+    AbstractGridGame,
+    coord_transition_table,
+)
+from gym_stag_hunt.src.pursuit import nearest_grid_targets, random_moves, seek_moves
+
+# Entity Keys
+AGENT = 0
+STAG = 1
+PLANT = 2
+
+# How many rounds of rejection sampling we try before falling back to an exact draw over the free cells
+REJECTION_ROUNDS = 4
+
+
+class MultiHunt(AbstractGridGame):
+    def __init__(
+        self,
+        agent_count,
+        stag_count,
+        hunters_needed,
+        stag_follows,
+        run_away_after_maul,
+        forage_quantity,
+        stag_reward,
+        forage_reward,
+        mauling_punishment,
+        # Super Class Params
+        grid_size,
+        obs_type,
+    ):
+        """
+        Stag Hunt with any number of agents and stags. Every entity position lives in an array, and captures are
+        resolved by counting the agents on each cell, so a step costs time linear in the number of entities. All the
+        agents share one observation of the whole grid.
+        :param agent_count: How many agents hunt on the grid
+        :param stag_count: How many stags roam the grid
+        :param hunters_needed: How many agents have to stand on a stag's cell at once to catch it
+        :param stag_follows: Should the stags seek out the nearest agent (true) or take a random move (false)
+        :param run_away_after_maul: Does a stag stay on the same cell after mauling an agent (true) or respawn (false)
+        :param forage_quantity: How many plants will be placed on the board.
+        :param stag_reward: How much reinforcement each of the agents catching a stag gets
+        :param forage_reward: How much reinforcement an agent gets for harvesting a plant
+        :param mauling_punishment: How much reinforcement the agents get for trying to catch a stag with too few hunters
+        """
+        super(MultiHunt, self).__init__(
+            grid_size=grid_size,
+            screen_size=grid_size,  # there is no renderer, the screen is never drawn
+            obs_type=obs_type,
+            enable_multiagent=True,
+            state_size=2 * (agent_count + stag_count + forage_quantity),
+        )
+
+        # Config
+        self._agent_count = agent_count
+        self._stag_count = stag_count
+        self._hunters_needed = hunters_needed
+        self._stag_follows = stag_follows
+        self._run_away_after_maul = run_away_after_maul
+
+        # Reinforcement Variables
+        self._stag_reward = stag_reward  # record RL values as attributes
+        self._forage_quantity = forage_quantity
+        self._forage_reward = forage_reward
+        self._mauling_punishment = mauling_punishment
+
+        # Entity Positions - (k, 2) views into the game state, laid out as agents, stags, plants
+        stags_start = 2 * agent_count
+        plants_start = 2 * (agent_count + stag_count)
+        self._agents = self._state[:stags_start].reshape(agent_count, 2)
+        self._stags = self._state[stags_start:plants_start].reshape(stag_count, 2)
+        self._plants = self._state[plants_start:].reshape(forage_quantity, 2)
+        self._entities = self._state.reshape(-1, 2)
+        self._move_table = coord_transition_table(self.GRID_W, self.GRID_H)
+
+        # Per-cell maps. The counts are filled and cleared cell by cell every step, so they always hold zeros between
+        # steps and are never rebuilt from scratch.
+        cell_count = self.GRID_W * self.GRID_H
+        self._agent_counts = zeros(cell_count, dtype=intp)
+        self._stag_counts = zeros(cell_count, dtype=intp)
+        self._plant_slots = full(cell_count, -1, dtype=intp)  # plant on each cell
+        self._occupied = zeros(cell_count, dtype=bool)  # scratch map for spawning
+
+        # Every agent sees the whole grid, agent i finds its own coordinates at index 2 * i of the coords observation
+        self._set_grid_layout(
+            channels=[AGENT] * agent_count
+            + [STAG] * stag_count
+            + [PLANT] * forage_quantity,
+            channel_count=3,
+        )
+
+        self.reset_entities()  # place the entities on the grid
+
+    """
+    State Updating Methods
+    """
+
+    def _cells(self, positions):
+        """
+        :param positions: (k, 2) array of coordinates
+        :return: (k,) flat cell index (x + y * W) of every position
+        """
+        return positions[:, 0].astype(intp) + positions[:, 1].astype(intp) * self.GRID_W
+
+    def _calc_reward(self):
+        """
+        Counts the agents and stags on every occupied cell. A stag is caught by the agents on its cell if there are at
+        least hunters_needed of them and mauls them otherwise, agents not on a stag forage any plant they stand on.
+        :return: (N,) rewards, (S,) mask of the stags to respawn, indices of the plants that were harvested
+        """
+        agent_cells = self._cells(self._agents)
+        stag_cells = self._cells(self._stags)
+        agent_counts, stag_counts = self._agent_counts, self._stag_counts
+        add.at(agent_counts, agent_cells, 1)
+        add.at(stag_counts, stag_cells, 1)
+
+        on_stag = stag_counts[agent_cells] > 0
+        caught = on_stag & (agent_counts[agent_cells] >= self._hunters_needed)
+        mauled = on_stag & ~caught
+        plant_slots = self._plant_slots[agent_cells]
+        foraged = ~on_stag & (plant_slots >= 0)
+
+        rewards = zeros(self._agent_count)
+        rewards[caught] = self._stag_reward
+        rewards[mauled] = self._mauling_punishment
+        rewards[foraged] = self._forage_reward
+
+        hunters = agent_counts[stag_cells]
+        if self._run_away_after_maul:
+            respawn_stags = hunters > 0
+        else:
+            respawn_stags = hunters >= self._hunters_needed
+
+        agent_counts[agent_cells] = 0
+        stag_counts[stag_cells] = 0
+        return rewards, respawn_stags, unique(plant_slots[foraged])
+
+    def _respawn_entities(self, respawn_stags, harvested_plants):
+        """
+        Moves the stags that were caught (or ran away after a mauling) and the plants that were harvested to free cells.
+        :param respawn_stags: (S,) mask of the stags to respawn
+        :param harvested_plants: indices of the plants to respawn
+        """
+        stags = flatnonzero(respawn_stags)
+        if len(stags) + len(harvested_plants) == 0:
+            return
+        cells = self._sample_free_cells(
+            len(stags) + len(harvested_plants), taken=self._cells(self._entities)
+        )
+        stag_cells, plant_cells = cells[: len(stags)], cells[len(stags) :]
+
+        self._stags[stags, 0] = stag_cells % self.GRID_W
+        self._stags[stags, 1] = stag_cells // self.GRID_W
+        self._plant_slots[self._cells(self._plants[harvested_plants])] = -1
+        self._plants[harvested_plants, 0] = plant_cells % self.GRID_W
+        self._plants[harvested_plants, 1] = plant_cells // self.GRID_W
+        self._plant_slots[plant_cells] = harvested_plants
+
+    def update(self, agent_moves):
+        """
+        Takes in agent actions and calculates next game state.
+        :param agent_moves: (N,) actions, one per agent
+        :return: observation, rewards, is the game done
+        """
+        # Move Entities
+        self._move_stags()
+        self._move_agents(agent_moves=agent_moves)
+
+        # Get Rewards
+        rewards, respawn_stags, harvested_plants = self._calc_reward()
+
+        # Reset prey that was caught and plants that were harvested
+        self._respawn_entities(respawn_stags, harvested_plants)
+
+        return self.get_observation(), rewards, False, {}
+
+    """
+    Movement Methods
+    """
+
+    def _move_agents(self, agent_moves):
+        agents = self._agents
+        agents[:] = self._move_table[agents[:, 0], agents[:, 1], agent_moves]
+
+    def _move_stags(self):
+        """
+        Moves every stag towards its nearest agent (the later one on ties), or randomly if the stags don't follow.
+        """
+        stags = self._stags
+        draws = self._random.GENERATOR.random(self._stag_count)
+        if self._stag_follows:
+            agents = self._agents
+            nearest = nearest_grid_targets(stags, agents, self.GRID_W, self.GRID_H)
+            moves = seek_moves(stags, agents[nearest], draws)
+        else:
+            moves = random_moves(stags, self.GRID_W, self.GRID_H, draws)
+        stags[:] = self._move_table[stags[:, 0], stags[:, 1], moves]
+
+    """
+    Spawning Methods
+    """
+
+    def _sample_free_cells(self, count, taken):
+        """
+        Draws distinct random cells, none of which holds an entity. Entities cover little of the grid, so candidates
+        are drawn and rejected when taken, with an exact draw among the remaining free cells as the fallback.
+        :param count: how many cells are needed
+        :param taken: flat indices of the cells which must not be picked
+        :return: (count,) flat cell indices
+        """
+        occupied = self._occupied
+        occupied[taken] = True
+        generator = self._random.GENERATOR
+        chosen = []
+
+        for _ in range(REJECTION_ROUNDS):
+            missing = count - len(chosen)
+            if missing == 0:
+                break
+            for cell in generator.integers(0, len(occupied), size=missing).tolist():
+                if not occupied[cell]:
+                    occupied[cell] = True
+                    chosen.append(cell)
+
+        if len(chosen) < count:  # crowded grids - draw exactly among the free cells
+            free = flatnonzero(~occupied)
+            chosen += generator.choice(
+                free, count - len(chosen), replace=False
+            ).tolist()
+
+        cells = array(chosen, dtype=intp)
+        occupied[taken] = False
+        occupied[cells] = False
+        return cells
+
+    def reset_entities(self):
+        """
+        Places every agent, stag and plant on its own random cell.
+        """
+        cells = self._sample_free_cells(len(self._entities), taken=empty(0, dtype=intp))
+        self._entities[:, 0] = cells % self.GRID_W
+        self._entities[:, 1] = cells // self.GRID_W
+        self._plant_slots.fill(-1)
+        self._plant_slots[cells[self._agent_count + self._stag_count :]] = arange(
+            self._forage_quantity
+        )
+
+    """
+    State Snapshots
+    """
+
+    def _extra_state_size(self):
+        return 0  # the occupancy grid is not used, the plant slots follow from the plant coordinates
+
+    def _get_extra_state(self, out):
+        pass
+
+    def _set_extra_state(self, state):
+        self._plant_slots.fill(-1)
+        self._plant_slots[self._cells(self._plants)] = arange(self._forage_quantity)
+
+    """
+    Profiling
+    """
+
+    def _profiled_methods(self):
+        methods = super(MultiHunt, self)._profiled_methods()
+        methods.update({"_move_stags": "move", "_respawn_entities": "respawn"})
+        return methods
+
+    """
+    Properties
+    """
+
+    @property
+    def AGENT_COUNT(self):
+        return self._agent_count
+
+    @property
+    def STAG_COUNT(self):
+        return self._stag_count
+
+    @property
+    def AGENTS(self):
+        return self._agents
+
+    @property
+    def STAGS(self):
+        return self._stags
+
+    @property
+    def PLANTS(self):
+        return self._plants
+
+    @property
+    def ENTITY_POSITIONS(self):
+        return {"agents": self.AGENTS, "stags": self.STAGS, "plants": self.PLANTS}
@@ -1,13 +1,7 @@
-from numpy import zeros, uint8, array, hypot
-
 from gym_stag_hunt.src.games.abstract_grid_game import AbstractGridGame
+from gym_stag_hunt.src.pursuit import nearest_target, seek_move
 
-from gym_stag_hunt.src.utils import (
-    overlaps_entity,
-    place_entity_in_unoccupied_cell,
-    spawn_plants,
-    respawn_plants,
-)
+from gym_stag_hunt.src.utils import overlaps_entity, spawn_plants, respawn_plants
 
 # Entity Keys
 A_AGENT = 0
@@ -15,6 +9,10 @@ B_AGENT = 1
 STAG = 2
 PLANT = 3
 
+# How many tagged plants a snapshot can hold. Tags only pile up across steps while the stag keeps running away after
+# maulings, so this is far more than a game ever collects.
+MAX_TAGGED_PLANTS = 64
+
 
 class StagHunt(AbstractGridGame):
     def __init__(
@@ -33,6 +31,7 @@ class StagHunt(AbstractGridGame):
         obs_type,
         load_renderer,
         enable_multiagent,
+        render_backend="pygame",
     ):
         """
         :param stag_reward: How much reinforcement the agents get for catching the stag
@@ -41,6 +40,7 @@ class StagHunt(AbstractGridGame):
         :param forage_quantity: How many plants will be placed on the board.
         :param forage_reward: How much reinforcement the agents get for harvesting a plant
         :param mauling_punishment: How much reinforcement the agents get for trying to catch a stag alone (MUST be neg.)
+        :param render_backend: 'pygame' or 'numpy'. Which renderer produces image observations and renders the game
         """
 
         super(StagHunt, self).__init__(
@@ -48,6 +48,7 @@ class StagHunt(AbstractGridGame):
             screen_size=screen_size,
             obs_type=obs_type,
             enable_multiagent=enable_multiagent,
+            state_size=6 + 2 * forage_quantity,
         )
 
         # Config
@@ -64,17 +65,30 @@ class StagHunt(AbstractGridGame):
         # State Variables
         self._tagged_plants = []  # harvested plants that need to be re-spawned
 
-        # Entity Positions
-        self._stag_pos = zeros(2, dtype=uint8)
-        self._plants_pos = []
+        # Entity Positions (views into the game state)
+        self._stag_pos = self._state[4:6]
+        self._plants_pos = [
+            self._state[6 + 2 * x : 8 + 2 * x] for x in range(forage_quantity)
+        ]
+        self._set_grid_layout(
+            channels=[A_AGENT, B_AGENT, STAG] + [PLANT] * forage_quantity,
+            channel_count=4,
+        )
         self.reset_entities()  # place the entities on the grid
 
         # If rendering is enabled, we will instantiate the rendering pipeline
         if obs_type == "image" or load_renderer:
-            # we don't want to import pygame if we aren't going to use it, so that's why this import is here
-            from gym_stag_hunt.src.renderers.hunt_renderer import HuntRenderer
+            # we don't want to import pygame if we aren't going to use it, so that's why these imports are here
+            if render_backend == "numpy":
+                from gym_stag_hunt.src.renderers.hunt_array_renderer import (
+                    HuntArrayRenderer as Renderer,
+                )
+            else:
+                from gym_stag_hunt.src.renderers.hunt_renderer import (
+                    HuntRenderer as Renderer,
+                )
 
-            self._renderer = HuntRenderer(
+            self._renderer = Renderer(
                 game=self, window_title=window_title, screen_size=screen_size
             )
 
@@ -85,15 +99,15 @@ class StagHunt(AbstractGridGame):
     def _overlaps_plants(self, a, plants):
         """
         :param a: (X, Y) tuple for entity 1
-        :param plants: Array of (X, Y) tuples corresponding to plant positions
+        :param plants: Array of (X, Y) tuples corresponding to plant positions. The lookup goes through the occupancy
+                       grid, which always mirrors the plant positions.
         :return: True if a overlaps any of the plants, False otherwise
         """
-        for x in range(0, len(plants)):
-            pos = plants[x]
-            if a[0] == pos[0] and a[1] == pos[1]:
-                self._tagged_plants.append(x)
-                return True
-        return False
+        plant = self._entity_at(a)
+        if plant < 0:
+            return False
+        self._tagged_plants.append(plant)
+        return True
 
     """
     State Updating Methods
@@ -150,6 +164,26 @@ class StagHunt(AbstractGridGame):
 
         return float(rewards[0]), float(rewards[1])
 
+    def _respawn_entities(self, iteration_rewards):
+        """
+        Respawns the stag if it was caught (or ran away after a mauling), otherwise the plants that were foraged.
+        :param iteration_rewards: rewards of the current iteration, tell us what happened
+        """
+        if iteration_rewards == (self._stag_reward, self._stag_reward):
+            self.STAG = self._occupancy.sample(exclude=self.AGENTS + [self.STAG])
+        elif (
+            self._run_away_after_maul and self._mauling_punishment in iteration_rewards
+        ):
+            self.STAG = self._occupancy.sample(exclude=self.AGENTS + [self.STAG])
+        elif self._forage_reward in iteration_rewards:
+            respawn_plants(
+                plants=self.PLANTS,
+                tagged_plants=self._tagged_plants,
+                occupancy=self._occupancy,
+                used_coordinates=self.AGENTS + [self.STAG],
+            )
+            self._tagged_plants = []
+
     def update(self, agent_moves):
         """
         Takes in agent actions and calculates next game state.
@@ -170,7 +204,7 @@ class StagHunt(AbstractGridGame):
                 self._move_agents(
                     agent_moves=[
                         agent_moves,
-                        self._seek_entity(self.B_AGENT, self.STAG),
+                        seek_move(self.B_AGENT, self.STAG, self._random.random()),
                     ]
                 )
 
@@ -178,92 +212,38 @@ class StagHunt(AbstractGridGame):
         iteration_rewards = self._calc_reward()
 
         # Reset prey if it was caught
-        if iteration_rewards == (self._stag_reward, self._stag_reward):
-            self.STAG = place_entity_in_unoccupied_cell(
-                grid_dims=self.GRID_DIMENSIONS,
-                used_coordinates=self.PLANTS + self.AGENTS + [self.STAG],
-            )
-        elif (
-            self._run_away_after_maul and self._mauling_punishment in iteration_rewards
-        ):
-            self.STAG = place_entity_in_unoccupied_cell(
-                grid_dims=self.GRID_DIMENSIONS,
-                used_coordinates=self.PLANTS + self.AGENTS + [self.STAG],
-            )
-        elif self._forage_reward in iteration_rewards:
-            new_plants = respawn_plants(
-                plants=self.PLANTS,
-                tagged_plants=self._tagged_plants,
-                grid_dims=self.GRID_DIMENSIONS,
-                used_coordinates=self.AGENTS + [self.STAG],
-            )
-            self._tagged_plants = []
-            self.PLANTS = new_plants
+        self._respawn_entities(iteration_rewards)
 
         obs = self.get_observation()
         info = {}
 
         if self._enable_multiagent:
-            if self._obs_type == "coords":
-                return (
-                    (obs, self._flip_coord_observation_perspective(obs)),
-                    iteration_rewards,
-                    False,
-                    info,
-                )
-            else:
-                return (obs, obs), iteration_rewards, False, info
+            return (
+                (obs, self._flip_observation_perspective(obs)),
+                iteration_rewards,
+                False,
+                info,
+            )
         else:
             return obs, iteration_rewards[0], False, info
 
-    def _coord_observation(self):
-        """
-        :return: list of all the entity coordinates
-        """
-        shipback = [self.A_AGENT, self.B_AGENT, self.STAG]
-        shipback = shipback + self.PLANTS
-        return array(shipback).flatten()
-
     """
     Movement Methods
     """
 
-    def _seek_agent(self, agent_to_seek):
-        """
-        Moves the stag towards the specified agent
-        :param agent_to_seek: agent to pursue
-        :return: new position tuple for the stag
-        """
-        agent = self.A_AGENT
-        if agent_to_seek == "b":
-            agent = self.B_AGENT
-
-        move = self._seek_entity(self.STAG, agent)
-
-        return self._move_entity(self.STAG, move)
-
     def _move_stag(self):
         """
-        Moves the stag towards the nearest agent.
+        Moves the stag towards the nearest agent (B on ties), or randomly if the stag doesn't follow.
         :return:
         """
+        stag = self.STAG
         if self._stag_follows:
-            stag, agents = self.STAG, self.AGENTS
-            a_dist = hypot(
-                int(agents[0][0]) - int(stag[0]), int(agents[0][1]) - int(stag[1])
-            )
-            b_dist = hypot(
-                int(agents[1][0]) - int(stag[0]), int(agents[1][1]) - int(stag[1])
-            )
-
-            if a_dist < b_dist:
-                agent_to_seek = "a"
-            else:
-                agent_to_seek = "b"
-
-            self.STAG = self._seek_agent(agent_to_seek)
+            agents = self.AGENTS
+            agent = agents[nearest_target(stag, agents)]
+            move = seek_move(stag, agent, self._random.random())
         else:
-            self.STAG = self._move_entity(self.STAG, self._random_move(self.STAG))
+            move = self._random_move(stag)
+        self.STAG = self._move_entity(stag, move)
 
     def reset_entities(self):
         """
@@ -272,12 +252,50 @@ class StagHunt(AbstractGridGame):
         """
         self._reset_agents()
         self.STAG = [self.GRID_W // 2, self.GRID_H // 2]
-        self.PLANTS = spawn_plants(
-            grid_dims=self.GRID_DIMENSIONS,
+        self._occupancy.clear()
+        spawn_plants(
+            occupancy=self._occupancy,
             how_many=self._forage_quantity,
             used_coordinates=self.AGENTS + [self.STAG],
+            plants=self._plants_pos,
         )
 
+    """
+    State Snapshots
+    """
+
+    def _extra_state_size(self):
+        return super(StagHunt, self)._extra_state_size() + 1 + MAX_TAGGED_PLANTS
+
+    def _get_extra_state(self, out):
+        tags = out[-1 - MAX_TAGGED_PLANTS :]
+        super(StagHunt, self)._get_extra_state(out[: -1 - MAX_TAGGED_PLANTS])
+        tag_count = len(self._tagged_plants)
+        if tag_count > MAX_TAGGED_PLANTS:
+            raise ValueError(
+                "Can not snapshot more than "
+                + str(MAX_TAGGED_PLANTS)
+                + " tagged plants."
+            )
+        tags[0] = tag_count
+        tags[1 : 1 + tag_count] = self._tagged_plants
+        tags[1 + tag_count :] = -1
+
+    def _set_extra_state(self, state):
+        tags = state[-1 - MAX_TAGGED_PLANTS :]
+        super(StagHunt, self)._set_extra_state(state[: -1 - MAX_TAGGED_PLANTS])
+        # plants foraged while the stag ran away stay tagged until the next forage, so they are part of the state
+        self._tagged_plants = tags[1 : 1 + tags[0]].tolist()
+
+    """
+    Profiling
+    """
+
+    def _profiled_methods(self):
+        methods = super(StagHunt, self)._profiled_methods()
+        methods.update({"_move_stag": "move", "_respawn_entities": "respawn"})
+        return methods
+
     """
     Properties
     """
@@ -296,7 +314,8 @@ class StagHunt(AbstractGridGame):
 
     @PLANTS.setter
     def PLANTS(self, new_pos):
-        self._plants_pos = new_pos
+        for plant, pos in zip(self._plants_pos, new_pos):
+            plant[0], plant[1] = pos[0], pos[1]
 
     @property
     def ENTITY_POSITIONS(self):
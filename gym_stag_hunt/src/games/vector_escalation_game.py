@@ -0,0 +1,122 @@
+from numpy import asarray, flatnonzero, float32, int64, stack, where, zeros
+
+from gym_stag_hunt.src.games.abstract_vector_grid_game import AbstractVectorGridGame
+
+"""
+Entity Keys
+"""
+A_AGENT = 0
+B_AGENT = 1
+MARK = 2
+
+
+class VectorEscalation(AbstractVectorGridGame):
+    def __init__(
+        self,
+        streak_break_punishment_factor,
+        opponent_policy,
+        # Super Class Params
+        num_games,
+        grid_size,
+        enable_multiagent,
+        seed=None,
+    ):
+        """
+        Batched counterpart of Escalation, advancing num_games escalations with every update call.
+        :param streak_break_punishment_factor: Negative reinforcement for breaking the streak
+        """
+
+        super(VectorEscalation, self).__init__(
+            num_games=num_games,
+            grid_size=grid_size,
+            enable_multiagent=enable_multiagent,
+            entity_count=MARK + 1,
+            seed=seed,
+        )
+
+        self._streak_break_punishment_factor = streak_break_punishment_factor
+        self._opponent_policy = opponent_policy
+        self._streak_active = zeros(num_games, dtype=bool)
+        self._streak = zeros(num_games, dtype=int64)
+        self.reset_entities()
+
+    def _calc_reward(self):
+        """
+        Calculates the reinforcement rewards for the two agents of every game, then advances the streaks.
+        :return: (N, 2) rewards
+        """
+        on_mark = (self.AGENTS == self.MARK[:, None, :]).all(axis=2)  # (N, 2)
+        together = on_mark.all(axis=1)
+
+        punishment = 0 - (self._streak_break_punishment_factor * self._streak)
+        rewards = where(
+            together[:, None], 1.0, where(on_mark, punishment[:, None], 0.0)
+        ).astype(float32)
+
+        # The streak grows while the agents stay together on the mark, any other outcome breaks it
+        self._streak = where(together, self._streak + 1, 0)
+        self._streak_active[:] = together
+
+        games = flatnonzero(together)
+        if len(games) > 0:
+            marks = self._entities[games, MARK]
+            self._entities[games, MARK] = self._move_entities(
+                marks, self._random_moves(marks)
+            )
+
+        return rewards
+
+    def update(self, agent_moves):
+        """
+        Takes in agent actions and calculates next game state for every game.
+        :param agent_moves: If multi-agent, an (N, 2) array of actions. Otherwise an (N,) array of actions and the
+                            opponents act according to the established policy.
+        :return: observation, rewards, are the games done, additional info
+        """
+        agent_moves = asarray(agent_moves)
+        if not self._enable_multiagent:
+            if self._opponent_policy == "random":
+                b_moves = self._random_moves(self.B_AGENT)
+            else:
+                b_moves = self._seek_moves(self.B_AGENT, self.MARK)
+            agent_moves = stack([agent_moves, b_moves], axis=1)
+        self._move_agents(agent_moves=agent_moves)
+
+        iteration_rewards = self._calc_reward()
+
+        return self._package_step(iteration_rewards, {})
+
+    def reset_entities(self, games=None):
+        """
+        Reset all entity positions and streaks.
+        :param games: indices of the games to reset, all of them if None
+        """
+        if games is None:
+            games = self._games
+        games = asarray(games)
+
+        self._reset_agents(games)
+        self._entities[games, MARK, 0] = self._rng.integers(
+            0, self.GRID_W - 1, size=len(games)
+        )
+        self._entities[games, MARK, 1] = self._rng.integers(
+            0, self.GRID_H - 1, size=len(games)
+        )
+        self._streak[games] = 0
+        self._streak_active[games] = False
+
+    """
+    Properties
+    """
+
+    @property
+    def MARK(self):
+        return self._entities[:, MARK]
+
+    @property
+    def STREAK_ACTIVE(self):
+        return self._streak_active
+
+    @property
+    def STREAK(self):
+        return self._streak
@@ -0,0 +1,164 @@
+from numpy import arange, asarray, empty, flatnonzero, float32, stack, uint8, zeros
+
+from gym_stag_hunt.src.games.abstract_vector_grid_game import AbstractVectorGridGame
+
+# Entity Keys
+A_AGENT = 0
+B_AGENT = 1
+PLANT = 2
+
+
+class VectorHarvest(AbstractVectorGridGame):
+    def __init__(
+        self,
+        max_plants,
+        chance_to_mature,
+        chance_to_die,
+        young_reward,
+        mature_reward,
+        # Super Class Params
+        num_games,
+        grid_size,
+        enable_multiagent,
+        seed=None,
+    ):
+        """
+        Batched counterpart of Harvest, advancing num_games harvests with every update call.
+        :param max_plants: What is the maximum number of plants that can be on the board.
+        :param chance_to_mature: What chance does a young plant have to mature each time step.
+        :param chance_to_die: What chance does a mature plant have to die each time step.
+        :param young_reward: Reward for harvesting a young plant (awarded to the harvester)
+        :param mature_reward: Reward for harvesting a mature plant (awarded to both agents)
+        """
+
+        super(VectorHarvest, self).__init__(
+            num_games=num_games,
+            grid_size=grid_size,
+            enable_multiagent=enable_multiagent,
+            entity_count=PLANT + max_plants,
+            seed=seed,
+        )
+
+        # Game Config
+        self._max_plants = max_plants
+        self._chance_to_mature = chance_to_mature
+        self._chance_to_die = chance_to_die
+
+        # Reinforcement variables
+        self._young_reward = young_reward
+        self._mature_reward = mature_reward
+
+        # Plant State - one maturity flag per plant slot of every game
+        self._maturity_flags = zeros((num_games, max_plants), dtype=bool)
+        self.reset_entities()  # place the entities on the grid
+
+    """
+    State Updating Methods
+    """
+
+    def _update_plants(self):
+        """
+        Matures young plants and kills mature ones, drawing the randomness for every plant of every game at once.
+        :return: (N, P) mask of plants which died and have to be re-spawned
+        """
+        rolls = self._rng.random(self._maturity_flags.shape)
+        mature = self._maturity_flags
+        died = mature & (rolls <= self._chance_to_die)
+        matured = ~mature & (rolls <= self._chance_to_mature)
+        mature ^= died | matured
+        return died
+
+    def _calc_reward(self):
+        """
+        Calculates the reinforcement rewards for the two agents of every game.
+        :return: (N, 2) rewards, (N, P) mask of harvested plants
+        """
+        # (N, 2, P) mask of the plants each agent stands on
+        on_plant = (self.AGENTS[:, :, None] == self.PLANTS[:, None]).all(axis=3)
+
+        collided = on_plant.any(axis=2)
+        with_mature = (on_plant & self._maturity_flags[:, None, :]).any(axis=2)
+
+        shared = with_mature.sum(axis=1) * self._mature_reward  # awarded to both
+        rewards = shared[:, None] + (collided & ~with_mature) * self._young_reward
+
+        return rewards.astype(float32), on_plant.any(axis=1)
+
+    def _respawn_plants(self, tagged):
+        """
+        Moves tagged plants to random unoccupied cells, freeing the cells they leave like Harvest does.
+        :param tagged: (N, P) mask of plants which have to respawn
+        """
+        games = flatnonzero(tagged.any(axis=1))
+        if len(games) == 0:
+            return
+
+        occupied = self._occupancy(games)
+        tagged = tagged[games]
+        for plant in flatnonzero(tagged.any(axis=0)):
+            self._respawn_entity(
+                occupied, games, flatnonzero(tagged[:, plant]), PLANT + plant
+            )
+
+    def update(self, agent_moves):
+        """
+        Takes in agent actions and calculates next game state for every game.
+        :param agent_moves: If multi-agent, an (N, 2) array of actions. Otherwise an (N,) array of actions and the
+                            opponents do a random action.
+        :return: observation, rewards, are the games done, additional info
+        """
+        agent_moves = asarray(agent_moves)
+        if not self._enable_multiagent:
+            agent_moves = stack([agent_moves, self._random_moves(self.B_AGENT)], axis=1)
+        self._move_agents(agent_moves=agent_moves)
+
+        died = self._update_plants()
+
+        # Get Rewards
+        iteration_rewards, harvested = self._calc_reward()
+
+        self._respawn_plants(died | harvested)
+
+        return self._package_step(iteration_rewards, {})
+
+    def get_observation(self):
+        """
+        :return: (N, 4 + 3 * P) array holding the agent coordinates followed by (X, Y, is mature) for every plant
+        """
+        obs = empty((self._num_games, 4 + 3 * self._max_plants), dtype=uint8)
+        obs[:, :4] = self.AGENTS.reshape(self._num_games, 4)
+        plants = obs[:, 4:].reshape(self._num_games, self._max_plants, 3)
+        plants[:, :, :2] = self.PLANTS
+        plants[:, :, 2] = self._maturity_flags
+        return obs
+
+    def reset_entities(self, games=None):
+        """
+        Reset all entity positions.
+        :param games: indices of the games to reset, all of them if None
+        """
+        if games is None:
+            games = self._games
+        games = asarray(games)
+
+        self._reset_agents(games)
+
+        occupied = self._occupancy(games, entities=slice(0, PLANT))
+        rows = arange(len(games))
+        for plant in range(self._max_plants):
+            self._entities[games, PLANT + plant] = self._place_in_unoccupied_cells(
+                occupied, rows
+            )
+        self._maturity_flags[games] = False
+
+    """
+    Properties
+    """
+
+    @property
+    def PLANTS(self):
+        return self._entities[:, PLANT:]
+
+    @property
+    def MATURITY_FLAGS(self):
+        return self._maturity_flags
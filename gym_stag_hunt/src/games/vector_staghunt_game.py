@@ -0,0 +1,196 @@
+from numpy import arange, asarray, flatnonzero, float32, intp, stack, where, zeros
+
+from gym_stag_hunt.src.games.abstract_vector_grid_game import AbstractVectorGridGame
+from gym_stag_hunt.src.pursuit import nearest_targets
+
+# Entity Keys
+A_AGENT = 0
+B_AGENT = 1
+STAG = 2
+PLANT = 3
+
+
+class VectorStagHunt(AbstractVectorGridGame):
+    def __init__(
+        self,
+        stag_reward,
+        stag_follows,
+        run_away_after_maul,
+        opponent_policy,
+        forage_quantity,
+        forage_reward,
+        mauling_punishment,
+        # Super Class Params
+        num_games,
+        grid_size,
+        enable_multiagent,
+        seed=None,
+    ):
+        """
+        Batched counterpart of StagHunt, advancing num_games hunts with every update call.
+        :param stag_reward: How much reinforcement the agents get for catching the stag
+        :param stag_follows: Should the stag seek out the nearest agent (true) or take a random move (false)
+        :param run_away_after_maul: Does the stag stay on the same cell after mauling an agent (true) or respawn (false)
+        :param forage_quantity: How many plants will be placed on the board.
+        :param forage_reward: How much reinforcement the agents get for harvesting a plant
+        :param mauling_punishment: How much reinforcement the agents get for trying to catch a stag alone (MUST be neg.)
+        """
+
+        super(VectorStagHunt, self).__init__(
+            num_games=num_games,
+            grid_size=grid_size,
+            enable_multiagent=enable_multiagent,
+            entity_count=PLANT + forage_quantity,
+            seed=seed,
+        )
+
+        # Config
+        self._stag_follows = stag_follows
+        self._run_away_after_maul = run_away_after_maul
+        self._opponent_policy = opponent_policy
+
+        # Reinforcement Variables
+        self._stag_reward = stag_reward  # record RL values as attributes
+        self._forage_quantity = forage_quantity
+        self._forage_reward = forage_reward
+        self._mauling_punishment = mauling_punishment
+
+        # State Variables - (N, P) how often each plant was foraged since it last respawned. Like the tagged plants of
+        # StagHunt, they wait for a step on which somebody forages and the stag stays put.
+        self._tagged_plants = zeros((num_games, forage_quantity), dtype=intp)
+
+        self.reset_entities()  # place the entities on the grid
+
+    """
+    State Updating Methods
+    """
+
+    def _calc_reward(self):
+        """
+        Calculates the reinforcement rewards for the two agents of every game.
+        :return: (N, 2) rewards, (N,) mask of games whose stag has to respawn, (N, P) count of the agents which
+                 harvested each plant
+        """
+        on_stag = (self.AGENTS == self.STAG[:, None, :]).all(axis=2)  # (N, 2)
+        # (N, 2, P) mask of the plants each agent stands on
+        on_plant = (self.AGENTS[:, :, None] == self.PLANTS[:, None]).all(axis=3)
+
+        caught = on_stag.all(axis=1)  # Successful stag hunt
+        mauled = on_stag & ~caught[:, None]  # Tried to catch the stag alone
+        foraged = on_plant & ~on_stag[:, :, None]  # Agents on the stag don't forage
+
+        rewards = where(
+            caught[:, None],
+            self._stag_reward,
+            where(
+                mauled,
+                self._mauling_punishment,
+                where(foraged.any(axis=2), self._forage_reward, 0),
+            ),
+        ).astype(float32)
+
+        respawn_stag = caught
+        if self._run_away_after_maul:
+            respawn_stag = respawn_stag | mauled.any(axis=1)
+
+        return rewards, respawn_stag, foraged.sum(axis=1)
+
+    def _respawn_entities(self, respawn_stag, foraged):
+        """
+        Moves caught stags to random unoccupied cells. Like StagHunt, the tagged plants are only moved in games where
+        somebody foraged and the stag stays put, once for every time they were tagged.
+        :param respawn_stag: (N,) mask of games whose stag has to respawn
+        :param foraged: (N,) mask of games in which an agent foraged
+        """
+        respawn_plants = foraged & ~respawn_stag
+        games = flatnonzero(respawn_stag | respawn_plants)
+        if len(games) == 0:
+            return
+
+        occupied = self._occupancy(games)
+
+        rows = flatnonzero(respawn_stag[games])
+        if len(rows) > 0:
+            self._respawn_entity(occupied, games, rows, STAG)
+
+        tagged = self._tagged_plants[games] * respawn_plants[games, None]
+        self._tagged_plants[games[respawn_plants[games]]] = 0
+        for plant in flatnonzero(tagged.any(axis=0)):
+            for times in range(1, tagged[:, plant].max() + 1):
+                rows = flatnonzero(tagged[:, plant] >= times)
+                self._respawn_entity(occupied, games, rows, PLANT + plant)
+
+    def update(self, agent_moves):
+        """
+        Takes in agent actions and calculates next game state for every game.
+        :param agent_moves: If multi-agent, an (N, 2) array of actions. Otherwise an (N,) array of actions and the
+                            opponents act according to the established policy.
+        :return: observation, rewards, are the games done, additional info
+        """
+        agent_moves = asarray(agent_moves)
+
+        # Move Entities
+        self._move_stag()
+        if not self._enable_multiagent:
+            if self._opponent_policy == "random":
+                b_moves = self._random_moves(self.B_AGENT)
+            else:
+                b_moves = self._seek_moves(self.B_AGENT, self.STAG)
+            agent_moves = stack([agent_moves, b_moves], axis=1)
+        self._move_agents(agent_moves=agent_moves)
+
+        # Get Rewards
+        iteration_rewards, respawn_stag, foraged = self._calc_reward()
+        self._tagged_plants += foraged
+
+        # Reset caught prey and harvested plants
+        self._respawn_entities(respawn_stag, foraged.any(axis=1))
+
+        return self._package_step(iteration_rewards, {})
+
+    """
+    Movement Methods
+    """
+
+    def _move_stag(self):
+        """
+        Moves every stag towards its nearest agent, or randomly if the stag doesn't follow.
+        """
+        stag = self.STAG
+        if self._stag_follows:
+            agent_to_seek = nearest_targets(stag, self.AGENTS)  # A_AGENT or B_AGENT
+            moves = self._seek_moves(stag, self._entities[self._games, agent_to_seek])
+        else:
+            moves = self._random_moves(stag)
+        stag[:] = self._move_entities(stag, moves)
+
+    def reset_entities(self, games=None):
+        """
+        Reset all entity positions.
+        :param games: indices of the games to reset, all of them if None
+        """
+        if games is None:
+            games = self._games
+        games = asarray(games)
+
+        self._reset_agents(games)
+        self._entities[games, STAG] = self.GRID_W // 2, self.GRID_H // 2
+
+        occupied = self._occupancy(games, entities=slice(0, PLANT))
+        rows = arange(len(games))
+        for plant in range(self._forage_quantity):
+            self._entities[games, PLANT + plant] = self._place_in_unoccupied_cells(
+                occupied, rows
+            )
+
+    """
+    Properties
+    """
+
+    @property
+    def STAG(self):
+        return self._entities[:, STAG]
+
+    @property
+    def PLANTS(self):
+        return self._entities[:, PLANT:]
@@ -0,0 +1,55 @@
+from functools import wraps
+from time import perf_counter
+
+
+class PhaseProfiler:
+    def __init__(self):
+        """
+        Accumulates the time spent in, and the number of calls to, each phase of a game update.
+        """
+        self._totals = {}
+        self._calls = {}
+
+    def wrap(self, phase, func):
+        """
+        :param phase: name of the phase the time of func is added to
+        :param func: function to time
+        :return: a function which calls func and records how long it took
+        """
+        self._totals.setdefault(phase, 0.0)
+        self._calls.setdefault(phase, 0)
+        totals, calls = self._totals, self._calls
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                totals[phase] += perf_counter() - start
+                calls[phase] += 1
+
+        return timed
+
+    def reset(self):
+        """
+        Zeroes the recorded times and call counts.
+        """
+        for phase in self._totals:
+            self._totals[phase] = 0.0
+            self._calls[phase] = 0
+
+    def summary(self):
+        """
+        :return: dictionary mapping each phase to its call count, cumulative and mean time (in seconds)
+        """
+        return {
+            phase: {
+                "calls": self._calls[phase],
+                "total_seconds": total,
+                "mean_seconds": (
+                    total / self._calls[phase] if self._calls[phase] else 0.0
+                ),
+            }
+            for phase, total in self._totals.items()
+        }
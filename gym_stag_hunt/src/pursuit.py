@@ -0,0 +1,222 @@
+from math import ceil, sqrt
+
+from numpy import (
+    absolute,
+    arange,
+    argsort,
+    array,
+    bincount,
+    broadcast_to,
+    cumsum,
+    full,
+    int32,
+    int64,
+    intp,
+    maximum,
+    minimum,
+    nonzero,
+    repeat,
+    stack,
+    tile,
+    where,
+    zeros,
+)
+
+from gym_stag_hunt.src.games.abstract_grid_game import LEFT, DOWN, RIGHT, UP, STAND
+
+"""
+Pursuit logic shared by the stag and the 'pursuit' opponent policy. The scalar functions drive the single games and
+the array functions the batched ones. Both follow the same rules and consume one random draw per seeker, so a batch
+behaves like the equivalent single games.
+"""
+
+# Candidate moves towards a target, in the order the random draw picks from them
+SEEK_MOVE_OPTIONS = array([RIGHT, LEFT, UP, DOWN])
+# Candidate moves of entities wandering at random, in the order of AbstractGridGame._random_move
+RANDOM_MOVE_OPTIONS = array([LEFT, RIGHT, UP, DOWN])
+# Up to how many seeker / target pairs nearest_grid_targets compares all of them instead of indexing the targets
+PAIRWISE_LIMIT = 4096
+
+
+def _seek_options(mask):
+    options = tuple(
+        move for bit, move in enumerate(SEEK_MOVE_OPTIONS.tolist()) if mask >> bit & 1
+    )
+    return options or (STAND,)
+
+
+# Candidate moves for every combination of "target is right / left / above / below", as bits of the index
+_SEEK_TABLE = tuple(_seek_options(mask) for mask in range(16))
+
+
+"""
+Scalar Kernels
+"""
+
+
+def nearest_target(seeker, targets):
+    """
+    :param seeker: (X, Y) of the entity doing the following
+    :param targets: sequence of (X, Y) coordinates
+    :return: index of the target closest to the seeker, the later one on ties
+    """
+    sx, sy = int(seeker[0]), int(seeker[1])
+    nearest, nearest_distance = 0, None
+    for idx, target in enumerate(targets):
+        dx, dy = int(target[0]) - sx, int(target[1]) - sy
+        distance = dx * dx + dy * dy
+        if nearest_distance is None or distance <= nearest_distance:
+            nearest, nearest_distance = idx, distance
+    return nearest
+
+
+def seek_move(seeker, target, draw):
+    """
+    Greedy step towards the target, picking uniformly between the moves which close the distance.
+    :param seeker: (X, Y) of the entity doing the following
+    :param target: (X, Y) of the entity getting followed
+    :param draw: random float in [0, 1) deciding between the candidate moves
+    :return: the move, STAND if the seeker already is on the target
+    """
+    sx, sy = int(seeker[0]), int(seeker[1])
+    tx, ty = int(target[0]), int(target[1])
+    options = _SEEK_TABLE[(sx < tx) | (sx > tx) << 1 | (sy > ty) << 2 | (sy < ty) << 3]
+    return options[int(draw * len(options))]
+
+
+"""
+Array Kernels
+"""
+
+
+def nearest_targets(seekers, targets):
+    """
+    :param seekers: (N, 2) entities doing the following
+    :param targets: (N, k, 2) candidate targets of every seeker
+    :return: (N,) index of the target closest to each seeker, the later one on ties
+    """
+    offsets = targets.astype(int32) - seekers[:, None, :].astype(int32)
+    distances = (offsets * offsets).sum(axis=2)
+    return distances.shape[1] - 1 - distances[:, ::-1].argmin(axis=1)
+
+
+def _bucket_ring(radius):
+    """
+    :return: (k, 2) offsets of the buckets at Chebyshev distance radius from a bucket
+    """
+    side = arange(-radius, radius + 1)
+    dx, dy = repeat(side, len(side)), tile(side, len(side))
+    on_ring = maximum(absolute(dx), absolute(dy)) == radius
+    return stack([dx[on_ring], dy[on_ring]], axis=1)
+
+
+def nearest_grid_targets(seekers, targets, grid_w, grid_h):
+    """
+    Nearest target of every seeker, all of them sharing the same targets. Once there are many of both, the targets are
+    sorted into a grid of buckets holding about one target each, and every seeker only looks at the rings of buckets
+    around its own until no farther bucket can hold anything closer. That keeps the cost close to linear in the number
+    of entities, instead of comparing every seeker with every target.
+    :param seekers: (N, 2) entities doing the following
+    :param targets: (k, 2) candidate targets, shared by every seeker
+    :param grid_w: width of the grid
+    :param grid_h: height of the grid
+    :return: (N,) index of the target closest to each seeker, the later one on ties (same as nearest_targets)
+    """
+    if len(seekers) * len(targets) <= PAIRWISE_LIMIT:
+        return nearest_targets(
+            seekers, broadcast_to(targets, (len(seekers),) + targets.shape)
+        )
+
+    seekers, targets = seekers.astype(int64), targets.astype(int64)
+    target_count = len(targets)
+    size = max(1, int(ceil(sqrt(grid_w * grid_h / target_count))))
+    buckets_w, buckets_h = -(-grid_w // size), -(-grid_h // size)
+
+    # Targets sorted by bucket, bucket b holds order[starts[b]:starts[b] + counts[b]]
+    target_buckets = targets[:, 0] // size + targets[:, 1] // size * buckets_w
+    order = argsort(target_buckets, kind="stable")
+    counts = bincount(target_buckets, minlength=buckets_w * buckets_h)
+    starts = cumsum(counts) - counts
+
+    # Best (distance, index) of every seeker packed into one key, smaller distances and then later targets go first
+    best = full(len(seekers), target_count * (grid_w * grid_w + grid_h * grid_h + 1))
+    seeker_bx, seeker_by = seekers[:, 0] // size, seekers[:, 1] // size
+    pending = arange(len(seekers))
+    radius = 0
+    while len(pending) > 0:
+        ring = _bucket_ring(radius)
+        bx = seeker_bx[pending, None] + ring[:, 0]
+        by = seeker_by[pending, None] + ring[:, 1]
+        rows, cols = nonzero(
+            (bx >= 0) & (bx < buckets_w) & (by >= 0) & (by < buckets_h)
+        )
+        buckets = bx[rows, cols] + by[rows, cols] * buckets_w
+        bucket_counts = counts[buckets]
+
+        # every (seeker, target) pair found in the ring
+        candidate_seekers = pending[repeat(rows, bucket_counts)]
+        within_bucket = arange(bucket_counts.sum()) - repeat(
+            cumsum(bucket_counts) - bucket_counts, bucket_counts
+        )
+        candidates = order[repeat(starts[buckets], bucket_counts) + within_bucket]
+        offsets = targets[candidates] - seekers[candidate_seekers]
+        distances = (offsets * offsets).sum(axis=1)
+        minimum.at(
+            best,
+            candidate_seekers,
+            distances * target_count + (target_count - 1 - candidates),
+        )
+
+        # targets beyond this ring are at least radius * size + 1 cells away along one axis
+        reach = radius * size + 1
+        pending = pending[best[pending] >= reach * reach * target_count]
+        radius += 1
+
+    return target_count - 1 - best % target_count
+
+
+def choose_moves(options, mask, draws):
+    """
+    Picks, for every row, one of the options allowed by the mask uniformly at random.
+    :param options: (4,) candidate moves
+    :param mask: (N, 4) boolean array marking which candidates are allowed
+    :param draws: (N,) random floats in [0, 1)
+    :return: (N,) chosen moves, STAND for rows without any allowed option
+    """
+    counts = mask.sum(axis=1)
+    picks = (draws * counts).astype(intp)
+    chosen = (mask.cumsum(axis=1) > picks[:, None]) & mask
+    return where(counts > 0, options[chosen.argmax(axis=1)], STAND)
+
+
+def seek_moves(seekers, targets, draws):
+    """
+    Greedy steps of every seeker towards its target, batched version of seek_move.
+    :param seekers: (N, 2) entities doing the following
+    :param targets: (N, 2) entities getting followed
+    :param draws: (N,) random floats in [0, 1)
+    :return: (N,) moves
+    """
+    delta = targets.astype(int32) - seekers.astype(int32)
+    mask = stack(
+        [delta[:, 0] > 0, delta[:, 0] < 0, delta[:, 1] < 0, delta[:, 1] > 0], axis=1
+    )
+    return choose_moves(SEEK_MOVE_OPTIONS, mask, draws)
+
+
+def random_moves(positions, grid_w, grid_h, draws):
+    """
+    Random steps for entities which don't pursue anything, batched version of AbstractGridGame._random_move.
+    :param positions: (N, 2) positions of the entities to move
+    :param grid_w: width of the grid
+    :param grid_h: height of the grid
+    :param draws: (N,) random floats in [0, 1)
+    :return: (N,) random directions that don't walk into a wall
+    """
+    x, y = positions[:, 0], positions[:, 1]
+    mask = zeros((len(positions), 4), dtype=bool)
+    mask[:, 0] = x != 0  # LEFT
+    mask[:, 1] = (x == 0) | (x != grid_w - 1)  # RIGHT
+    mask[:, 2] = y != 0  # UP
+    mask[:, 3] = (y == 0) | (y != grid_h - 1)  # DOWN
+    return choose_moves(RANDOM_MOVE_OPTIONS, mask, draws)
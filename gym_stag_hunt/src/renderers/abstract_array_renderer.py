@@ -0,0 +1,167 @@
+from numpy import empty, uint8, uint16
+
+from gym_stag_hunt.src.sprites import TILE_SIZE, load_sprite_array
+
+"""
+Constants
+"""
+BACKGROUND_COLOR = (255, 185, 137)
+GRID_LINE_COLOR = (200, 150, 100, 200)
+
+
+def make_background(grid_w, grid_h):
+    """
+    :return: (H * 32, W * 32, 3) uint8 array of the empty grid, the lines blended into the background color
+    """
+    background = empty((TILE_SIZE * grid_h, TILE_SIZE * grid_w, 3), dtype=uint8)
+    background[:] = BACKGROUND_COLOR
+
+    line_rgb, line_alpha = GRID_LINE_COLOR[:3], GRID_LINE_COLOR[3]
+    line = [
+        (bg * (255 - line_alpha) + c * line_alpha + 127) // 255
+        for bg, c in zip(BACKGROUND_COLOR, line_rgb)
+    ]
+    background[::TILE_SIZE, :] = line  # horizontal lines
+    background[:, ::TILE_SIZE] = line  # vertical lines
+    return background
+
+
+def load_blend_sprites(entity_types):
+    """
+    :param entity_types: names of the sprites to load
+    :return: dictionary mapping each name to its alpha-weighted colors and inverse alpha, both uint16. A tile is blended
+             as (tile * inverse_alpha + color + 127) // 255.
+    """
+    sprites = {}
+    for entity_type in entity_types:
+        rgba = load_sprite_array(entity_type, TILE_SIZE).astype(uint16)
+        alpha = rgba[:, :, 3:]
+        sprites[entity_type] = (rgba[:, :, :3] * alpha, 255 - alpha)
+    return sprites
+
+
+class AbstractArrayRenderer:
+    # Sprites drawn by the renderer, decoded once when the renderer is created
+    SPRITES = ("a_agent", "b_agent")
+
+    def __init__(self, game, window_title, screen_size):
+        """
+        Pure NumPy counterpart of AbstractRenderer. Frames are composited by writing sprite tiles into a preallocated
+        pixel buffer, so no pygame / SDL is needed unless the frame is shown on a display.
+        :param game: Class-based representation of the game state. Feeds all the information necessary to the renderer
+        :param window_title: What we set as the window caption
+        :param screen_size: The size of the virtual display on which we will be rendering stuff on
+        """
+        self._window_title = window_title
+        self._screen_size = screen_size  # record screen size as an attribute
+        self._screen = None  # pygame display, only created if we render on a display
+        self._game = game  # record game as an attribute
+
+        # Background with the grid drawn on top, restored at the start of every frame
+        self._background = make_background(self.GRID_W, self.GRID_H)
+
+        # Frame buffer the entities get composited into
+        self._frame = self._background.copy()
+
+        # Alpha-weighted colors and inverse alphas of the sprites, ready for blending
+        self._sprites = load_blend_sprites(self.SPRITES)
+
+    """
+    Controller Methods
+    """
+
+    def update(self, out=None):
+        """
+        :param out: Optional preallocated (H * 32, W * 32, 3) uint8 array the frame is written into
+        :return: A pixel array corresponding to the new game state. If out was given, out itself is returned.
+        """
+        return self._update_render(out=out)
+
+    def quit(self):
+        """
+        Clears rendering resources.
+        :return:
+        """
+        if self._screen is not None:
+            import pygame as pg
+
+            pg.display.quit()
+            pg.quit()
+            self._screen = None
+
+    """
+    Drawing Methods
+    """
+
+    def _update_render(self, return_observation=True, out=None):
+        """
+        Composites the current game state into the frame buffer.
+        :param return_observation: boolean saying if we are to return a copy of the frame.
+        :param out: Optional preallocated (H * 32, W * 32, 3) uint8 array the frame is copied into.
+        :return: A (H * 32, W * 32, 3) numpy array corresponding to the pixel state after the render update.
+        """
+        self._frame[:] = self._background
+        self._draw_entities()
+
+        if return_observation:
+            if out is None:
+                return self._frame.copy()
+            out[:] = self._frame
+            return out
+
+    def render_on_display(self):
+        """
+        Renders the current frame on a pygame display. This is the only place the array renderer touches pygame.
+        :return:
+        """
+        import pygame as pg
+
+        if self._screen is None:
+            pg.init()
+            pg.display.set_caption(self._window_title)
+            self._screen = pg.display.set_mode(self._screen_size)
+
+        surf = pg.surfarray.make_surface(self._frame.transpose(1, 0, 2))
+        self._screen.blit(pg.transform.scale(surf, self._screen_size), (0, 0))
+        pg.display.flip()
+        for event in pg.event.get():
+            if event.type == pg.QUIT:
+                self.quit()
+
+    def _blit(self, entity_type, location):
+        """
+        Alpha-blends a sprite onto the tile of the frame at the given cell.
+        :param entity_type: Which of the loaded sprites to draw
+        :param location: [X, Y] cell of the sprite
+        :return:
+        """
+        color, inverse_alpha = self._sprites[entity_type]
+        left, top = int(location[0]) * TILE_SIZE, int(location[1]) * TILE_SIZE
+        tile = self._frame[top : top + TILE_SIZE, left : left + TILE_SIZE]
+        tile[:] = (tile * inverse_alpha + color + 127) // 255
+
+    def _draw_entities(self):
+        # Agents
+        entity_positions = self._game.ENTITY_POSITIONS
+        self._blit("a_agent", entity_positions["a_agent"])
+        self._blit("b_agent", entity_positions["b_agent"])
+
+    """
+    Properties
+    """
+
+    @property
+    def FRAME(self):
+        return self._frame
+
+    @property
+    def SCREEN_SIZE(self):
+        return tuple(self._screen_size)
+
+    @property
+    def GRID_W(self):
+        return self._game.GRID_W
+
+    @property
+    def GRID_H(self):
+        return self._game.GRID_H
@@ -1,7 +1,11 @@
 import pygame as pg
 from numpy import rot90, flipud
 
-from gym_stag_hunt.src.entities import Entity, get_gui_window_icon
+from gym_stag_hunt.src.entities import (
+    Entity,
+    clear_sprite_cache,
+    get_gui_window_icon,
+)
 
 """
 Constants
@@ -34,10 +38,13 @@ class AbstractRenderer:
         game_surface_size = TILE_SIZE * grid_size[0], TILE_SIZE * grid_size[1]
 
         # Create a background
-        self._background = pg.Surface(
+        self._base = pg.Surface(
             game_surface_size
         ).convert()  # here we create and fill all the surfaces
-        self._background.fill(BACKGROUND_COLOR)
+        self._base.fill(BACKGROUND_COLOR)
+        # Create the composed frame, it persists between updates so only the changed tiles have to be redrawn
+        self._background = pg.Surface(game_surface_size).convert()
+        self._full_redraw = True
         # Create a layer for the grid
         self._grid_layer = pg.Surface(game_surface_size).convert_alpha()
         self._grid_layer.fill(CLEAR)
@@ -64,15 +71,17 @@ class AbstractRenderer:
             self._screen_size
         )  # instantiate virtual display
 
-    def update(self):
+    def update(self, out=None):
         """
-        :return: A pixel array corresponding to the new game state.
+        :param out: Optional preallocated (H * 32, W * 32, 3) uint8 array the frame is written into
+        :return: A pixel array corresponding to the new game state. If out was given, out itself is returned.
         """
         try:
-            img_output = self._update_render()
+            img_output = self._update_render(out=out)
             for event in pg.event.get():
                 if event.type == pg.QUIT:
                     self.quit()
+                    quit()  # the user closed the window
         except Exception as e:
             self.quit()
             raise e
@@ -85,9 +94,9 @@ class AbstractRenderer:
         :return:
         """
         try:
+            clear_sprite_cache()  # the cached sprites belong to the display we are closing
             pg.display.quit()
             pg.quit()
-            quit()
         except Exception as e:
             raise e
 
@@ -95,25 +104,37 @@ class AbstractRenderer:
     Drawing Methods
     """
 
-    def _update_render(self, return_observation=True):
+    def _update_render(self, return_observation=True, out=None):
         """
         Executes the logic side of rendering without actually drawing it to the screen. In other words, new pixel
         values are calculated for each layer/surface without them actually being redrawn.
         :param return_observation: boolean saying if we are to (create and) return a numpy pixel array. The operation
                                    is expensive so we don't want to do it needlessly.
+        :param out: Optional preallocated (H * 32, W * 32, 3) uint8 array the pixels are copied into instead of
+                    allocating a new array.
         :return: A numpy array corresponding to the pixel state of the display after the render update.
                  Note: The returned array is smaller than screen_size - the dimensions are 32 * grid_size
         """
         self._update_rects(self._game.ENTITY_POSITIONS)
-        self._background.fill(BACKGROUND_COLOR)
-        self._entity_layer.fill(CLEAR)
-        self._draw_entities()
-        # blit the surfaces to the main surface
-        self._background.blit(self._grid_layer, (0, 0))
-        self._background.blit(self._entity_layer, (0, 0))
+        if self._full_redraw:
+            self._entity_layer.fill(CLEAR)
+            self._draw_entities()
+            # blit the surfaces to the main surface
+            self._background.blit(self._base, (0, 0))
+            self._background.blit(self._entity_layer, (0, 0))
+            self._full_redraw = False
+        else:
+            self._draw_dirty_tiles()
+
+        for sprite in self._entity_sprites():
+            sprite.mark_drawn()
 
         if return_observation:
-            return flipud(rot90(pg.surfarray.array3d(self._background)))
+            if out is None:
+                return flipud(rot90(pg.surfarray.array3d(self._background)))
+            # the surface is indexed (X, Y), so we copy it through a transposed view to get a (Y, X) image
+            pg.pixelcopy.surface_to_array(out.transpose(1, 0, 2), self._background)
+            return out
 
     def render_on_display(self):
         """
@@ -150,14 +171,51 @@ class AbstractRenderer:
                 (x * TILE_SIZE, self.SCREEN_H),
             )
 
+        # compose the static part of the frame, the grid never changes so we only do it once
+        self._base.blit(self._grid_layer, (0, 0))
+        self._full_redraw = True
+
     def _draw_entities(self):
-        # Agents
-        self._entity_layer.blit(
-            self._a_sprite.IMAGE, (self._a_sprite.rect.left, self._a_sprite.rect.top)
-        )
-        self._entity_layer.blit(
-            self._b_sprite.IMAGE, (self._b_sprite.rect.left, self._b_sprite.rect.top)
-        )
+        """
+        Draws the entity sprites to the entity layer surface.
+        :return:
+        """
+        for sprite in self._entity_sprites():
+            self._entity_layer.blit(sprite.image, sprite.rect)
+
+    def _draw_dirty_tiles(self):
+        """
+        Redraws only the tiles an entity moved into, moved out of or changed its image on. Entities are aligned to the
+        grid, so each dirty tile is restored from the base frame and every entity standing on it is drawn again.
+        :return:
+        """
+        sprites = self._entity_sprites()
+
+        dirty_tiles = {}
+        for sprite in sprites:
+            if sprite.dirty:
+                dirty_tiles[sprite.rect.topleft] = sprite.rect
+                if sprite.drawn_rect is not None:
+                    dirty_tiles[sprite.drawn_rect.topleft] = sprite.drawn_rect
+
+        if not dirty_tiles:
+            return
+
+        for rect in dirty_tiles.values():
+            self._entity_layer.fill(CLEAR, rect)
+        # sprites are in drawing order, so overlapping entities stack like before
+        for sprite in sprites:
+            if sprite.rect.topleft in dirty_tiles:
+                self._entity_layer.blit(sprite.image, sprite.rect)
+        for rect in dirty_tiles.values():
+            self._background.blit(self._base, rect, rect)
+            self._background.blit(self._entity_layer, rect, rect)
+
+    def _entity_sprites(self):
+        """
+        :return: The entity sprites, in the order they are drawn.
+        """
+        return [self._a_sprite, self._b_sprite]
 
     def _update_rects(self, entity_positions):
         """
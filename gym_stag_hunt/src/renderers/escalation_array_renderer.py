@@ -0,0 +1,20 @@
+from gym_stag_hunt.src.renderers.abstract_array_renderer import AbstractArrayRenderer
+
+
+class EscalationArrayRenderer(AbstractArrayRenderer):
+    SPRITES = ("a_agent", "b_agent", "mark", "mark_active")
+
+    def _draw_entities(self):
+        """
+        Composites the entity sprites into the frame buffer.
+        :return:
+        """
+        entity_positions = self._game.ENTITY_POSITIONS
+
+        if entity_positions["streak_active"]:
+            self._blit("mark_active", entity_positions["mark"])
+        else:
+            self._blit("mark", entity_positions["mark"])
+        # Agents
+        self._blit("a_agent", entity_positions["a_agent"])
+        self._blit("b_agent", entity_positions["b_agent"])
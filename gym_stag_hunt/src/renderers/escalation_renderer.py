@@ -17,29 +17,11 @@ class EscalationRenderer(AbstractRenderer):
     Misc
     """
 
-    def _draw_entities(self):
+    def _entity_sprites(self):
         """
-        Draws the entity sprites to the entity layer surface.
-        :return:
+        :return: The entity sprites, in the order they are drawn.
         """
-        if self._game.ENTITY_POSITIONS["streak_active"]:
-            self._entity_layer.blit(
-                self._mark_sprite.IMAGE_ACTIVE,
-                (self._mark_sprite.rect.left, self._mark_sprite.rect.top),
-            )
-        else:
-            self._entity_layer.blit(
-                self._mark_sprite.IMAGE,
-                (self._mark_sprite.rect.left, self._mark_sprite.rect.top),
-            )
-
-        # Agents
-        self._entity_layer.blit(
-            self._a_sprite.IMAGE, (self._a_sprite.rect.left, self._a_sprite.rect.top)
-        )
-        self._entity_layer.blit(
-            self._b_sprite.IMAGE, (self._b_sprite.rect.left, self._b_sprite.rect.top)
-        )
+        return [self._mark_sprite, self._a_sprite, self._b_sprite]
 
     def _update_rects(self, entity_positions):
         """
@@ -50,3 +32,4 @@ class EscalationRenderer(AbstractRenderer):
         self._a_sprite.update_rect(entity_positions["a_agent"])
         self._b_sprite.update_rect(entity_positions["b_agent"])
         self._mark_sprite.update_rect(entity_positions["mark"])
+        self._mark_sprite.set_active(entity_positions["streak_active"])
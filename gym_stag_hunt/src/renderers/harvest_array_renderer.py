@@ -0,0 +1,19 @@
+from gym_stag_hunt.src.renderers.abstract_array_renderer import AbstractArrayRenderer
+
+
+class HarvestArrayRenderer(AbstractArrayRenderer):
+    SPRITES = ("a_agent", "b_agent", "plant", "plant_young")
+
+    def _draw_entities(self):
+        """
+        Composites the entity sprites into the frame buffer.
+        :return:
+        """
+        entity_positions = self._game.ENTITY_POSITIONS
+        maturity_flags = entity_positions["maturity_flags"]
+
+        for idx, plant in enumerate(entity_positions["plant_coords"]):
+            self._blit("plant" if maturity_flags[idx] else "plant_young", plant)
+        # Agents
+        self._blit("a_agent", entity_positions["a_agent"])
+        self._blit("b_agent", entity_positions["b_agent"])
@@ -29,29 +29,11 @@ class HarvestRenderer(AbstractRenderer):
             plants.append(HarvestPlant(location=loc))
         return plants
 
-    def _draw_entities(self):
+    def _entity_sprites(self):
         """
-        Draws the entity sprites to the entity layer surface.
-        :return:
+        :return: The entity sprites, in the order they are drawn.
         """
-
-        maturity_flags = self._game.ENTITY_POSITIONS["maturity_flags"]
-
-        for idx, plant in enumerate(self.plant_sprites):
-            if maturity_flags[idx]:
-                self._entity_layer.blit(plant.IMAGE, (plant.rect.left, plant.rect.top))
-            else:
-                self._entity_layer.blit(
-                    plant.IMAGE_YOUNG, (plant.rect.left, plant.rect.top)
-                )
-
-        # Agents
-        self._entity_layer.blit(
-            self._a_sprite.IMAGE, (self._a_sprite.rect.left, self._a_sprite.rect.top)
-        )
-        self._entity_layer.blit(
-            self._b_sprite.IMAGE, (self._b_sprite.rect.left, self._b_sprite.rect.top)
-        )
+        return [*self.plant_sprites, self._a_sprite, self._b_sprite]
 
     def _update_rects(self, entity_positions):
         """
@@ -62,5 +44,7 @@ class HarvestRenderer(AbstractRenderer):
         self._a_sprite.update_rect(entity_positions["a_agent"])
         self._b_sprite.update_rect(entity_positions["b_agent"])
 
+        maturity_flags = entity_positions["maturity_flags"]
         for idx, plant in enumerate(self.plant_sprites):
             plant.update_rect(entity_positions["plant_coords"][idx])
+            plant.set_mature(maturity_flags[idx])
@@ -0,0 +1,19 @@
+from gym_stag_hunt.src.renderers.abstract_array_renderer import AbstractArrayRenderer
+
+
+class HuntArrayRenderer(AbstractArrayRenderer):
+    SPRITES = ("a_agent", "b_agent", "stag", "plant")
+
+    def _draw_entities(self):
+        """
+        Composites the entity sprites into the frame buffer.
+        :return:
+        """
+        entity_positions = self._game.ENTITY_POSITIONS
+
+        self._blit("stag", entity_positions["stag"])
+        for plant in entity_positions["plants"]:
+            self._blit("plant", plant)
+        # Agents
+        self._blit("a_agent", entity_positions["a_agent"])
+        self._blit("b_agent", entity_positions["b_agent"])
@@ -31,24 +31,11 @@ class HuntRenderer(AbstractRenderer):
             plants.append(Entity(entity_type="plant", location=loc))
         return plants
 
-    def _draw_entities(self):
+    def _entity_sprites(self):
         """
-        Draws the entity sprites to the entity layer surface.
-        :return:
+        :return: The entity sprites, in the order they are drawn.
         """
-        self._entity_layer.blit(
-            self._stag_sprite.IMAGE,
-            (self._stag_sprite.rect.left, self._stag_sprite.rect.top),
-        )
-        for plant in self._plant_sprites:
-            self._entity_layer.blit(plant.IMAGE, (plant.rect.left, plant.rect.top))
-        # Agents
-        self._entity_layer.blit(
-            self._a_sprite.IMAGE, (self._a_sprite.rect.left, self._a_sprite.rect.top)
-        )
-        self._entity_layer.blit(
-            self._b_sprite.IMAGE, (self._b_sprite.rect.left, self._b_sprite.rect.top)
-        )
+        return [self._stag_sprite, *self._plant_sprites, self._a_sprite, self._b_sprite]
 
     def _update_rects(self, entity_positions):
         """
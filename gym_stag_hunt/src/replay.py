@@ -0,0 +1,145 @@
+from numpy import arange, empty, intp, stack, uint8
+
+from gym_stag_hunt.src.renderers.abstract_array_renderer import (
+    load_blend_sprites,
+    make_background,
+)
+from gym_stag_hunt.src.sprites import TILE_SIZE
+
+"""
+Rebuilds image observations from recorded game states, without a game or a renderer. Frames are composited like the
+numpy renderer does it (same sprites, same blending, same pixels), but one entity slot at a time across a whole batch
+of states instead of one state at a time.
+"""
+
+# Sprites drawn for each game
+GAME_SPRITES = {
+    "hunt": ("a_agent", "b_agent", "stag", "plant"),
+    "harvest": ("a_agent", "b_agent", "plant", "plant_young"),
+    "escalation": ("a_agent", "b_agent", "mark", "mark_active"),
+}
+
+# How the sprite of a layer is picked: always the first one, by a flag in the state, or by the streak
+FIXED = 0
+STATE_FLAG = 1
+STREAK_FLAG = 2
+
+
+def _state_layers(game, state_size):
+    """
+    Draw order of a game, same as its array renderer.
+    :param game: 'hunt', 'harvest' or 'escalation'
+    :param state_size: length of the recorded states
+    :return: list of (index of the X coordinate in the state, sprites, how the sprite is picked, index of the flag)
+    """
+    agents = [(0, ("a_agent",), FIXED, 0), (2, ("b_agent",), FIXED, 0)]
+    if game == "hunt":
+        plants = [(x, ("plant",), FIXED, 0) for x in range(6, state_size, 2)]
+        return [(4, ("stag",), FIXED, 0)] + plants + agents
+    if game == "harvest":
+        plants = [
+            (x, ("plant_young", "plant"), STATE_FLAG, x + 2)
+            for x in range(4, state_size, 3)
+        ]
+        return plants + agents
+    return [(4, ("mark", "mark_active"), STREAK_FLAG, 0)] + agents  # escalation
+
+
+class FrameReplayer:
+    def __init__(self, game, grid_size):
+        """
+        :param game: 'hunt', 'harvest' or 'escalation', the game_title of the env the states come from
+        :param grid_size: A (W, H) tuple corresponding to the grid dimensions
+        """
+        if game not in GAME_SPRITES:
+            raise AttributeError(
+                'Frames can only be replayed for "hunt", "harvest" or "escalation".'
+            )
+        self._game = game
+        self._grid_w, self._grid_h = int(grid_size[0]), int(grid_size[1])
+        self._background = make_background(self._grid_w, self._grid_h)
+        sprites = load_blend_sprites(GAME_SPRITES[game])
+        self._colors = {name: color for name, (color, _) in sprites.items()}
+        self._inverse_alphas = {name: inverse for name, (_, inverse) in sprites.items()}
+        self._layers = {}  # draw order for each state size
+
+    def render(self, states, streaks=None, out=None):
+        """
+        :param states: (T, state size) uint8 array of recorded states, laid out like the coords observation
+        :param streaks: (T,) streak of every state, needed for Escalation (the mark lights up while a streak is on)
+        :param out: Optional (T, H * 32, W * 32, 3) uint8 array the frames are written into
+        :return: (T, H * 32, W * 32, 3) array with the frame of every state
+        """
+        count = len(states)
+        if out is None:
+            out = empty((count,) + self.FRAME_SHAPE, dtype=uint8)
+        if self._game == "escalation" and streaks is None:
+            raise AttributeError("Escalation frames need the streak of every state.")
+
+        out[:] = self._background
+        # [t, row, y, column, x] view of the tiles of every frame
+        tiles = out.reshape(count, self._grid_h, TILE_SIZE, self._grid_w, TILE_SIZE, 3)
+        frames = arange(count)
+
+        for x_index, sprites, pick, flag_index in self._state_layers(states.shape[1]):
+            columns = states[:, x_index].astype(intp)
+            rows = states[:, x_index + 1].astype(intp)
+            if pick == FIXED:
+                color = self._colors[sprites[0]]
+                inverse_alpha = self._inverse_alphas[sprites[0]]
+            else:
+                flags = (
+                    states[:, flag_index] if pick == STATE_FLAG else streaks > 0
+                ).astype(intp)
+                color = stack([self._colors[name] for name in sprites])[flags]
+                inverse_alpha = stack([self._inverse_alphas[name] for name in sprites])[
+                    flags
+                ]
+
+            # (T, 32, 32, 3) tile under the entity in each frame, blended like AbstractArrayRenderer._blit
+            tile = tiles[frames, rows, :, columns, :]
+            tiles[frames, rows, :, columns, :] = (
+                tile * inverse_alpha + color + 127
+            ) // 255
+        return out
+
+    def iter_frames(self, states, streaks=None, batch_size=16):
+        """
+        Renders the states batch by batch, so the frames never all have to be in memory at once.
+        :param states: (T, state size) array of recorded states, eg. the memory-mapped column of a trajectory
+        :param streaks: (T,) streaks, for Escalation
+        :param batch_size: how many frames are rendered at once
+        :return: generator of (batch size, H * 32, W * 32, 3) arrays (the last one possibly shorter). The same buffer
+                 is reused for every batch, so copy the frames you need to keep.
+        """
+        buffer = empty((batch_size,) + self.FRAME_SHAPE, dtype=uint8)
+        for start in range(0, len(states), batch_size):
+            stop = min(start + batch_size, len(states))
+            yield self.render(
+                states[start:stop],
+                None if streaks is None else streaks[start:stop],
+                out=buffer[: stop - start],
+            )
+
+    def _state_layers(self, state_size):
+        if state_size not in self._layers:
+            self._layers[state_size] = _state_layers(self._game, state_size)
+        return self._layers[state_size]
+
+    @property
+    def FRAME_SHAPE(self):
+        return self._grid_h * TILE_SIZE, self._grid_w * TILE_SIZE, 3
+
+
+def replay_trajectory(trajectory, batch_size=16):
+    """
+    :param trajectory: Trajectory returned by load_trajectory, recorded by TrajectoryRecorder
+    :param batch_size: how many frames are rendered at once
+    :return: generator of batches of the frame of every row of the trajectory, see FrameReplayer.iter_frames
+    """
+    metadata = trajectory.METADATA
+    replayer = FrameReplayer(metadata["game"], metadata["grid_size"])
+    streaks = trajectory["streaks"] if "streaks" in trajectory else None
+    return replayer.iter_frames(
+        trajectory["states"], streaks=streaks, batch_size=batch_size
+    )
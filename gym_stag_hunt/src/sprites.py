@@ -0,0 +1,74 @@
+import os
+
+from numpy import uint8
+
+base_path = os.path.dirname(os.path.dirname(__file__))
+entity_path = os.path.join(base_path, "assets/entities")
+
+sprite_dict = {
+    "a_agent": os.path.join(entity_path, "blue_agent.png"),
+    "b_agent": os.path.join(entity_path, "red_agent.png"),
+    "stag": os.path.join(entity_path, "stag.png"),
+    "plant": os.path.join(entity_path, "plant_fruit.png"),
+    "plant_young": os.path.join(entity_path, "plant_no_fruit.png"),
+    "mark": os.path.join(entity_path, "mark.png"),
+    "mark_active": os.path.join(entity_path, "mark_active.png"),
+    "game_icon": os.path.join(base_path, "assets/icon.png"),
+}
+
+TILE_SIZE = 32
+
+# Decoded sprite arrays keyed by (entity_type, tile_size), shared by every array renderer in the process
+_sprite_array_cache = {}
+
+
+def load_sprite_array(entity_type, tile_size=TILE_SIZE):
+    """
+    Decodes a sprite into a NumPy array without going through pygame, so it also works on machines without SDL. Each
+    asset is only decoded once per process, the returned array is shared and read-only.
+    :param entity_type: String specifying which sprite to load from the sprite dictionary (sprite_dict)
+    :param tile_size: Width and height (in pixels) the sprite is scaled to
+    :return: (tile_size, tile_size, 4) uint8 RGBA array
+    """
+    key = (entity_type, tile_size)
+    if key not in _sprite_array_cache:
+        sprite = _decode_sprite_array(entity_type, tile_size)
+        sprite.setflags(write=False)
+        _sprite_array_cache[key] = sprite
+    return _sprite_array_cache[key]
+
+
+def _decode_sprite_array(entity_type, tile_size):
+    """
+    :param entity_type: String specifying which sprite to load from the sprite dictionary (sprite_dict)
+    :param tile_size: Width and height (in pixels) the sprite is scaled to
+    :return: (tile_size, tile_size, 4) uint8 RGBA array
+    """
+    # we don't want to import opencv unless we are rendering without pygame, so that's why this import is here
+    from cv2 import (
+        COLOR_BGR2RGBA,
+        COLOR_BGRA2RGBA,
+        COLOR_GRAY2RGBA,
+        IMREAD_UNCHANGED,
+        INTER_NEAREST,
+        cvtColor,
+        imread,
+        resize,
+    )
+
+    img = imread(sprite_dict[entity_type], IMREAD_UNCHANGED)
+    if img is None:
+        raise FileNotFoundError("Could not load sprite: " + sprite_dict[entity_type])
+
+    if img.ndim == 2:
+        img = cvtColor(img, COLOR_GRAY2RGBA)
+    elif img.shape[2] == 3:
+        img = cvtColor(img, COLOR_BGR2RGBA)
+    else:
+        img = cvtColor(img, COLOR_BGRA2RGBA)
+
+    if img.shape[:2] != (tile_size, tile_size):
+        # nearest neighbour, same as pygame's transform.scale
+        img = resize(img, (tile_size, tile_size), interpolation=INTER_NEAREST)
+
+    return img.astype(uint8)
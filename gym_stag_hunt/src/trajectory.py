@@ -0,0 +1,291 @@
+import json
+import os
+
+from numpy import dtype, empty, load, memmap, ndarray, prod, savez_compressed, zeros
+
+"""
+Trajectory files: a directory holding one raw file per column (rows of a fixed shape, appended through a memory map
+that doubles in size whenever it fills up), compressed chunks of image frames, and a JSON manifest describing them.
+Reading a trajectory back maps the column files, so nothing is copied until it is used.
+"""
+
+MANIFEST_FILE = "trajectory.json"
+FRAME_FILE = "frames_%05d.npz"
+
+
+class MemmapColumn:
+    def __init__(self, path, row_dtype, row_shape=(), capacity=1024):
+        """
+        One column of a trajectory, eg. the actions of every step.
+        :param path: file the rows are written into, overwritten if it exists
+        :param row_dtype: dtype of the column
+        :param row_shape: shape of a single row, () for scalars
+        :param capacity: how many rows the file has room for initially
+        """
+        self._path = path
+        self._dtype = dtype(row_dtype)
+        self._row_shape = tuple(row_shape)
+        self._row_bytes = self._dtype.itemsize * int(prod(self._row_shape))
+        self._length = 0
+        self._capacity = 0
+        self._array = None
+        self._rows = None
+
+        open(path, "wb").close()
+        self._grow(max(1, capacity))
+
+    def _grow(self, capacity):
+        """
+        Makes room for capacity rows, by extending the file and mapping it again.
+        """
+        if self._array is not None:
+            self._array.flush()
+            self._array = self._rows = None
+        with open(self._path, "r+b") as f:
+            f.truncate(capacity * self._row_bytes)
+        self._array = memmap(
+            self._path,
+            dtype=self._dtype,
+            mode="r+",
+            shape=(capacity,) + self._row_shape,
+        )
+        # rows are written through a plain view, indexing the memmap subclass is several times slower
+        self._rows = self._array.view(ndarray)
+        self._capacity = capacity
+
+    def append(self, row):
+        """
+        :param row: value of the new row, anything that can be assigned to an array of the row shape
+        """
+        if self._length == self._capacity:
+            self._grow(2 * self._capacity)
+        self._rows[self._length] = row
+        self._length += 1
+
+    def flush(self):
+        """
+        Writes the rows in the page cache out to the file.
+        """
+        self._array.flush()
+
+    def close(self):
+        """
+        Flushes the rows and cuts the unused capacity off the end of the file.
+        """
+        self.flush()
+        self._array = self._rows = None
+        with open(self._path, "r+b") as f:
+            f.truncate(self._length * self._row_bytes)
+
+    def describe(self):
+        """
+        :return: the manifest entry of the column
+        """
+        return {
+            "file": os.path.basename(self._path),
+            "dtype": self._dtype.str,
+            "shape": [self._length] + list(self._row_shape),
+        }
+
+    @property
+    def LENGTH(self):
+        return self._length
+
+
+class FrameChunks:
+    def __init__(self, directory, frame_shape, chunk_size=256):
+        """
+        Collects image frames and writes them out as compressed chunks of chunk_size frames.
+        :param directory: where the chunk files go
+        :param frame_shape: (H, W, 3) shape of a frame
+        :param chunk_size: how many frames go into one file
+        """
+        self._directory = directory
+        self._chunk = empty((chunk_size,) + tuple(frame_shape), dtype="uint8")
+        self._filled = 0
+        self._files = []
+        self._count = 0
+
+    def append(self, frame):
+        """
+        :param frame: (H, W, 3) uint8 array, copied into the current chunk
+        """
+        self._chunk[self._filled] = frame
+        self._filled += 1
+        self._count += 1
+        if self._filled == len(self._chunk):
+            self.flush()
+
+    def flush(self):
+        """
+        Compresses the frames collected so far into a new chunk file.
+        """
+        if self._filled == 0:
+            return
+        name = FRAME_FILE % len(self._files)
+        savez_compressed(
+            os.path.join(self._directory, name), frames=self._chunk[: self._filled]
+        )
+        self._files.append(name)
+        self._filled = 0
+
+    def describe(self):
+        """
+        :return: the manifest entry of the frames, only counting those already written to a file
+        """
+        return {
+            "shape": list(self._chunk.shape[1:]),
+            "chunk_size": len(self._chunk),
+            "count": self._count - self._filled,
+            "files": list(self._files),
+        }
+
+
+class TrajectoryWriter:
+    def __init__(self, directory, metadata=None, flush_every=1024):
+        """
+        Appends rows to a set of columns and keeps the manifest up to date. Everything up to the last flush can be read
+        back, even if the writer never gets closed.
+        :param directory: directory of the trajectory, created if needed
+        :param metadata: dictionary stored in the manifest, eg. describing the env
+        :param flush_every: after how many rows the columns get flushed and the manifest rewritten
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._metadata = dict(metadata or {})
+        self._flush_every = flush_every
+        self._columns = {}
+        self._frames = None
+        self._rows_since_flush = 0
+        self._closed = False
+
+    def add_column(self, name, row_dtype, row_shape=(), capacity=1024):
+        """
+        :param name: name of the column, also the name of its file
+        :return: the column, rows are appended to it directly
+        """
+        column = MemmapColumn(
+            os.path.join(self._directory, name + ".bin"),
+            row_dtype,
+            row_shape,
+            capacity=capacity,
+        )
+        self._columns[name] = column
+        return column
+
+    def add_frames(self, frame_shape, chunk_size=256):
+        """
+        :return: the frame chunks, frames are appended to them directly
+        """
+        self._frames = FrameChunks(self._directory, frame_shape, chunk_size=chunk_size)
+        return self._frames
+
+    def row_written(self):
+        """
+        Counts a finished row, flushing once every flush_every rows.
+        """
+        self._rows_since_flush += 1
+        if self._rows_since_flush >= self._flush_every:
+            self.flush()
+
+    def flush(self):
+        """
+        Flushes every column and rewrites the manifest.
+        """
+        for column in self._columns.values():
+            column.flush()
+        self._write_manifest()
+        self._rows_since_flush = 0
+
+    def close(self):
+        """
+        Writes out the remaining frames, trims the column files and writes the final manifest.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._frames is not None:
+            self._frames.flush()
+        for column in self._columns.values():
+            column.close()
+        self._write_manifest()
+
+    def _write_manifest(self):
+        manifest = {
+            "metadata": self._metadata,
+            "columns": {
+                name: column.describe() for name, column in self._columns.items()
+            },
+        }
+        if self._frames is not None:
+            manifest["frames"] = self._frames.describe()
+        path = os.path.join(self._directory, MANIFEST_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(path + ".tmp", path)  # readers never see a half written manifest
+
+
+class Trajectory:
+    def __init__(self, directory):
+        """
+        Read-only view of a recorded trajectory. The columns are memory maps of the column files.
+        :param directory: directory the trajectory was written to
+        """
+        with open(os.path.join(directory, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+        self._directory = directory
+        self._metadata = manifest["metadata"]
+        self._frames = manifest.get("frames")
+        self._columns = {
+            name: _map_column(os.path.join(directory, entry["file"]), entry)
+            for name, entry in manifest["columns"].items()
+        }
+
+    def __getitem__(self, name):
+        return self._columns[name]
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def __len__(self):
+        return min((len(column) for column in self._columns.values()), default=0)
+
+    def frame_chunks(self):
+        """
+        :return: generator over the recorded frames, one (chunk size, H, W, 3) array at a time
+        """
+        if self._frames is None:
+            return
+        for name in self._frames["files"]:
+            with load(os.path.join(self._directory, name)) as chunk:
+                yield chunk["frames"]
+
+    @property
+    def METADATA(self):
+        return self._metadata
+
+    @property
+    def COLUMNS(self):
+        return self._columns
+
+    @property
+    def FRAME_COUNT(self):
+        return 0 if self._frames is None else self._frames["count"]
+
+
+def _map_column(path, entry):
+    """
+    :return: read-only array of the rows listed in the manifest entry
+    """
+    shape = tuple(entry["shape"])
+    if shape[0] == 0:
+        return zeros(shape, dtype=entry["dtype"])
+    return memmap(path, dtype=entry["dtype"], mode="r", shape=shape)
+
+
+def load_trajectory(directory):
+    """
+    :param directory: directory the trajectory was written to
+    :return: the Trajectory, its columns are mapped from the files without copying them
+    """
+    return Trajectory(directory)
@@ -1,8 +1,7 @@
-from itertools import product
-from random import choice
 from sys import stdout
 
-from numpy import all, full, zeros, uint8
+from numpy import arange, empty, full, int32, int64, intp, uint64, zeros, uint8
+from numpy.random import default_rng
 
 symbol_dict = {"hunt": ("S", "P"), "harvest": ("p", "P"), "escalation": "M"}
 
@@ -17,6 +16,44 @@ M_PLANT = 3
 
 MARK = 2  # escalation
 
+# Length of the uint64 array RandomBuffer.get_state returns: two generator states of 6 words, chunk flag, read index
+RNG_STATE_SIZE = 14
+_WORD = (1 << 64) - 1
+_NO_WORDS = (0,) * 6
+
+
+def _generator_words(bit_generator):
+    """
+    :param bit_generator: a PCG64 bit generator, the one default_rng creates
+    :return: its state as 6 ints that fit into uint64 (128 bit state and increment split in two, buffered uint32)
+    """
+    state = bit_generator.state
+    value, inc = state["state"]["state"], state["state"]["inc"]
+    return (
+        value >> 64,
+        value & _WORD,
+        inc >> 64,
+        inc & _WORD,
+        state["has_uint32"],
+        state["uinteger"],
+    )
+
+
+def _set_generator_words(bit_generator, words):
+    """
+    Inverse of _generator_words.
+    :param words: 6 Python ints (numpy integers would overflow when shifted)
+    """
+    bit_generator.state = {
+        "bit_generator": "PCG64",
+        "state": {
+            "state": words[0] << 64 | words[1],
+            "inc": words[2] << 64 | words[3],
+        },
+        "has_uint32": words[4],
+        "uinteger": words[5],
+    }
+
 
 def print_matrix(obs, game, grid_size):
     if game == "escalation":
@@ -78,41 +115,296 @@ def overlaps_entity(a, b):
     return (a == b).all()
 
 
-def place_entity_in_unoccupied_cell(used_coordinates, grid_dims):
+class RandomBuffer:
+    def __init__(self, seed=None, chunk_size=1024):
+        """
+        Serves single random draws out of chunks pre-drawn from a numpy Generator, so that the many small decisions of
+        a game (random moves, spawn cells...) don't pay for a numpy call each. The sequence only depends on the seed.
+        :param seed: seed of the generator, None to seed it from the OS
+        :param chunk_size: how many values are drawn at once
+        """
+        self._chunk_size = chunk_size
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """
+        Restarts the stream from a new generator, dropping the values drawn so far.
+        :param seed: seed of the generator, None to seed it from the OS
+        """
+        self._generator = default_rng(seed)
+        self._values = []
+        self._next = 0
+        self._chunk_words = None  # generator state the current chunk was drawn from
+
+    def _refill(self):
+        self._chunk_words = _generator_words(self._generator.bit_generator)
+        self._values = self._generator.random(self._chunk_size).tolist()
+        self._next = 0
+
+    def get_state(self, out=None):
+        """
+        The position in the stream, including the values pre-drawn but not served yet. These are stored as the
+        generator state they were drawn from, so the state has a fixed size whatever the chunk size is.
+        :param out: Optional (RNG_STATE_SIZE,) uint64 array the state is written into
+        :return: (RNG_STATE_SIZE,) uint64 array
+        """
+        if out is None:
+            out = empty(RNG_STATE_SIZE, dtype=uint64)
+        has_chunk = self._chunk_words is not None
+        out[:] = (
+            *(self._chunk_words if has_chunk else _NO_WORDS),
+            *_generator_words(self._generator.bit_generator),
+            has_chunk,
+            self._next,
+        )
+        return out
+
+    def set_state(self, state):
+        """
+        Continues the stream from a state returned by get_state, of a buffer with the same chunk size. The chunk is only
+        drawn again if it isn't the one already held.
+        :param state: (RNG_STATE_SIZE,) uint64 array
+        """
+        bit_generator = self._generator.bit_generator
+        # converting all at once is much cheaper than one word at a time
+        words = state.tolist()
+        if not words[12]:
+            self._chunk_words, self._values = None, []
+        else:
+            chunk_words = tuple(words[0:6])
+            if chunk_words != self._chunk_words:
+                _set_generator_words(bit_generator, chunk_words)
+                self._values = self._generator.random(self._chunk_size).tolist()
+                self._chunk_words = chunk_words
+        _set_generator_words(bit_generator, words[6:12])
+        self._next = words[13]
+
+    def random(self):
+        """
+        :return: a float in [0, 1)
+        """
+        if self._next == len(self._values):
+            self._refill()
+        value = self._values[self._next]
+        self._next += 1
+        return value
+
+    def integers(self, high):
+        """
+        :param high: upper bound (exclusive)
+        :return: an int in [0, high)
+        """
+        return int(self.random() * high)
+
+    def choice(self, options):
+        """
+        :param options: list to pick from
+        :return: an element of options, picked uniformly at random
+        """
+        return options[int(self.random() * len(options))]
+
+    @property
+    def GENERATOR(self):
+        return self._generator
+
+
+class OccupancyGrid:
+    def __init__(self, grid_dims, random_buffer=None):
+        """
+        Keeps track of the occupied cells of a grid so that cells can be marked, unmarked and sampled in constant time.
+        Free cells are kept at the front of a list of all the cells, with a reverse index telling where each cell sits.
+        Each marked cell can also record the slot (eg. the plant index) of the entity on it, so that collision checks
+        are a single lookup into a (W, H) array.
+        :param grid_dims: dimensions of the grid so we know what a valid coordinate is
+        :param random_buffer: RandomBuffer cells are sampled with, usually the one of the game. A new one if None
+        """
+        self._grid_w, self._grid_h = int(grid_dims[0]), int(grid_dims[1])
+        self._random = RandomBuffer() if random_buffer is None else random_buffer
+        self._slots = full((self._grid_w, self._grid_h), -1, dtype=int32)
+        self._positions = arange(self._grid_w * self._grid_h)  # scratch for set_state
+        self._index_scratch = empty(self._grid_w * self._grid_h, dtype=intp)
+        self.clear()
+
+    def clear(self):
+        """
+        Marks every cell as free.
+        """
+        total_cells = self._grid_w * self._grid_h
+        # the first _free_count entries are the free cells
+        self._cells = list(range(total_cells))
+        self._index = list(range(total_cells))  # position of each cell inside _cells
+        self._free_count = total_cells
+        self._slots.fill(-1)
+
+    def _cell(self, pos):
+        return int(pos[0]) + int(pos[1]) * self._grid_w
+
+    def is_free(self, pos):
+        """
+        :param pos: (X, Y) coordinate
+        :return: True if nothing has been placed on the cell, False otherwise
+        """
+        return self._index[self._cell(pos)] < self._free_count
+
+    def slot_at(self, pos):
+        """
+        :param pos: (X, Y) coordinate
+        :return: slot of the entity marked on the cell, -1 if there is none
+        """
+        return self._slots[pos[0], pos[1]]
+
+    def mark(self, pos, slot=-1):
+        """
+        Marks a cell as occupied.
+        :param pos: (X, Y) coordinate
+        :param slot: index of the entity placed on the cell, if it should be looked up later
+        """
+        self._slots[pos[0], pos[1]] = slot
+        cell = self._cell(pos)
+        idx = self._index[cell]
+        if idx >= self._free_count:
+            return  # already occupied
+        self._free_count -= 1
+        self._swap(idx, self._free_count)
+
+    def unmark(self, pos):
+        """
+        Marks a cell as free.
+        :param pos: (X, Y) coordinate
+        """
+        self._slots[pos[0], pos[1]] = -1
+        cell = self._cell(pos)
+        idx = self._index[cell]
+        if idx < self._free_count:
+            return  # already free
+        self._swap(idx, self._free_count)
+        self._free_count += 1
+
+    def _swap(self, i, j):
+        cells, index = self._cells, self._index
+        cells[i], cells[j] = cells[j], cells[i]
+        index[cells[i]], index[cells[j]] = i, j
+
+    def sample(self, exclude=()):
+        """
+        Returns a random free coordinate.
+        :param exclude: coordinates which are not marked on the grid, but should not be returned either (eg. entities
+                        which move every step and would be expensive to keep marked)
+        :return: the chosen x, y coordinate
+        """
+        excluded = set(self._cell(pos) for pos in exclude if self.is_free(pos))
+        if len(excluded) >= self._free_count:
+            raise ValueError("There are no unoccupied cells left on the grid.")
+
+        while True:  # rejection sampling - exclude only ever holds a handful of cells
+            cell = self._cells[self._random.integers(self._free_count)]
+            if cell not in excluded:
+                return cell % self._grid_w, cell // self._grid_w
+
+    def get_state(self, out=None):
+        """
+        The order of the cells matters as much as which ones are free, since it decides what sample returns.
+        :param out: Optional (STATE_SIZE,) int64 array the state is written into
+        :return: (STATE_SIZE,) int64 array holding the order of the cells, the slot of every cell and the free count
+        """
+        if out is None:
+            out = empty(self.STATE_SIZE, dtype=int64)
+        total_cells = len(self._cells)
+        out[:total_cells] = self._cells
+        out[total_cells:-1] = self._slots.reshape(-1)
+        out[-1] = self._free_count
+        return out
+
+    def set_state(self, state):
+        """
+        Restores a state returned by get_state of a grid with the same dimensions.
+        :param state: (STATE_SIZE,) integer array
+        """
+        total_cells = len(self._cells)
+        cells = state[:total_cells]
+        self._index_scratch[cells] = self._positions
+        self._cells = cells.tolist()
+        self._index = self._index_scratch.tolist()
+        self._slots.reshape(-1)[:] = state[total_cells:-1]
+        self._free_count = int(state[-1])
+
+    @property
+    def STATE_SIZE(self):
+        return 2 * self._grid_w * self._grid_h + 1
+
+    @property
+    def FREE_COUNT(self):
+        return self._free_count
+
+    @property
+    def SLOTS(self):
+        return self._slots
+
+
+def env_seeds(seed, count):
+    """
+    Spreads a seed over several envs, the way gym's vector envs do.
+    :param seed: None, an integer (env i gets seed + i) or a list with one seed per env
+    :param count: number of envs
+    :return: list with the seed of every env
+    """
+    if seed is None:
+        return [None] * count
+    if isinstance(seed, int):
+        return [seed + idx for idx in range(count)]
+    if len(seed) != count:
+        raise AttributeError("Please specify one seed per environment.")
+    return list(seed)
+
+
+def place_entity_in_unoccupied_cell(used_coordinates, grid_dims, random_buffer=None):
     """
     Returns a random unused coordinate.
     :param used_coordinates: a list of already used coordinates
     :param grid_dims: dimensions of the grid so we know what a valid coordinate is
+    :param random_buffer: optional RandomBuffer the cell is sampled with
     :return: the chosen x, y coordinate
     """
-    all_coords = list(product(list(range(grid_dims[0])), list(range(grid_dims[1]))))
-
+    occupancy = OccupancyGrid(grid_dims, random_buffer=random_buffer)
     for coord in used_coordinates:
-        for test in all_coords:
-            if all(test == coord):
-                all_coords.remove(test)
+        occupancy.mark(coord)
 
-    return choice(all_coords)
+    return occupancy.sample()
 
 
-def spawn_plants(grid_dims, how_many, used_coordinates):
-    new_plants = []
+def spawn_plants(occupancy, how_many, used_coordinates, plants=None):
+    """
+    Places new plants on random free cells and marks them, with their index, as occupied.
+    :param occupancy: OccupancyGrid of the game
+    :param how_many: how many plants to spawn
+    :param used_coordinates: coordinates of the entities which are not tracked by the occupancy grid
+    :param plants: Optional list of how_many (2,) arrays the coordinates are written into (eg. views of a state
+                   array). New arrays are created if None.
+    :return: list of the new plant coordinates
+    """
+    if plants is None:
+        plants = [zeros(2, dtype=uint8) for _ in range(how_many)]
     for x in range(how_many):
-        new_plant = zeros(2, dtype=uint8)
-        new_pos = place_entity_in_unoccupied_cell(
-            grid_dims=grid_dims, used_coordinates=new_plants + used_coordinates
-        )
-        new_plant[0], new_plant[1] = new_pos
-        new_plants.append(new_plant)
-    return new_plants
+        new_plant = plants[x]
+        new_plant[0], new_plant[1] = occupancy.sample(exclude=used_coordinates)
+        occupancy.mark(new_plant, slot=x)
+    return plants
 
 
-def respawn_plants(plants, tagged_plants, grid_dims, used_coordinates):
+def respawn_plants(plants, tagged_plants, occupancy, used_coordinates):
+    """
+    Moves the tagged plants to random free cells, keeping the occupancy grid up to date.
+    :param plants: list of the plant coordinates
+    :param tagged_plants: indices of the plants to move
+    :param occupancy: OccupancyGrid of the game
+    :param used_coordinates: coordinates of the entities which are not tracked by the occupancy grid
+    :return: the updated list of plant coordinates
+    """
     for tagged_plant in tagged_plants:
-        new_plant = zeros(2, dtype=uint8)
-        new_pos = place_entity_in_unoccupied_cell(
-            grid_dims=grid_dims, used_coordinates=plants + used_coordinates
-        )
-        new_plant[0], new_plant[1] = new_pos
-        plants[tagged_plant] = new_plant
+        new_x, new_y = occupancy.sample(exclude=used_coordinates)
+        plant = plants[tagged_plant]
+        occupancy.unmark(plant)
+        # in place, the plants can be views of the game state
+        plant[0], plant[1] = new_x, new_y
+        occupancy.mark(plant, slot=tagged_plant)
     return plants
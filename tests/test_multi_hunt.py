@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from gym_stag_hunt.envs.gym.multi_hunt import MultiHuntEnv
+
+"""
+Multi Hunt resolves captures by counting the agents and stags on every cell. These tests put the entities on chosen
+cells and check the rewards and respawns _calc_reward hands out.
+"""
+
+STAG_REWARD = 5
+FORAGE_REWARD = 1
+MAULING_PUNISHMENT = -5
+
+
+def _game(run_away_after_maul=False):
+    return MultiHuntEnv(
+        grid_size=(6, 6),
+        agent_count=6,
+        stag_count=2,
+        hunters_needed=3,
+        forage_quantity=3,
+        run_away_after_maul=run_away_after_maul,
+        stag_reward=STAG_REWARD,
+        forage_reward=FORAGE_REWARD,
+        mauling_punishment=MAULING_PUNISHMENT,
+    ).game
+
+
+def _place(game, agents, stags, plants):
+    """
+    Moves the entities to the given cells, keeping the plant lookup up to date.
+    """
+    game._agents[:] = agents
+    game._stags[:] = stags
+    game._plants[:] = plants
+    game._plant_slots.fill(-1)
+    game._plant_slots[game._cells(game._plants)] = np.arange(len(plants))
+
+
+def _calc_reward(game):
+    rewards, respawn_stags, harvested = game._calc_reward()
+    # the per-cell counts are scratch space, they have to be clean for the next step
+    assert not game._agent_counts.any() and not game._stag_counts.any()
+    return rewards, respawn_stags, harvested
+
+
+PLANTS = [(5, 0), (5, 5), (0, 5)]
+
+
+def test_stag_is_caught_by_exactly_the_hunters_needed():
+    game = _game()
+    # three agents on stag 0, which is what it takes, the others stand on empty cells
+    _place(
+        game,
+        agents=[(2, 2), (2, 2), (2, 2), (0, 0), (1, 0), (2, 0)],
+        stags=[(2, 2), (4, 4)],
+        plants=PLANTS,
+    )
+    rewards, respawn_stags, harvested = _calc_reward(game)
+
+    np.testing.assert_array_equal(rewards, [STAG_REWARD] * 3 + [0] * 3)
+    np.testing.assert_array_equal(respawn_stags, [True, False])
+    assert len(harvested) == 0
+
+
+@pytest.mark.parametrize("run_away_after_maul", [False, True])
+def test_too_few_hunters_are_mauled(run_away_after_maul):
+    game = _game(run_away_after_maul)
+    # two agents on stag 0, one short, and one agent alone on stag 1, which stands on a plant
+    _place(
+        game,
+        agents=[(2, 2), (2, 2), (5, 5), (0, 0), (1, 0), (2, 0)],
+        stags=[(2, 2), (5, 5)],
+        plants=PLANTS,
+    )
+    rewards, respawn_stags, harvested = _calc_reward(game)
+
+    np.testing.assert_array_equal(rewards, [MAULING_PUNISHMENT] * 3 + [0] * 3)
+    np.testing.assert_array_equal(respawn_stags, [run_away_after_maul] * 2)
+    assert len(harvested) == 0  # agents on a stag don't forage
+
+
+def test_agents_foraging_the_same_plant_all_get_the_reward():
+    game = _game()
+    # three agents on plant 1 and one on plant 2, every harvested plant respawns once
+    _place(
+        game,
+        agents=[(5, 5), (5, 5), (5, 5), (0, 5), (1, 0), (2, 0)],
+        stags=[(2, 2), (4, 4)],
+        plants=PLANTS,
+    )
+    rewards, respawn_stags, harvested = _calc_reward(game)
+
+    np.testing.assert_array_equal(rewards, [FORAGE_REWARD] * 4 + [0] * 2)
+    np.testing.assert_array_equal(respawn_stags, [False, False])
+    np.testing.assert_array_equal(harvested, [1, 2])
+
+    game._respawn_entities(respawn_stags, harvested)
+    plant_cells = game._cells(game._plants)
+    assert len(np.unique(plant_cells)) == len(PLANTS)
+    np.testing.assert_array_equal(game._plant_slots[plant_cells], [0, 1, 2])
+    assert (game._plant_slots >= 0).sum() == len(PLANTS)
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from gym_stag_hunt.envs.gym.simple import COOPERATE, DEFECT, SimpleEnv
+
+"""
+The batched methods of SimpleEnv look the rewards up in the payoff tensor, so they have to agree with step.
+"""
+
+N = 5
+K = 7
+ACTION_PAIRS = [(a, b) for a in (COOPERATE, DEFECT) for b in (COOPERATE, DEFECT)]
+
+
+def _env(eps_per_game=1):
+    env = SimpleEnv(eps_per_game=eps_per_game)
+    env.reset(seed=0)
+    return env
+
+
+@pytest.mark.parametrize("a_action, b_action", ACTION_PAIRS)
+def test_payoffs_match_step(a_action, b_action):
+    env = _env()
+    obs, reward, done, info = env.step([a_action, b_action])
+    actions, rewards, done, info = env.step_batch(np.array([[a_action, b_action]]))
+
+    np.testing.assert_array_equal(rewards, [reward])
+    np.testing.assert_array_equal(env.PAYOFFS[a_action, b_action], reward)
+
+
+def test_step_batch_shapes():
+    env = _env()
+    rng = np.random.default_rng(0)
+
+    actions, rewards, done, info = env.step_batch(rng.integers(0, 2, (N, 2)))
+    assert actions.shape == rewards.shape == (N, 2)
+    assert isinstance(done, bool)
+
+    a_actions = rng.integers(0, 2, N)
+    actions, rewards, done, info = env.step_batch(a_actions)
+    assert actions.shape == rewards.shape == (N, 2)
+    np.testing.assert_array_equal(actions[:, 0], a_actions)
+    assert set(actions[:, 1].tolist()) <= {COOPERATE, DEFECT}
+    np.testing.assert_array_equal(rewards, env.PAYOFFS[actions[:, 0], actions[:, 1]])
+
+    actions, rewards, done, info = env.step_batch(rng.integers(0, 2, (K, N, 2)))
+    assert actions.shape == rewards.shape == (K, N, 2)
+    assert done.shape == (K,)
+
+
+def test_step_batch_marks_every_round_that_ends_a_game():
+    batched, stepped = _env(eps_per_game=3), _env(eps_per_game=3)
+    rounds = np.zeros((K, N, 2), dtype=int)
+
+    actions, rewards, done, info = batched.step_batch(rounds)
+    expected = [stepped.step([COOPERATE, COOPERATE])[2] for _ in range(K)]
+
+    np.testing.assert_array_equal(done, expected)
+    np.testing.assert_array_equal(done, [False, False, True] * 2 + [False])
+    # both count on from the same round
+    assert batched.ep == stepped.ep
+    assert (
+        batched.step([COOPERATE, COOPERATE])[2]
+        == stepped.step([COOPERATE, COOPERATE])[2]
+    )
+
+
+def test_play_rounds_shapes_and_totals():
+    env = _env()
+    rounds = 100
+    total_rewards, counts = env.play_rounds(
+        np.linspace(0, 1, N), np.linspace(1, 0, N), rounds=rounds
+    )
+    assert total_rewards.shape == (N, 2)
+    assert counts.shape == (N, 2, 2)
+    np.testing.assert_array_equal(counts.sum(axis=(1, 2)), rounds)
+    np.testing.assert_allclose(
+        total_rewards, np.einsum("nab,abr->nr", counts, env.PAYOFFS)
+    )
+
+    # pure strategies always end in the same outcome
+    total_rewards, counts = env.play_rounds([1.0], [0.0], rounds=rounds)
+    assert counts[0, COOPERATE, DEFECT] == rounds
+    np.testing.assert_array_equal(
+        total_rewards[0], rounds * env.PAYOFFS[COOPERATE, DEFECT]
+    )
@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+from gym_stag_hunt.envs.gym.escalation import EscalationEnv
+from gym_stag_hunt.envs.gym.harvest import HarvestEnv
+from gym_stag_hunt.envs.gym.hunt import HuntEnv
+from gym_stag_hunt.envs.gym.multi_hunt import MultiHuntEnv
+
+"""
+get_state / set_state round trips: a game restored from a snapshot has to continue exactly like the game the snapshot
+was taken from.
+"""
+
+SNAPSHOT_AFTER = 25  # steps played before the snapshot is taken
+DRIFT = 17  # steps the second game plays on its own before it is restored
+COMPARED = 60  # steps both games play afterwards, with the same actions
+
+GAMES = [
+    (HuntEnv, {"forage_quantity": 3}),
+    (HuntEnv, {"run_away_after_maul": True, "stag_follows": False}),
+    (HuntEnv, {"opponent_policy": "pursuit"}),
+    (HarvestEnv, {"max_plants": 5, "chance_to_mature": 0.3, "chance_to_die": 0.2}),
+    (EscalationEnv, {"opponent_policy": "pursuit"}),
+]
+
+
+def _actions(rng, count, enable_multiagent, agent_count=2):
+    """
+    :return: count random actions, an (agent_count,) array per step in multiagent mode, an int otherwise
+    """
+    if enable_multiagent:
+        return [rng.integers(0, 5, agent_count) for _ in range(count)]
+    return [int(action) for action in rng.integers(0, 5, count)]
+
+
+def _play(env, actions):
+    """
+    :return: list of the (observation, rewards) pair of every step, copied so later steps can't overwrite them
+    """
+    steps = []
+    for action in actions:
+        obs, rewards, done, info = env.step(action)
+        steps.append((np.array(obs), np.array(rewards)))
+    return steps
+
+
+def _assert_same_steps(expected, actual):
+    for (expected_obs, expected_rewards), (obs, rewards) in zip(expected, actual):
+        np.testing.assert_array_equal(obs, expected_obs)
+        np.testing.assert_array_equal(rewards, expected_rewards)
+
+
+def _check_round_trip(make_env, enable_multiagent, agent_count=2):
+    rng = np.random.default_rng(0)
+    original, restored = make_env(), make_env()
+    original.reset(seed=1)
+    restored.reset(seed=2)
+
+    _play(original, _actions(rng, SNAPSHOT_AFTER, enable_multiagent, agent_count))
+    snapshot = original.game.get_state()
+    _play(restored, _actions(rng, DRIFT, enable_multiagent, agent_count))
+    restored.game.set_state(snapshot)
+
+    actions = _actions(rng, COMPARED, enable_multiagent, agent_count)
+    _assert_same_steps(_play(original, actions), _play(restored, actions))
+    np.testing.assert_array_equal(restored.game.get_state(), original.game.get_state())
+
+
+@pytest.mark.parametrize("obs_type", ["coords", "grid", "image"])
+@pytest.mark.parametrize("enable_multiagent", [False, True])
+@pytest.mark.parametrize("env_class, config", GAMES)
+def test_restored_game_continues_like_the_original(
+    env_class, config, enable_multiagent, obs_type
+):
+    def make_env():
+        return env_class(
+            grid_size=(5, 5),
+            obs_type=obs_type,
+            enable_multiagent=enable_multiagent,
+            render_backend="numpy",
+            **config
+        )
+
+    _check_round_trip(make_env, enable_multiagent)
+
+
+@pytest.mark.parametrize("obs_type", ["coords", "grid"])
+def test_restored_multi_hunt_continues_like_the_original(obs_type):
+    def make_env():
+        return MultiHuntEnv(
+            grid_size=(8, 8), obs_type=obs_type, agent_count=6, stag_count=2
+        )
+
+    _check_round_trip(make_env, enable_multiagent=True, agent_count=6)
+
+
+def test_set_state_rejects_a_snapshot_of_another_config():
+    small = HuntEnv(obs_type="coords", forage_quantity=2).game
+    large = HuntEnv(obs_type="coords", forage_quantity=4).game
+    with pytest.raises(AttributeError):
+        large.set_state(small.get_state())
+
+
+def test_restored_hunt_keeps_the_plants_tagged_while_the_stag_ran_away():
+    def make_env():
+        return HuntEnv(
+            grid_size=(3, 3),
+            obs_type="coords",
+            enable_multiagent=True,
+            run_away_after_maul=True,
+            stag_follows=False,
+            forage_quantity=3,
+        )
+
+    rng = np.random.default_rng(3)
+    original, restored = make_env(), make_env()
+    original.reset(seed=4)
+    restored.reset(seed=5)
+
+    # play until a plant was foraged during a mauling, it stays tagged until the next forage
+    for _ in range(1000):
+        _play(original, _actions(rng, 1, enable_multiagent=True))
+        if original.game._tagged_plants:
+            break
+    assert original.game._tagged_plants
+    snapshot = original.game.get_state()
+    _play(restored, _actions(rng, DRIFT, enable_multiagent=True))
+    restored.game.set_state(snapshot)
+    assert restored.game._tagged_plants == original.game._tagged_plants
+
+    actions = _actions(rng, COMPARED, enable_multiagent=True)
+    _assert_same_steps(_play(original, actions), _play(restored, actions))
@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+from gym_stag_hunt.envs.gym.escalation import EscalationEnv
+from gym_stag_hunt.envs.gym.hunt import HuntEnv
+from gym_stag_hunt.envs.gym.subproc_vector import SubprocVectorEnv
+
+"""
+SubprocVectorEnv has to play exactly like the same envs stepped one after the other in this process: env i seeded with
+seed + i, and reset (without a new seed) whenever max_episode_steps are up.
+"""
+
+NUM_ENVS = 3
+SEED = 11
+MAX_EPISODE_STEPS = 7
+STEPS = 20  # crosses the episode boundary twice
+
+
+def _hunt(enable_multiagent, obs_type):
+    return lambda: HuntEnv(
+        grid_size=(4, 4),
+        obs_type=obs_type,
+        enable_multiagent=enable_multiagent,
+        render_backend="numpy",
+    )
+
+
+def _escalation(enable_multiagent, obs_type):
+    return lambda: EscalationEnv(
+        grid_size=(4, 4),
+        obs_type=obs_type,
+        enable_multiagent=enable_multiagent,
+        render_backend="numpy",
+    )
+
+
+def _observe(env, obs):
+    """
+    :return: copy of the observation as laid out by SubprocVectorEnv, reset only returns the one of agent A
+    """
+    if env.enable_multiagent and not isinstance(obs, tuple):
+        obs = obs, env.game._flip_observation_perspective(obs)
+    return np.array(obs)
+
+
+def _play_in_process(env_fn, actions):
+    """
+    :return: the (observations, rewards, dones, terminal observations) of every step, stacked over the envs
+    """
+    envs = [env_fn() for _ in range(NUM_ENVS)]
+    obs = [_observe(env, env.reset(seed=SEED + i)) for i, env in enumerate(envs)]
+    steps = [(np.stack(obs), None, None, None)]
+    for step, step_actions in enumerate(actions, start=1):
+        obs, rewards, dones, terminal = [], [], [], []
+        for env, action in zip(envs, step_actions):
+            observation, reward, done, info = env.step(
+                action.tolist() if env.enable_multiagent else int(action)
+            )
+            done = done or step % MAX_EPISODE_STEPS == 0
+            terminal.append(_observe(env, observation) if done else None)
+            if done:
+                observation = env.reset()
+            obs.append(_observe(env, observation))
+            rewards.append(reward)
+            dones.append(done)
+        steps.append((np.stack(obs), np.array(rewards), np.array(dones), terminal))
+    for env in envs:
+        env.close()
+    return steps
+
+
+def _play_in_subprocesses(env, actions):
+    steps = [(env.reset(seed=SEED), None, None, None)]
+    for step_actions in actions:
+        obs, rewards, dones, infos = env.step(step_actions)
+        terminal = [info.get("terminal_observation") for info in infos]
+        steps.append((obs, rewards, dones, terminal))
+    return steps
+
+
+@pytest.mark.parametrize("make_env_fn", [_hunt, _escalation])
+@pytest.mark.parametrize("enable_multiagent", [False, True])
+@pytest.mark.parametrize("obs_type", ["coords", "image"])
+def test_subprocesses_play_like_the_envs_in_process(
+    make_env_fn, enable_multiagent, obs_type
+):
+    env_fn = make_env_fn(enable_multiagent, obs_type)
+    vector_env = SubprocVectorEnv(
+        [env_fn] * NUM_ENVS, max_episode_steps=MAX_EPISODE_STEPS
+    )
+    shape = (STEPS, NUM_ENVS, 2) if enable_multiagent else (STEPS, NUM_ENVS)
+    actions = np.random.default_rng(0).integers(0, 5, shape)
+    try:
+        steps = _play_in_subprocesses(vector_env, actions)
+    finally:
+        vector_env.close()
+
+    expected_steps = _play_in_process(env_fn, actions)
+    for expected, actual in zip(expected_steps, steps):
+        expected_obs, expected_rewards, expected_dones, expected_terminal = expected
+        obs, rewards, dones, terminal = actual
+        np.testing.assert_array_equal(obs, expected_obs)
+        np.testing.assert_array_equal(rewards, expected_rewards)
+        np.testing.assert_array_equal(dones, expected_dones)
+        for expected_obs, obs in zip(expected_terminal or [], terminal or []):
+            assert (obs is None) == (expected_obs is None)
+            if obs is not None:
+                np.testing.assert_array_equal(obs, expected_obs)
+
+
+@pytest.mark.parametrize("enable_multiagent", [False, True])
+def test_render_returns_the_frames_of_agent_a(enable_multiagent):
+    vector_env = SubprocVectorEnv([_hunt(enable_multiagent, "image")] * NUM_ENVS)
+    try:
+        vector_env.reset(seed=SEED)
+        shape = (NUM_ENVS, 2) if enable_multiagent else (NUM_ENVS,)
+        obs, rewards, dones, infos = vector_env.step(np.ones(shape, dtype=int))
+        frames = vector_env.render(mode="rgb_array")
+    finally:
+        vector_env.close()
+
+    np.testing.assert_array_equal(frames, obs[:, 0] if enable_multiagent else obs)
+
+
+def test_render_rejects_envs_without_frames():
+    vector_env = SubprocVectorEnv([_hunt(False, "coords")] * NUM_ENVS)
+    try:
+        vector_env.reset(seed=SEED)
+        with pytest.raises(AttributeError):
+            vector_env.render(mode="rgb_array")
+    finally:
+        vector_env.close()
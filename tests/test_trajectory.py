@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from gym_stag_hunt.envs.gym.escalation import EscalationEnv
+from gym_stag_hunt.envs.gym.harvest import HarvestEnv
+from gym_stag_hunt.envs.gym.hunt import HuntEnv
+from gym_stag_hunt.envs.gym.recorder import TrajectoryRecorder
+from gym_stag_hunt.src.replay import replay_trajectory
+from gym_stag_hunt.src.trajectory import load_trajectory
+
+"""
+Recording -> load_trajectory -> replay_trajectory has to give back the frames the env produced, pixel for pixel.
+"""
+
+EPISODES = 3
+EPISODE_STEPS = 12
+CAPACITY = 3  # the column files have to grow several times
+FRAME_CHUNK_SIZE = 8
+FLUSH_EVERY = 5  # flushes land in the middle of frame chunks
+
+GAMES = [
+    (HuntEnv, {"forage_quantity": 3}),
+    (HarvestEnv, {}),
+    (EscalationEnv, {}),
+]
+
+
+def _record(env, rng, episodes=EPISODES):
+    """
+    Plays a few episodes.
+    :return: copies of the frame and the state of every recorded row, and the rewards of every step
+    """
+    frames, states, rewards = [], [], []
+    for episode in range(episodes):
+        obs = env.reset(seed=episode)
+        frames.append(np.array(obs))
+        states.append(env.game.STATE.copy())
+        for _ in range(EPISODE_STEPS):
+            obs, step_rewards, done, info = env.step(rng.integers(0, 5, 2).tolist())
+            frames.append(np.array(obs[0]))  # agent A's frame
+            states.append(env.game.STATE.copy())
+            rewards.append(step_rewards)
+    return np.array(frames), np.array(states), np.array(rewards)
+
+
+def _replayed_frames(trajectory):
+    return np.concatenate([batch.copy() for batch in replay_trajectory(trajectory)])
+
+
+def _recorder(env_class, config, directory, render_backend="numpy"):
+    return TrajectoryRecorder(
+        env_class(
+            grid_size=(5, 4),
+            obs_type="image",
+            enable_multiagent=True,
+            render_backend=render_backend,
+            **config
+        ),
+        directory,
+        record_frames=True,
+        frame_chunk_size=FRAME_CHUNK_SIZE,
+        flush_every=FLUSH_EVERY,
+        capacity=CAPACITY,
+    )
+
+
+@pytest.mark.parametrize("render_backend", ["numpy", "pygame"])
+@pytest.mark.parametrize("env_class, config", GAMES)
+def test_replay_reproduces_the_recorded_frames(
+    env_class, config, render_backend, tmp_path
+):
+    env = _recorder(env_class, config, str(tmp_path), render_backend)
+    frames, states, rewards = _record(env, np.random.default_rng(0))
+    env.close()
+
+    trajectory = load_trajectory(str(tmp_path))
+    rows = EPISODES * (EPISODE_STEPS + 1)
+    assert len(trajectory) == rows == len(frames)
+    np.testing.assert_array_equal(trajectory["states"], states)
+    resets = trajectory["resets"]
+    assert resets.sum() == EPISODES
+    np.testing.assert_array_equal(trajectory["rewards"][~resets], rewards)
+
+    assert trajectory.FRAME_COUNT == rows
+    np.testing.assert_array_equal(
+        np.concatenate(list(trajectory.frame_chunks())), frames
+    )
+    np.testing.assert_array_equal(_replayed_frames(trajectory), frames)
+
+
+def test_trajectory_of_an_unclosed_writer_can_be_read(tmp_path):
+    env = _recorder(HuntEnv, {"forage_quantity": 3}, str(tmp_path))
+    frames, states, rewards = _record(env, np.random.default_rng(0), episodes=2)
+    recorded = len(states)
+
+    # only the rows up to the last flush, and the frames of the full chunks, are in the manifest
+    trajectory = load_trajectory(str(tmp_path))
+    flushed = recorded - recorded % FLUSH_EVERY
+    assert len(trajectory) == flushed
+    np.testing.assert_array_equal(trajectory["states"], states[:flushed])
+    np.testing.assert_array_equal(_replayed_frames(trajectory), frames[:flushed])
+    frame_count = recorded - recorded % FRAME_CHUNK_SIZE
+    assert trajectory.FRAME_COUNT == frame_count
+    np.testing.assert_array_equal(
+        np.concatenate(list(trajectory.frame_chunks())), frames[:frame_count]
+    )
+
+    # an explicit flush makes every row readable, while the writer keeps going
+    env.flush()
+    trajectory = load_trajectory(str(tmp_path))
+    assert len(trajectory) == recorded
+    np.testing.assert_array_equal(_replayed_frames(trajectory), frames)
+    env.close()
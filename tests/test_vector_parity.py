@@ -0,0 +1,283 @@
+import numpy as np
+import pytest
+
+from gym_stag_hunt.envs.gym.escalation import EscalationEnv
+from gym_stag_hunt.envs.gym.harvest import HarvestEnv
+from gym_stag_hunt.envs.gym.hunt import HuntEnv
+from gym_stag_hunt.envs.gym.vector_escalation import VectorEscalationEnv
+from gym_stag_hunt.envs.gym.vector_harvest import VectorHarvestEnv
+from gym_stag_hunt.envs.gym.vector_hunt import VectorHuntEnv
+from gym_stag_hunt.src.games import staghunt_game
+from gym_stag_hunt.src.utils import OccupancyGrid
+
+"""
+The batched games have to follow the rules of the scalar games. Both draw from different random streams, so on every
+step the scalar games are played first and the batched game is put into the state they started from, with their random
+moves copied over. Then both have to hand out the same rewards and respawn the same entities.
+"""
+
+NUM_GAMES = 8
+STEPS = 300
+
+HUNTS = [
+    {"grid_size": (3, 3), "forage_quantity": 4, "run_away_after_maul": True},
+    {"grid_size": (3, 3), "forage_quantity": 4, "run_away_after_maul": False},
+    {"grid_size": (4, 4), "forage_quantity": 2, "run_away_after_maul": True},
+]
+
+HARVESTS = [
+    {
+        "grid_size": (3, 3),
+        "max_plants": 4,
+        "chance_to_mature": 0.5,
+        "chance_to_die": 0.5,
+    },
+    {
+        "grid_size": (5, 5),
+        "max_plants": 6,
+        "chance_to_mature": 0.2,
+        "chance_to_die": 0.1,
+    },
+]
+
+
+def _record_after(game, method, attribute, records):
+    """
+    Wraps a method of a scalar game so that it appends a copy of the attribute to records after every call.
+    """
+    call = getattr(game, method)
+
+    def recorded():
+        call()
+        records.append(np.array(getattr(game, attribute)))
+
+    setattr(game, method, recorded)
+
+
+def _record_before(game, method, attribute, records):
+    """
+    Wraps a method of a scalar game so that it appends a copy of the attribute to records before every call.
+    """
+    call = getattr(game, method)
+
+    def recorded():
+        records.append(np.array(getattr(game, attribute)))
+        call()
+
+    setattr(game, method, recorded)
+
+
+def _count_respawns(game, method, counts):
+    """
+    Wraps the respawn method of a batched game so that it counts how often each entity of each game is moved.
+    """
+    respawn = getattr(game, method)
+
+    def counted(occupied, games, rows, entity):
+        counts[games[rows], entity] += 1
+        return respawn(occupied, games, rows, entity)
+
+    setattr(game, method, counted)
+
+
+@pytest.mark.parametrize("config", HUNTS)
+def test_vector_hunt_follows_the_rules_of_hunt(config, monkeypatch):
+    config = dict(config, enable_multiagent=True, stag_follows=False)
+    plant_count = config["forage_quantity"]
+    envs = [HuntEnv(obs_type="coords", **config) for _ in range(NUM_GAMES)]
+    vector_env = VectorHuntEnv(num_envs=NUM_GAMES, seed=0, **config)
+    vector_game = vector_env.game
+    vector_env.reset()
+
+    moved_stags = []
+    for seed, env in enumerate(envs):
+        env.reset(seed=seed)
+        _record_after(env.game, "_move_stag", "STAG", moved_stags)
+
+    def move_stag():
+        vector_game.STAG[:] = moved_stags
+
+    vector_game._move_stag = move_stag
+
+    # the tags every scalar respawn_plants call moves, and the entity moves of the batched game
+    scalar_tags = []
+    respawn_plants = staghunt_game.respawn_plants
+
+    def record_tags(**kwargs):
+        scalar_tags.append(list(kwargs["tagged_plants"]))
+        return respawn_plants(**kwargs)
+
+    monkeypatch.setattr(staghunt_game, "respawn_plants", record_tags)
+    vector_respawns = np.zeros(vector_game.ENTITIES.shape[:2], dtype=int)
+    _count_respawns(vector_game, "_respawn_entity", vector_respawns)
+
+    rng = np.random.default_rng(0)
+    respawned_twice = 0
+    for _ in range(STEPS):
+        actions = rng.integers(0, 5, (NUM_GAMES, 2))
+        del moved_stags[:]
+        scalar_respawns = np.zeros((NUM_GAMES, plant_count), dtype=int)
+        scalar_rewards, scalar_dones = [], []
+        for i, env in enumerate(envs):
+            vector_game.ENTITIES[i] = env.game._state.reshape(-1, 2)
+            vector_game._tagged_plants[i] = np.bincount(
+                env.game._tagged_plants, minlength=plant_count
+            )
+            del scalar_tags[:]
+            obs, rewards, done, info = env.step(actions[i])
+            for tags in scalar_tags:
+                np.add.at(scalar_respawns[i], tags, 1)
+            scalar_rewards.append(rewards)
+            scalar_dones.append(done)
+
+        vector_respawns.fill(0)
+        obs, rewards, dones, info = vector_env.step(actions)
+
+        np.testing.assert_array_equal(rewards, scalar_rewards)
+        np.testing.assert_array_equal(dones, scalar_dones)
+        np.testing.assert_array_equal(
+            vector_respawns[:, staghunt_game.PLANT :], scalar_respawns
+        )
+        # a respawned stag always lands on another cell than the one it moved to
+        scalar_stags = np.array([env.game.STAG for env in envs])
+        np.testing.assert_array_equal(
+            vector_respawns[:, staghunt_game.STAG] > 0,
+            (scalar_stags != moved_stags).any(axis=1),
+        )
+        respawned_twice += int((scalar_respawns > 1).sum())
+
+    assert respawned_twice > 0  # the games got into the cases the rules differ in
+
+
+@pytest.mark.parametrize("config", HARVESTS)
+def test_vector_harvest_follows_the_rules_of_harvest(config):
+    config = dict(config, enable_multiagent=True)
+    plant_count = config["max_plants"]
+    envs = [HarvestEnv(obs_type="coords", **config) for _ in range(NUM_GAMES)]
+    vector_env = VectorHarvestEnv(num_envs=NUM_GAMES, seed=0, **config)
+    vector_game = vector_env.game
+    vector_env.reset()
+
+    # maturity flags after every scalar plant update, and the plants every scalar respawn moves
+    grown, scalar_tags = [], []
+    for seed, env in enumerate(envs):
+        env.reset(seed=seed)
+        _record_after(env.game, "_update_plants", "MATURITY_FLAGS", grown)
+        _record_before(env.game, "_respawn_plants", "_tagged_plants", scalar_tags)
+
+    def update_plants():
+        flags = vector_game.MATURITY_FLAGS
+        died = flags & ~np.array(grown, dtype=bool)
+        flags[:] = grown
+        return died
+
+    vector_game._update_plants = update_plants
+    vector_tags = []
+    respawn_plants = vector_game._respawn_plants
+
+    def record_tags(tagged):
+        vector_tags.append(tagged.copy())
+        respawn_plants(tagged)
+
+    vector_game._respawn_plants = record_tags
+
+    rng = np.random.default_rng(0)
+    harvested = 0
+    for _ in range(STEPS):
+        actions = rng.integers(0, 5, (NUM_GAMES, 2))
+        del grown[:]
+        scalar_respawns = np.zeros((NUM_GAMES, plant_count), dtype=bool)
+        scalar_rewards, scalar_dones = [], []
+        for i, env in enumerate(envs):
+            state = env.game._state
+            vector_game.ENTITIES[i, :2] = state[:4].reshape(2, 2)
+            vector_game.PLANTS[i] = state[4:].reshape(-1, 3)[:, :2]
+            vector_game.MATURITY_FLAGS[i] = state[6::3]
+            del scalar_tags[:]
+            obs, rewards, done, info = env.step(actions[i])
+            for tags in scalar_tags:
+                scalar_respawns[i, tags] = True
+            scalar_rewards.append(rewards)
+            scalar_dones.append(done)
+
+        del vector_tags[:]
+        obs, rewards, dones, info = vector_env.step(actions)
+
+        np.testing.assert_array_equal(rewards, scalar_rewards)
+        np.testing.assert_array_equal(dones, scalar_dones)
+        np.testing.assert_array_equal(vector_tags[0], scalar_respawns)
+        harvested += int((np.array(scalar_rewards) > 0).sum())
+
+    assert harvested > 0
+
+
+@pytest.mark.parametrize("grid_size", [(2, 2), (3, 3)])
+def test_vector_escalation_follows_the_rules_of_escalation(grid_size):
+    config = {"grid_size": grid_size, "enable_multiagent": True}
+    envs = [EscalationEnv(obs_type="coords", **config) for _ in range(NUM_GAMES)]
+    vector_env = VectorEscalationEnv(num_envs=NUM_GAMES, seed=0, **config)
+    vector_game = vector_env.game
+    vector_env.reset()
+
+    # with both agents steered by actions, the scalar games only draw random moves for the mark
+    mark_moves = []
+    for seed, env in enumerate(envs):
+        env.reset(seed=seed)
+        random_move = env.game._random_move
+
+        def record_move(pos, random_move=random_move):
+            mark_moves.append(random_move(pos))
+            return mark_moves[-1]
+
+        env.game._random_move = record_move
+
+    def random_moves(positions):
+        return np.array(mark_moves, dtype=int)
+
+    vector_game._random_moves = random_moves
+
+    rng = np.random.default_rng(0)
+    longest_streak = 0
+    for _ in range(STEPS):
+        actions = rng.integers(0, 5, (NUM_GAMES, 2))
+        del mark_moves[:]
+        scalar_rewards, scalar_dones = [], []
+        for i, env in enumerate(envs):
+            vector_game.ENTITIES[i] = env.game._state.reshape(-1, 2)
+            vector_game.STREAK[i] = env.game.STREAK
+            vector_game.STREAK_ACTIVE[i] = env.game.STREAK_ACTIVE
+            obs, rewards, done, info = env.step(actions[i])
+            scalar_rewards.append(rewards)
+            scalar_dones.append(done)
+
+        obs, rewards, dones, info = vector_env.step(actions)
+
+        np.testing.assert_array_equal(rewards, scalar_rewards)
+        np.testing.assert_array_equal(dones, scalar_dones)
+        np.testing.assert_array_equal(
+            vector_game.ENTITIES, [env.game._state.reshape(-1, 2) for env in envs]
+        )
+        np.testing.assert_array_equal(
+            vector_game.STREAK, [env.game.STREAK for env in envs]
+        )
+        np.testing.assert_array_equal(
+            vector_game.STREAK_ACTIVE, [env.game.STREAK_ACTIVE for env in envs]
+        )
+        longest_streak = max(longest_streak, vector_game.STREAK.max())
+
+    assert longest_streak > 1  # the punishment grew with the streak
+
+
+def test_spawning_on_a_full_grid_raises_like_the_occupancy_grid():
+    occupancy = OccupancyGrid((3, 3))
+    for x in range(3):
+        for y in range(3):
+            occupancy.mark((x, y))
+    with pytest.raises(ValueError):
+        occupancy.sample()
+
+    game = VectorHuntEnv(num_envs=2, grid_size=(3, 3), seed=0).game
+    occupied = np.zeros((2, 9), dtype=bool)
+    occupied[1] = True  # only the second game is full
+    with pytest.raises(ValueError):
+        game._place_in_unoccupied_cells(occupied, np.arange(2))